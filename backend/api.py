@@ -1,18 +1,27 @@
 from fastapi import FastAPI, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 
 import shutil
 import os
 import json
+import re
 import sys
+import asyncio
+import hashlib
+import time
+import uuid
+from collections import OrderedDict
 
 
 
 class RunCodeRequest(BaseModel):
     language: str
     code: str
+    stream: bool = False
+    challenge_id: str = ""
 
 
 # allow imports from src
@@ -24,7 +33,16 @@ from projecttest.utils.file_reader import read_cv_file
 from projecttest.evaluation_crew import EvaluationCrew
 from projecttest.grading_crew import GradingCrew
 from projecttest.challenge_crew import ChallengeCrew
-from projecttest.utils.pdf_report import generate_report
+from projecttest.interview_prep_crew import EXPERIENCE_LEVEL, InterviewPrepCrew
+from projecttest.review_crew import ReviewCrew
+from projecttest.utils.report_jobs import report_jobs
+from projecttest.utils.report_catalog import report_catalog
+from projecttest.utils.cv_dedup import cv_index, refresh_reused, signature as cv_signature
+from projecttest.utils.cv_compactor import compact_for
+from projecttest.utils.interview_session import interview_sessions
+from projecttest.utils.lru import LRUDict
+from projecttest.utils.skill_matcher import skill_candidates, skill_matcher, tech_in_cv
+from projecttest.tools.mcp_client import code_runner
 
 
 # =====================================================
@@ -32,6 +50,9 @@ from projecttest.utils.pdf_report import generate_report
 # =====================================================
 app = FastAPI()
 
+# build the skill automaton now rather than on the first request
+skill_matcher()
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # dev mode
@@ -50,6 +71,31 @@ INTERVIEW_CONTEXT = {
     "interview_score": 0,
     "total_questions": 0,
     "interview_feedback": "",
+    "transcript": [],
+}
+
+# Entries kept per store below; least recently used go first
+MEMORY_ITEMS = int(os.environ.get("API_MEMORY_ITEMS", "1024"))
+
+# challenge_id -> {"challenge", "suite"}; suite is None when unavailable
+CHALLENGES = LRUDict(MEMORY_ITEMS)
+
+# feedback_id -> {"status": "pending" | "done", "feedback"}
+FEEDBACK = LRUDict(MEMORY_ITEMS)
+
+# challenge_id -> OrderedDict(code hash -> /run-code result), newest last
+RUN_RESULTS = LRUDict(MEMORY_ITEMS)
+RUN_RESULTS_PER_CHALLENGE = 20
+
+# code-runner language per lower-cased language name
+RUNNER_LANGUAGES = {
+    "python": "python",
+    "javascript": "javascript",
+    "java": "java",
+    "c#": "csharp",
+    "csharp": "csharp",
+    "c++": "cpp",
+    "cpp": "cpp",
 }
 
 
@@ -63,6 +109,38 @@ def get_task_output(result, task_name: str):
     return ""
 
 
+_FENCE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+
+
+def get_task_json(result, task_name: str):
+    """
+    A task's structured output: its pydantic / JSON output, else its raw
+    text parsed with any code fence stripped. None if it is not JSON.
+    """
+    for task in result.tasks_output:
+        if task.name != task_name:
+            continue
+        if task.pydantic is not None:
+            return task.pydantic.model_dump()
+        if task.json_dict:
+            return task.json_dict
+        raw = task.raw.strip()
+        fenced = _FENCE.match(raw)
+        try:
+            return json.loads(fenced.group(1) if fenced else raw)
+        except ValueError:
+            return None
+    return None
+
+
+# =====================================================
+# MCP CLIENT  (code-runner on port 8001)
+# =====================================================
+async def call_mcp_tool(name: str, payload: dict) -> dict:
+    """Call a code-runner tool over the shared, pooled MCP session."""
+    return await code_runner.acall(name, payload)
+
+
 # =====================================================
 # 1️ ANALYZE CV
 # =====================================================
@@ -75,25 +153,45 @@ async def analyze_cv(file: UploadFile = File(...)):
             shutil.copyfileobj(file.file, buffer)
 
         cv_text = read_cv_file(temp_path)
-
-        crew = CVAnalysisCrew().crew()
-        result = crew.kickoff(inputs={"cv_text": cv_text})
-
-        raw = get_task_output(result, "analyze_cv_task")
-
-        try:
-            data = json.loads(raw)
-        except Exception:
-            data = {
-                "candidate_name": "Unknown",
-                "experience_level": "Unknown",
-                "tech_stack": [],
-            }
+        session = interview_sessions.open(cv_text)
+
+        # a near-copy of an analyzed CV (re-export, new phone number)
+        # reuses that analysis instead of running the crew again
+        sig = cv_signature(cv_text)
+        duplicate = cv_index.find(sig)
+
+        if duplicate:
+            data = refresh_reused(duplicate["analysis"], cv_text)
+            data["reused_analysis"] = {"similarity": duplicate["similarity"]}
+            session.set_analysis(data)
+        else:
+            crew = CVAnalysisCrew().crew()
+            result = crew.kickoff(
+                inputs={
+                    "cv_text": compact_for(cv_text, "analysis"),
+                    "skill_candidates": skill_candidates(cv_text),
+                }
+            )
+
+            session.record("analysis", result)
+            raw = get_task_output(result, "analyze_cv_task")
+
+            try:
+                data = json.loads(raw)
+                session.set_analysis(data)
+                if sig is not None:
+                    cv_index.add(sig, data)
+            except Exception:
+                data = {
+                    "candidate_name": "Unknown",
+                    "experience_level": "Unknown",
+                    "tech_stack": [],
+                }
 
         INTERVIEW_CONTEXT["candidate_name"] = data.get("candidate_name", "")
         INTERVIEW_CONTEXT["experience_level"] = data.get("experience_level", "")
 
-        return data
+        return {**data, "session_id": session.id}
 
     finally:
         if os.path.exists(temp_path):
@@ -116,40 +214,53 @@ async def generate_questions(
 
         cv_text = read_cv_file(temp_path)
 
+        # answer "not found" locally instead of spending an LLM call on it
+        if not tech_in_cv(cv_text, selected_tech):
+            return {
+                "questions": [],
+                "message": "Selected technology not found in CV.",
+            }
+
+        session = interview_sessions.open(cv_text)
         crew = QuestionCrew().crew()
         result = crew.kickoff(
             inputs={
-                "cv_text": cv_text,
+                "session_context": session.context(),
                 "selected_tech": selected_tech,
             }
         )
+        session.record("questions", result)
 
-        raw = get_task_output(result, "generate_interview_questions")
-
-        if "not found" in raw.lower():
-            return {
-                "questions": [],
-                "message": "Selected technology not found in CV.",
-            }
+        return _questions_response(
+            get_task_output(result, "generate_interview_questions"), selected_tech
+        )
 
-        cleaned = []
-        for line in raw.split("\n"):
-            line = line.strip()
-            line = line.lstrip("0123456789.-) ")
-            if line:
-                cleaned.append(line)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
 
-        INTERVIEW_CONTEXT["selected_tech"] = selected_tech
-        INTERVIEW_CONTEXT["total_questions"] = len(cleaned)
 
+def _questions_response(raw: str, selected_tech: str) -> dict:
+    if "not found" in raw.lower():
         return {
-            "questions": cleaned,
-            "total": len(cleaned),
+            "questions": [],
+            "message": "Selected technology not found in CV.",
         }
 
-    finally:
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+    cleaned = []
+    for line in raw.split("\n"):
+        line = line.strip()
+        line = line.lstrip("0123456789.-) ")
+        if line:
+            cleaned.append(line)
+
+    INTERVIEW_CONTEXT["selected_tech"] = selected_tech
+    INTERVIEW_CONTEXT["total_questions"] = len(cleaned)
+
+    return {
+        "questions": cleaned,
+        "total": len(cleaned),
+    }
 
 
 # =====================================================
@@ -187,6 +298,12 @@ async def evaluate_answer(
         f"Score: {data.get('score', 0)}\n"
         f"Feedback: {data.get('feedback', '')}\n\n"
     )
+    INTERVIEW_CONTEXT["transcript"].append({
+        "question": question,
+        "answer": answer,
+        "score": int(data.get("score", 0)),
+        "feedback": data.get("feedback", ""),
+    })
 
     return data
 
@@ -208,22 +325,169 @@ async def coding_challenge(
 
         cv_text = read_cv_file(temp_path)
 
+        if not _has_challenge(selected_tech):
+            return {"challenge": ""}
+
+        session = interview_sessions.open(cv_text)
         crew = ChallengeCrew().crew()
 
         result = crew.kickoff(
             inputs={
+                "session_context": session.context(),
                 "selected_tech": selected_tech,
-                "cv_text": cv_text,
-                "experience_level": experience_level,
+                "experience_level": session.experience_level(experience_level),
             }
         )
+        session.record("challenge", result)
 
-        raw = get_task_output(result, "generate_coding_challenge")
+        return await _challenge_response(result)
 
-        if "no coding challenge" in raw.lower():
-            return {"challenge": ""}
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _has_challenge(selected_tech: str) -> bool:
+    # a known technology without a core language (Docker, SQL databases…)
+    # gets no coding challenge, so don't ask the LLM for one
+    skill = skill_matcher().resolve(selected_tech)
+    return skill is None or skill.language is not None
+
+
+async def _challenge_response(result) -> dict:
+    raw = get_task_output(result, "generate_coding_challenge")
+
+    if "no coding challenge" in raw.lower():
+        return {"challenge": ""}
+
+    suite = await _verified_suite(
+        get_task_json(result, "generate_challenge_tests")
+    )
+
+    challenge_id = uuid.uuid4().hex
+    CHALLENGES[challenge_id] = {"challenge": raw, "suite": suite}
 
-        return {"challenge": raw}
+    return {
+        "challenge": raw,
+        "challenge_id": challenge_id,
+        "test_cases": len(suite["test_cases"]) if suite else 0,
+    }
+
+
+# =====================================================
+# 4b PREPARE THE WHOLE INTERVIEW
+# =====================================================
+@app.post("/interview-prep")
+async def interview_prep(
+    file: UploadFile = File(...),
+    selected_tech: str = Form(...),
+):
+    """
+    CV analysis, interview questions and coding challenge in one request.
+    Questions and challenge are generated in parallel, after the analysis:
+    by InterviewPrepCrew, or by QuestionCrew and ChallengeCrew side by side
+    when the CV's analysis is already known (same session or a
+    near-duplicate CV).
+    """
+    temp_path = f"temp_{file.filename}"
+
+    try:
+        with open(temp_path, "wb") as buffer:
+            shutil.copyfileobj(file.file, buffer)
+
+        cv_text = read_cv_file(temp_path)
+        started = time.monotonic()
+
+        # same shape as a full answer, with nothing generated
+        if not tech_in_cv(cv_text, selected_tech):
+            return {
+                "session_id": None,
+                "analysis": None,
+                "questions": {
+                    "questions": [],
+                    "message": "Selected technology not found in CV.",
+                },
+                "challenge": {"challenge": ""},
+                "seconds": round(time.monotonic() - started, 2),
+            }
+
+        session = interview_sessions.open(cv_text)
+        with_challenge = _has_challenge(selected_tech)
+
+        sig = cv_signature(cv_text)
+        if session.analysis is None:
+            duplicate = cv_index.find(sig)
+            if duplicate:
+                session.set_analysis(refresh_reused(duplicate["analysis"], cv_text))
+
+        if session.analysis is not None:
+            analysis = dict(session.analysis)
+            context = session.context()
+            kickoffs = [
+                QuestionCrew().crew().kickoff_async(
+                    inputs={"session_context": context, "selected_tech": selected_tech}
+                )
+            ]
+            if with_challenge:
+                kickoffs.append(
+                    ChallengeCrew().crew().kickoff_async(
+                        inputs={
+                            "session_context": context,
+                            "selected_tech": selected_tech,
+                            "experience_level": session.experience_level(),
+                        }
+                    )
+                )
+            results = await asyncio.gather(*kickoffs)
+            question_result = results[0]
+            challenge_result = results[1] if with_challenge else None
+            session.record("questions", question_result)
+            if challenge_result is not None:
+                session.record("challenge", challenge_result)
+        else:
+            result = await InterviewPrepCrew(with_challenge).crew().kickoff_async(
+                inputs={
+                    "cv_text": compact_for(cv_text, "analysis"),
+                    "skill_candidates": skill_candidates(cv_text),
+                    "session_context": session.context(),
+                    "selected_tech": selected_tech,
+                    "experience_level": EXPERIENCE_LEVEL,
+                }
+            )
+            session.record("prep", result)
+            question_result = result
+            challenge_result = result if with_challenge else None
+
+            try:
+                analysis = json.loads(get_task_output(result, "analyze_cv_task"))
+                session.set_analysis(analysis)
+                if sig is not None:
+                    cv_index.add(sig, analysis)
+            except Exception:
+                analysis = {
+                    "candidate_name": "Unknown",
+                    "experience_level": "Unknown",
+                    "tech_stack": [],
+                }
+
+        INTERVIEW_CONTEXT["candidate_name"] = analysis.get("candidate_name", "")
+        INTERVIEW_CONTEXT["experience_level"] = analysis.get("experience_level", "")
+
+        questions = _questions_response(
+            get_task_output(question_result, "generate_interview_questions"), selected_tech
+        )
+        if challenge_result is not None:
+            challenge = await _challenge_response(challenge_result)
+        else:
+            challenge = {"challenge": ""}
+
+        return {
+            "session_id": session.id,
+            "analysis": analysis,
+            "questions": questions,
+            "challenge": challenge,
+            "seconds": round(time.monotonic() - started, 2),
+        }
 
     finally:
         if os.path.exists(temp_path):
@@ -233,17 +497,187 @@ async def coding_challenge(
 # =====================================================
 # 5 GRADE CODE SUBMISSION
 # =====================================================
+async def _verified_suite(suite):
+    """
+    Keep only the generated test cases the reference solution passes, so a
+    wrong expected value never fails a candidate.
+    """
+    if not isinstance(suite, dict):
+        return None
+
+    if not suite.get("test_cases") or not suite.get("reference_solution"):
+        return None
+
+    report = await call_mcp_tool("run_tests", {
+        "language": suite.get("language", ""),
+        "code": suite["reference_solution"],
+        "function_name": suite.get("function_name", ""),
+        "test_cases": suite["test_cases"],
+        "param_types": suite.get("param_types") or None,
+        "priority": "grade",
+    })
+
+    passing = [
+        suite["test_cases"][case["index"]]
+        for case in report.get("cases", [])
+        if case["passed"]
+    ]
+    if not passing:
+        return None
+
+    suite["test_cases"] = passing
+    return suite
+
+
+# Fields of a graded case the candidate never sees: the suite stays hidden
+_HIDDEN_CASE_FIELDS = ("input", "expected")
+
+
+def _public_cases(cases: list) -> list:
+    return [{k: v for k, v in c.items() if k not in _HIDDEN_CASE_FIELDS} for c in cases]
+
+
+def _save_report(data: dict):
+    """
+    Store the outcome behind `data["report_id"]`; it is rendered on
+    download. If it can't be stored the report is marked failed, so it
+    doesn't stay pending.
+    """
+    try:
+        report_jobs.submit(
+            data["report_id"],
+            candidate_name=INTERVIEW_CONTEXT["candidate_name"],
+            experience_level=INTERVIEW_CONTEXT["experience_level"],
+            selected_tech=INTERVIEW_CONTEXT["selected_tech"],
+            interview_score=INTERVIEW_CONTEXT["interview_score"],
+            total_questions=INTERVIEW_CONTEXT["total_questions"],
+            coding_result=data,
+            interview_feedback=INTERVIEW_CONTEXT["interview_feedback"],
+            transcript=list(INTERVIEW_CONTEXT["transcript"]),
+        )
+    except Exception as e:
+        print("Report record failed:", e)
+        report_jobs.fail(data["report_id"], str(e))
+
+
+def _profile(suite: dict, language: str, code: str):
+    """Empirical complexity of a passing submission vs the reference solution."""
+    if not suite.get("param_types"):
+        return None
+
+    profile = code_runner.call("profile_code", {
+        "language": language,
+        "code": code,
+        "function_name": suite["function_name"],
+        "param_types": suite["param_types"],
+        "reference_code": suite["reference_solution"],
+        "reference_language": suite.get("language") or language,
+    })
+    return profile if profile.get("candidate") else None
+
+
+def _review_and_report(
+    feedback_id: str, problem: str, code: str, data: dict, cases: list, suite: dict, language: str
+):
+    """
+    Background: profile a fully passing submission, LLM feedback on the
+    already-scored result (`cases` are the full per-case results), then
+    the report.
+    """
+    if data["verdict"] == "pass":
+        data["performance"] = _profile(suite, language, code)
+
+    try:
+        result = ReviewCrew().crew().kickoff(
+            inputs={
+                "problem": problem,
+                "candidate_code": code,
+                "test_results": json.dumps(
+                    [
+                        {k: c[k] for k in ("input", "expected", "actual", "passed", "error")}
+                        for c in cases
+                    ]
+                ),
+                "performance": json.dumps(data.get("performance") or ""),
+            }
+        )
+        review = get_task_output(result, "review_coding_solution")
+    except Exception as e:
+        review = f"Feedback unavailable: {e}"
+
+    FEEDBACK[feedback_id] = {
+        "status": "done",
+        "feedback": review,
+        "performance": data.get("performance"),
+    }
+    _save_report({**data, "feedback": data["feedback"] + "\n" + review})
+
+
 @app.post("/grade-code")
 async def grade_code(
     problem: str = Form(...),
     code: str = Form(...),
+    challenge_id: str = Form(""),
+    language: str = Form(""),
 ):
-    crew = GradingCrew().crew()
+    suite = CHALLENGES.get(challenge_id, {}).get("suite")
+
+    # ── Deterministic path: execute against the stored test suite ──
+    if suite and language:
+        # the editor sends the selected tech (django, spring…); run the
+        # framework's core language, else the suite's own
+        language = _runner_language(language, suite.get("language", ""))
+        report = await call_mcp_tool("run_tests", {
+            "language": language,
+            "code": code,
+            "function_name": suite["function_name"],
+            "test_cases": suite["test_cases"],
+            "param_types": suite.get("param_types") or None,
+            "priority": "grade",
+        })
+
+        # the runner is saturated: ask the client to retry, don't fail the grade
+        if "retry_after" in report:
+            return _busy(report)
+
+        # a driver that could not be built or did not run to the end is
+        # not a verdict on the candidate: fall back to the LLM grader
+        if report.get("cases") and report.get("exit_code") == 0 and report["total"]:
+            all_passed = report["passed"] == report["total"]
+            feedback_id = uuid.uuid4().hex
+            data = {
+                "score": 1 if all_passed else 0,
+                "verdict": "pass" if all_passed else "fail",
+                "feedback": f"Passed {report['passed']} of {report['total']} test cases.",
+                "tests_passed": report["passed"],
+                "tests_total": report["total"],
+                "cases": _public_cases(report["cases"]),
+                "feedback_id": feedback_id,
+                "report_id": report_jobs.reserve(),
+            }
+
+            FEEDBACK[feedback_id] = {"status": "pending", "feedback": ""}
+            asyncio.get_running_loop().run_in_executor(
+                None, _review_and_report, feedback_id, problem, code, dict(data), report["cases"],
+                suite, language,
+            )
+            return data
+
+    # ── Fallback: LLM grading ──
+    # Results of the candidate's own Run of this exact code are passed in,
+    # so the grader does not spend a tool call re-executing it.
+    language = _runner_language(language or "python", (language or "python").strip().lower())
+    last_run = _recorded_run(challenge_id, language, code)
+
+    grading = GradingCrew()
+    crew = grading.crew()
 
     result = crew.kickoff(
         inputs={
             "problem": problem,
             "candidate_code": code,
+            "language": language,
+            "run_results": json.dumps(last_run) if last_run else "None recorded.",
         }
     )
 
@@ -254,68 +688,223 @@ async def grade_code(
     except Exception:
         data = {"score": 0, "verdict": "fail", "feedback": "error"}
 
-    os.makedirs("reports", exist_ok=True)
-    output_path = f"reports/{INTERVIEW_CONTEXT['candidate_name']}_report.pdf"
-
-    generate_report(
-        output_path=output_path,
-        candidate_name=INTERVIEW_CONTEXT["candidate_name"],
-        experience_level=INTERVIEW_CONTEXT["experience_level"],
-        selected_tech=INTERVIEW_CONTEXT["selected_tech"],
-        interview_score=INTERVIEW_CONTEXT["interview_score"],
-        total_questions=INTERVIEW_CONTEXT["total_questions"],
-        coding_result=data,
-        interview_feedback=INTERVIEW_CONTEXT["interview_feedback"],
-    )
+    data["grading_stats"] = grading.stats.as_dict()
 
-    print("Report saved to:", os.path.abspath(output_path))
+    data["report_id"] = report_jobs.reserve()
+    _save_report(data)
     return data
 
 
+@app.get("/sessions/{session_id}")
+async def get_session(session_id: str):
+    """
+    An interview session's analysis and per-stage token usage: prompt
+    tokens, the share served from the provider's prompt cache, completion
+    tokens and LLM calls.
+    """
+    session = interview_sessions.get(session_id)
+    if session is None:
+        return JSONResponse({"status": "unknown"}, status_code=404)
+    return session.as_dict()
+
+
+@app.get("/feedback/{feedback_id}")
+async def get_feedback(feedback_id: str):
+    """Poll the LLM review of a test-graded submission."""
+    return FEEDBACK.get(feedback_id, {"status": "unknown", "feedback": ""})
+
+
+@app.get("/reports")
+async def list_reports(
+    q: str = "",
+    tech: str = "",
+    result: str = "",
+    min_percent: int = 0,
+    limit: int = 20,
+    cursor: int = 0,
+):
+    """
+    Search the report catalog, newest first. `q` matches candidate,
+    technology, level, result and feedback; pass `next_cursor` back as
+    `cursor` for the next page.
+    """
+    page = report_catalog.search(
+        q=q, tech=tech, result=result, min_percent=min_percent, limit=limit, cursor=cursor
+    )
+    for entry in page["reports"]:
+        entry["url"] = f"/reports/{entry['report_id']}"
+    return page
+
+
+@app.get("/reports/export")
+async def export_reports(q: str = "", tech: str = "", result: str = "", min_percent: int = 0):
+    """
+    Every matching report with its full record (scores, feedback, Q/A
+    transcript) as NDJSON, straight from the catalog.
+    """
+    def lines():
+        for entry in report_catalog.export(q=q, tech=tech, result=result, min_percent=min_percent):
+            yield json.dumps(entry) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+REPORT_MEDIA_TYPES = {"pdf": "application/pdf", "html": "text/html"}
+
+
+@app.get("/reports/{report_id}")
+async def get_report(report_id: str, format: str = "pdf"):
+    """
+    The report as `pdf`, `html` or `json`. PDF and HTML are rendered on
+    first download and cached; 202 while the outcome is still pending.
+    """
+    status = report_jobs.status(report_id)
+    if status is None:
+        return JSONResponse({"status": "unknown"}, status_code=404)
+    if status == "pending":
+        return JSONResponse({"status": "pending"}, status_code=202)
+    if status == "failed":
+        return JSONResponse(
+            {"status": "failed", "error": report_jobs.error(report_id)}, status_code=500
+        )
+
+    if format == "json":
+        return {**report_catalog.get(report_id), "record": report_catalog.record(report_id)}
+    if format not in REPORT_MEDIA_TYPES:
+        return JSONResponse({"error": f"Unknown format: {format}"}, status_code=400)
+
+    try:
+        path = await asyncio.wrap_future(report_jobs.render(report_id, format))
+    except KeyError:
+        return JSONResponse({"status": "unknown"}, status_code=404)
+    except Exception as e:
+        return JSONResponse({"status": "failed", "error": str(e)}, status_code=500)
+
+    return FileResponse(
+        path,
+        media_type=REPORT_MEDIA_TYPES[format],
+        filename=f"report_{report_id}.{format}",
+        content_disposition_type="inline" if format == "html" else "attachment",
+    )
+
+
+# =====================================================
+# RUN RESULTS  (reused by /grade-code)
+# =====================================================
+def _code_hash(language: str, code: str) -> str:
+    """Hash ignoring line endings and trailing whitespace."""
+    lines = code.replace("\r\n", "\n").split("\n")
+    normalized = "\n".join(line.rstrip() for line in lines).strip("\n")
+    return hashlib.sha256(f"{language}\0{normalized}".encode("utf-8")).hexdigest()
+
+
+def _record_run(challenge_id: str, language: str, code: str, result: dict):
+    """Remember what the code-runner returned for this exact source."""
+    if "MCP server is not running" in result.get("stderr", ""):
+        return
+
+    runs = RUN_RESULTS.setdefault(challenge_id, OrderedDict())
+    key = _code_hash(language, code)
+    runs.pop(key, None)
+    runs[key] = result
+    while len(runs) > RUN_RESULTS_PER_CHALLENGE:
+        runs.popitem(last=False)
+
+
+def _runner_language(language: str, default: str = "") -> str:
+    """
+    The code-runner language for a language or tech name: frameworks map
+    to their core language (django → python, spring → java); `default`
+    when there is no runner for it.
+    """
+    name = (language or "").strip().lower()
+    if name not in RUNNER_LANGUAGES:
+        skill = skill_matcher().resolve(name)
+        if skill is not None and skill.language:
+            name = skill.language.lower()
+    return RUNNER_LANGUAGES.get(name, default)
+
+
+def _recorded_run(challenge_id: str, language: str, code: str):
+    return RUN_RESULTS.get(challenge_id, {}).get(_code_hash(language, code))
+
+
 # ======================================================
 # RUN CODE  (MCP stdio bridge)
 # =====================================================
+def _busy(result: dict) -> JSONResponse:
+    """503 with Retry-After for a code-runner admission rejection."""
+    return JSONResponse(
+        result,
+        status_code=503,
+        headers={"Retry-After": str(result["retry_after"])},
+    )
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _stream_run(payload: dict, challenge_id: str = ""):
+    """
+    Re-emit the MCP server's progress notifications as Server-Sent Events:
+    `output` events carry {"stream", "text"} chunks, a final `result`
+    event carries the usual stdout / stderr / exit_code dict.
+    """
+    loop = asyncio.get_running_loop()
+    chunks: asyncio.Queue = asyncio.Queue()
+
+    # runs on the MCP client's loop; hand chunks over to this one
+    async def on_progress(progress, total, message):
+        if message:
+            loop.call_soon_threadsafe(chunks.put_nowait, _sse("output", json.loads(message)))
+
+    async def call():
+        try:
+            result = await code_runner.acall(
+                "run_code_stream", payload, progress_callback=on_progress
+            )
+            if "retry_after" not in result:
+                _record_run(challenge_id, payload["language"], payload["code"], result)
+            await chunks.put(_sse("result", result))
+        finally:
+            await chunks.put(None)
+
+    task = asyncio.create_task(call())
+    try:
+        while (event := await chunks.get()) is not None:
+            yield event
+    finally:
+        task.cancel()
+
+
 @app.post("/run-code")
 async def run_code_endpoint(req: RunCodeRequest):
     """
     Forwards code execution to the MCP HTTP server running on port 8001.
     The MCP server handles the actual subprocess execution and returns
     stdout / stderr / exit_code.
+
+    With `stream: true` the response is a `text/event-stream` that
+    delivers output while the program is still running.
     """
     if not req.language or not req.code:
         return {"stdout": "", "stderr": "Missing language or code", "exit_code": 1}
 
     payload = {
-        "language": req.language.strip().lower(),
+        "language": _runner_language(req.language, req.language.strip().lower()),
         "code": req.code,
     }
 
-    try:
-        from mcp.client.streamable_http import streamablehttp_client
-        from mcp import ClientSession
-
-        async with streamablehttp_client("http://127.0.0.1:8001/mcp/") as (read, write, _):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                result = await session.call_tool("run_code", payload)
-
-                if result.content:
-                    raw = result.content[0].text
-                    try:
-                        return json.loads(raw)
-                    except Exception:
-                        return {"stdout": raw, "stderr": "", "exit_code": 0}
-
-                return {"stdout": "", "stderr": "Empty response from MCP server", "exit_code": 1}
+    if req.stream:
+        return StreamingResponse(
+            _stream_run(payload, req.challenge_id),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
 
-    except Exception as e:
-        import traceback
-        err = traceback.format_exc()
-        print("RUN CODE ERROR:", err, flush=True)
-        if "Connect" in err or "refused" in err.lower():
-            return {
-                "stdout": "",
-                "stderr": "MCP server is not running. Start it with: python mcp_server/server.py",
-                "exit_code": 1,
-            }
-        return {"stdout": "", "stderr": str(e), "exit_code": 1}
\ No newline at end of file
+    result = await call_mcp_tool("run_code", payload)
+    if "retry_after" in result:
+        return _busy(result)
+    _record_run(req.challenge_id, payload["language"], req.code, result)
+    return result
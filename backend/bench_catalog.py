@@ -0,0 +1,76 @@
+"""
+Benchmark: report catalog queries
+=================================
+Fills a throwaway catalog with synthetic reports, then times the queries
+behind GET /reports: the newest page, a deep page, filters and full-text
+search.
+
+    python bench_catalog.py [reports]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from projecttest.utils.report_catalog import ReportCatalog  # noqa: E402
+
+FIRST = ["Ana", "Ben", "Chen", "Dara", "Elif", "Femi", "Goran", "Hana", "Ivan", "Jun"]
+LAST = ["Silva", "Okafor", "Novak", "Tanaka", "Meyer", "Haddad", "Kowalski", "Reyes"]
+TECH = ["Python", "JavaScript", "Java", "C#", "C++", "React", "Django", "Spring"]
+LEVEL = ["Junior", "Intermediate", "Senior"]
+REMARKS = [
+    "clear explanation of indexing", "missed edge cases", "good grasp of async",
+    "struggled with recursion", "solid testing habits", "weak on complexity analysis",
+]
+
+
+def fill(catalog, n):
+    rng = random.Random(0)
+    for i in range(n):
+        score = rng.randint(0, 10)
+        catalog.add(
+            report_id=f"r{i}",
+            candidate_name=f"{rng.choice(FIRST)} {rng.choice(LAST)}",
+            experience_level=rng.choice(LEVEL),
+            selected_tech=rng.choice(TECH),
+            interview_score=score,
+            total_questions=10,
+            coding_result={"score": score % 2, "verdict": rng.choice(["pass", "fail"]), "feedback": ""},
+            interview_feedback="\n".join(rng.sample(REMARKS, 3)),
+        )
+
+
+def bench(label, fn, runs=200):
+    fn()
+    start = time.perf_counter()
+    for _ in range(runs):
+        page = fn()
+    per_query = (time.perf_counter() - start) / runs * 1e3
+    print(f"{label:<32} {per_query:7.2f} ms/query   ({len(page['reports'])} rows)")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = ReportCatalog(os.path.join(tmp, "catalog.db"))
+        start = time.perf_counter()
+        fill(catalog, n)
+        print(f"indexed {n} reports in {time.perf_counter() - start:.1f} s\n")
+
+        deep = catalog.search(limit=100)
+        for _ in range(n // 200):
+            deep = catalog.search(limit=100, cursor=deep["next_cursor"])
+
+        bench("newest page", lambda: catalog.search())
+        bench("page at the halfway point", lambda: catalog.search(cursor=deep["next_cursor"]))
+        bench("tech = Java", lambda: catalog.search(tech="java"))
+        bench("result = PASS, >= 80%", lambda: catalog.search(result="pass", min_percent=80))
+        bench("search 'tanaka'", lambda: catalog.search(q="tanaka"))
+        bench("search 'senior recurs'", lambda: catalog.search(q="senior recurs"))
+        bench("search + tech + result", lambda: catalog.search(q="okafor", tech="Python", result="FAIL"))
+        catalog.close()
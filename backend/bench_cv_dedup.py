@@ -0,0 +1,76 @@
+"""
+Benchmark: near-duplicate CV lookup
+===================================
+Loads an index with synthetic historical CV signatures, then times a
+lookup for a re-exported copy of a known CV and for an unseen CV, against
+a brute-force comparison with every stored signature.
+
+    python bench_cv_dedup.py [historical CVs]
+"""
+
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from projecttest.utils.cv_dedup import (  # noqa: E402
+    NUM_PERM,
+    CVIndex,
+    signature,
+    similarity,
+)
+
+rng = random.Random(0)
+VOCABULARY = [f"term{i}" for i in range(20_000)] + ["python", "django", "react", "sql", "aws"]
+
+
+def fake_cv(words=600):
+    body = " ".join(rng.choice(VOCABULARY) for _ in range(words))
+    return f"Jane Doe\njane@example.com  +44 20 7946 0958\n{body}"
+
+
+def bench(label, fn, runs=1000):
+    fn()
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    per_call = (time.perf_counter() - start) / runs * 1e3
+    print(f"{label:<34} {per_call:8.3f} ms")
+    return per_call
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    index = CVIndex(":memory:")
+    index._conn()
+    start = time.perf_counter()
+    for cv_id in range(1, n + 1):
+        # unrelated CVs have MinHash values that rarely coincide
+        index._insert(cv_id, array("Q", (rng.getrandbits(61) for _ in range(NUM_PERM))))
+    print(f"loaded {n} historical signatures in {time.perf_counter() - start:.1f} s\n")
+
+    known = fake_cv()
+    index.add(signature(known), {"candidate_name": "Jane Doe"})
+    reexport = known.replace("jane@example.com", "jane.doe@mail.com").replace(
+        "+44 20 7946 0958", "+1 415 555 0100"
+    )
+    unseen = fake_cv()
+
+    sig_reexport, sig_unseen = signature(reexport), signature(unseen)
+    match = index.find(sig_reexport)
+    print(f"re-export matched: {match is not None}, similarity {match and match['similarity']}")
+    print(f"unseen matched:    {index.find(sig_unseen) is not None}\n")
+
+    bench("signature (600-word CV)", lambda: signature(reexport), runs=100)
+    bench("LSH lookup, duplicate", lambda: index.find(sig_reexport))
+    bench("LSH lookup, unseen", lambda: index.find(sig_unseen))
+    signatures = list(index._signatures.values())
+    bench(
+        "brute force, every signature",
+        lambda: max(similarity(sig_unseen, s) for s in signatures),
+        runs=3,
+    )
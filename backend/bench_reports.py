@@ -0,0 +1,133 @@
+"""
+Benchmark: PDF reports per second
+=================================
+Builds the same report repeatedly with the vector score chart and, when
+matplotlib is installed, with the old pyplot → PNG → Image chart. Then,
+in a directory already holding 10k reports, compares probing for the next
+free ReportN.pdf with the index-backed allocator, and rebuilding the
+template (font, styles, headings) per report with the cached one.
+
+    python bench_reports.py [reports]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+
+from projecttest.utils import pdf_report  # noqa: E402
+
+REPORT_ARGS = dict(
+    candidate_name="Bench Candidate",
+    experience_level="Senior",
+    selected_tech="Python",
+    interview_score=7,
+    total_questions=10,
+    coding_result={"score": 1, "verdict": "pass", "feedback": "Passed 12 of 12 test cases."},
+    interview_feedback="Q1: correct\nQ2: partially correct\nQ3: correct",
+)
+
+
+def pyplot_chart(score, total):
+    """The chart as reports used to draw it: a temp PNG per report."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from reportlab.platypus import Image
+
+    plt.figure()
+    plt.bar(["Correct", "Wrong"], [score, total - score])
+    plt.title("Interview Performance")
+    plt.ylabel("Answers")
+    with tempfile.NamedTemporaryFile(suffix=".png") as f:
+        plt.savefig(f.name)
+        plt.close()
+        # Image reads lazily, so load the bytes before the file goes away
+        return Image(io.BytesIO(f.read()), width=350, height=220)
+
+
+def probe_next_filename(base_dir, prefix="Report"):
+    """The old allocator: try Report1.pdf, Report2.pdf, … until one is free."""
+    i = 1
+    while True:
+        filename = os.path.join(base_dir, f"{prefix}{i}.pdf")
+        if not os.path.exists(filename):
+            return filename
+        i += 1
+
+
+def bench_allocation(label, allocate, runs, base_dir):
+    start = time.perf_counter()
+    for _ in range(runs):
+        open(allocate(base_dir), "wb").close()
+    per_call = (time.perf_counter() - start) / runs * 1e6
+    print(f"{label:<20} {per_call:8.1f} µs/report name")
+    return per_call
+
+
+def bench_template(label, runs, cold):
+    start = time.perf_counter()
+    for _ in range(runs):
+        if cold:
+            pdf_report._template.cache_clear()
+        pdf_report._template()
+        pdf_report._static("title")
+    per_call = (time.perf_counter() - start) / runs * 1e6
+    print(f"{label:<20} {per_call:8.1f} µs/report")
+    return per_call
+
+
+def bench_full(label, runs, base_dir):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(runs):
+            pdf_report.generate_report(
+                output_path=pdf_report.get_next_report_filename(base_dir), **REPORT_ARGS
+            )
+        rate = runs / (time.perf_counter() - start)
+    print(f"{label:<20} {rate:8.1f} reports/s")
+    return rate
+
+
+def bench(label, runs, out_dir):
+    with contextlib.redirect_stdout(io.StringIO()):  # generate_report prints each path
+        pdf_report.generate_report(output_path=os.path.join(out_dir, "warmup.pdf"), **REPORT_ARGS)
+        start = time.perf_counter()
+        for i in range(runs):
+            pdf_report.generate_report(output_path=os.path.join(out_dir, f"{i}.pdf"), **REPORT_ARGS)
+        rate = runs / (time.perf_counter() - start)
+    print(f"{label:<20} {rate:8.1f} reports/s")
+    return rate
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        for i in range(1, 10_001):
+            open(os.path.join(out_dir, f"Report{i}.pdf"), "wb").close()
+        print("10k existing reports:")
+        base = bench_allocation("probe loop", probe_next_filename, runs, out_dir)
+        new = bench_allocation("index", pdf_report.get_next_report_filename, runs, out_dir)
+        print(f"{'':<20} {base / new:8.1f}x faster")
+        base = bench_template("template per report", runs, cold=True)
+        new = bench_template("cached template", runs, cold=False)
+        print(f"{'':<20} {base / new:8.1f}x faster")
+        bench_full("full report", runs, out_dir)
+        print()
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        new = bench("vector chart", runs, out_dir)
+        try:
+            import matplotlib  # noqa: F401
+        except ImportError:
+            print("matplotlib not installed; skipping the PNG comparison")
+        else:
+            pdf_report.score_chart = pyplot_chart
+            base = bench("pyplot PNG chart", runs, out_dir)
+            print(f"{'':<20} {new / base:8.1f}x faster")
@@ -1,5 +1,6 @@
 from crewai import Agent, Crew, Task
 from crewai.project import CrewBase, agent, crew, task
+from projecttest.models.challenge_tests import ChallengeTestSuite
 
 
 @CrewBase
@@ -20,10 +21,20 @@ class ChallengeCrew:
             config=self.tasks_config["generate_coding_challenge"]
         )
 
+    @task
+    def generate_challenge_tests(self) -> Task:
+        return Task(
+            config=self.tasks_config["generate_challenge_tests"],
+            output_pydantic=ChallengeTestSuite
+        )
+
     @crew
     def crew(self) -> Crew:
         return Crew(
             agents=[self.interviewer()],
-            tasks=[self.generate_coding_challenge()],
+            tasks=[
+                self.generate_coding_challenge(),
+                self.generate_challenge_tests(),
+            ],
             verbose=False
         )
@@ -1,20 +1,31 @@
 from crewai import Agent, Crew, Task
 from crewai.project import CrewBase, agent, crew, task
-from projecttest.tools.code_runner import run_code_tool
 from projecttest.tools.run_code_tool import RunCodeTool
+from projecttest.utils.agent_budget import AgentRunStats, agent_limits, load_budget
 
 
 @CrewBase
 class GradingCrew:
+    """One instance per grading; `stats` records what the agent loop cost."""
     agents_config = "config/agents.yaml"
     tasks_config = "config/grading_tasks.yaml"
 
+    def __init__(self):
+        self.budget = load_budget("grading")
+        self.stats = AgentRunStats()
+
     @agent
     def answer_grader(self) -> Agent:
         return Agent(
             config=self.agents_config["answer_grader"],
             verbose=True,
-            tools=[RunCodeTool()]
+            tools=[
+                RunCodeTool(
+                    max_calls=self.budget.get("max_tool_calls"),
+                    stats=self.stats,
+                )
+            ],
+            **agent_limits(self.budget),
         )
 
     @task
@@ -26,5 +37,6 @@ class GradingCrew:
         return Crew(
             agents=[self.answer_grader()],
             tasks=[self.grade_coding_solution()],
+            step_callback=self.stats.step,
             verbose=False,
         )
@@ -0,0 +1,114 @@
+import os
+from functools import lru_cache
+
+import yaml
+from crewai import Agent, Crew, Task
+from crewai.project import CrewBase, agent, crew, task
+from projecttest.models.challenge_tests import ChallengeTestSuite
+from projecttest.models.cv_analysis import CVAnalysis
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config")
+
+# Crews whose task prompts this crew runs, as they define them
+PROMPT_FILES = ("analysis_tasks.yaml", "question_tasks.yaml", "tasks.yaml")
+
+# Kickoff input for the challenge prompt's {experience_level}: the level is
+# only known once the analysis task has run
+EXPERIENCE_LEVEL = "the experience level in the CV analysis"
+
+
+@lru_cache(maxsize=1)
+def _prompts() -> dict:
+    """Task prompts of PROMPT_FILES, without their own agent and context."""
+    prompts = {}
+    for name in PROMPT_FILES:
+        with open(os.path.join(CONFIG_DIR, name), encoding="utf-8") as f:
+            for task_name, config in (yaml.safe_load(f) or {}).items():
+                prompts[task_name] = {
+                    k: v for k, v in config.items() if k not in ("agent", "context")
+                }
+    return prompts
+
+
+@CrewBase
+class InterviewPrepCrew:
+    """
+    CV analysis, interview questions and coding challenge in one kickoff.
+    Questions and challenge are async tasks that both start once the
+    analysis is done, so they take as long as the slower of the two; the
+    challenge tests follow the challenge. The prompts are those of
+    CVAnalysisCrew, QuestionCrew and ChallengeCrew; config/prep_tasks.yaml
+    only wires them to this crew's agents.
+    """
+    agents_config = "config/agents.yaml"
+    tasks_config = "config/prep_tasks.yaml"
+
+    def __init__(self, with_challenge: bool = True):
+        self.with_challenge = with_challenge
+
+    def _config(self, name: str) -> dict:
+        return {**_prompts()[name], **self.tasks_config[name]}
+
+    @agent
+    def cv_analyzer(self) -> Agent:
+        return Agent(
+            config=self.agents_config["cv_analyzer"],
+            verbose=False
+        )
+
+    # two interviewer instances, so the parallel tasks never share an
+    # agent's executor; the same config keeps their prompt prefix identical
+    @agent
+    def question_writer(self) -> Agent:
+        return Agent(
+            config=self.agents_config["interviewer"],
+            verbose=False
+        )
+
+    @agent
+    def challenge_writer(self) -> Agent:
+        return Agent(
+            config=self.agents_config["interviewer"],
+            verbose=False
+        )
+
+    @task
+    def analyze_cv_task(self) -> Task:
+        return Task(
+            config=self._config("analyze_cv_task"),
+            output_pydantic=CVAnalysis
+        )
+
+    @task
+    def generate_interview_questions(self) -> Task:
+        return Task(
+            config=self._config("generate_interview_questions"),
+            async_execution=True
+        )
+
+    @task
+    def generate_coding_challenge(self) -> Task:
+        return Task(
+            config=self._config("generate_coding_challenge"),
+            async_execution=True
+        )
+
+    @task
+    def generate_challenge_tests(self) -> Task:
+        return Task(
+            config=self._config("generate_challenge_tests"),
+            output_pydantic=ChallengeTestSuite
+        )
+
+    @crew
+    def crew(self) -> Crew:
+        tasks = [self.analyze_cv_task(), self.generate_interview_questions()]
+        agents = [self.cv_analyzer(), self.question_writer()]
+        if self.with_challenge:
+            tasks += [self.generate_coding_challenge(), self.generate_challenge_tests()]
+            agents.append(self.challenge_writer())
+        return Crew(
+            agents=agents,
+            tasks=tasks,
+            verbose=False
+        )
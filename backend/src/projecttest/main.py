@@ -1,10 +1,18 @@
-from projecttest.crew import InterviewCrew
+from projecttest.analysis_crew import CVAnalysisCrew
+from projecttest.question_crew import QuestionCrew
+from projecttest.challenge_crew import ChallengeCrew
 from projecttest.utils.file_reader import read_cv_file
+from projecttest.utils.cv_compactor import compact_for
+from projecttest.utils.interview_session import interview_sessions
+from projecttest.utils.skill_matcher import skill_candidates, tech_in_cv
 from crewai import Agent, Task, Crew
 from projecttest.grading_crew import GradingCrew
 from projecttest.utils.pdf_report import generate_report
 
+import argparse
+import asyncio
 import json
+import os
 
 
 # =====================================================
@@ -62,6 +70,20 @@ def generate_interview_feedback(questions, answers):
 def run():
     cv_path = input("Enter path to CV file:\n").strip()
     cv_text = read_cv_file(cv_path)
+    session = interview_sessions.open(cv_text)
+
+    analysis_result = CVAnalysisCrew().crew().kickoff(
+        inputs={
+            "cv_text": compact_for(cv_text, "analysis"),
+            "skill_candidates": skill_candidates(cv_text),
+        }
+    )
+    session.record("analysis", analysis_result)
+    analysis = get_task_output(analysis_result, "analyze_cv_task")
+    try:
+        session.set_analysis(json.loads(analysis))
+    except Exception:
+        pass
 
     # =====================================================
     # ================= INTERVIEW =========================
@@ -70,13 +92,18 @@ def run():
     while True:
         selected_tech = input("\nEnter technology to be interviewed on:\n").strip()
 
-        crew = InterviewCrew().crew()
+        if not tech_in_cv(cv_text, selected_tech):
+            print("Technology not found. Try again.")
+            continue
+
+        crew = QuestionCrew().crew()
         result = crew.kickoff(
             inputs={
-                "cv_text": cv_text,
+                "session_context": session.context(),
                 "selected_tech": selected_tech
             }
         )
+        session.record("questions", result)
 
         output = get_task_output(result, "generate_interview_questions")
 
@@ -111,7 +138,15 @@ def run():
 
     print("\n\n=== CODING CHALLENGE ===\n")
 
-    challenge = get_task_output(result, "generate_coding_challenge")
+    challenge_result = ChallengeCrew().crew().kickoff(
+        inputs={
+            "session_context": session.context(),
+            "selected_tech": selected_tech,
+            "experience_level": session.experience_level(),
+        }
+    )
+    session.record("challenge", challenge_result)
+    challenge = get_task_output(challenge_result, "generate_coding_challenge")
 
     if challenge == "No coding challenge for this technology.":
         print(challenge)
@@ -134,10 +169,15 @@ def run():
 
     grading_crew = GradingCrew().crew()
 
+    language = {
+        ".js": "javascript", ".java": "java", ".cs": "csharp", ".cpp": "cpp",
+    }.get(os.path.splitext(solution_path)[1].lower(), "python")
+
     grading_result = grading_crew.kickoff(
         inputs={
             "candidate_code": candidate_code,
-            "problem": challenge
+            "problem": challenge,
+            "language": language,
         }
     )
 
@@ -150,8 +190,6 @@ def run():
     # ================== PDF REPORT =======================
     # =====================================================
 
-    analysis = get_task_output(result, "analyze_cv_task")
-
     try:
         analysis_json = json.loads(analysis)
         candidate_name = analysis_json.get("candidate_name", "Unknown")
@@ -240,5 +278,42 @@ def evaluate_answer(question, answer):
         return False
 
 
+# =====================================================
+# BULK SCREENING
+# =====================================================
+def screen():
+    """
+    projecttest-screen CV_DIR [-o results.jsonl] [--concurrency N]
+    [--extract-workers N] [--restart]
+    """
+    from projecttest.screening import (
+        SCREEN_CONCURRENCY,
+        SCREEN_EXTRACT_WORKERS,
+        screen_directory,
+    )
+
+    parser = argparse.ArgumentParser(description="Analyze every CV in a directory.")
+    parser.add_argument("cv_dir", help="directory of PDF / TXT CVs")
+    parser.add_argument("-o", "--output", default="screening.jsonl", help="JSONL results file")
+    parser.add_argument("--concurrency", type=int, default=SCREEN_CONCURRENCY,
+                        help="CV analyses in flight at once")
+    parser.add_argument("--extract-workers", type=int, default=SCREEN_EXTRACT_WORKERS,
+                        help="processes extracting CV text")
+    parser.add_argument("--restart", action="store_true",
+                        help="overwrite the results file instead of resuming")
+    args = parser.parse_args()
+
+    summary = asyncio.run(
+        screen_directory(
+            args.cv_dir,
+            args.output,
+            concurrency=args.concurrency,
+            extract_workers=args.extract_workers,
+            resume=not args.restart,
+        )
+    )
+    print(json.dumps(summary))
+
+
 if __name__ == "__main__":
     run()
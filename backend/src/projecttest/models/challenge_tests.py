@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Any, List
+
+
+class TestCase(BaseModel):
+    input: List[Any]
+    expected: Any
+
+
+class ChallengeTestSuite(BaseModel):
+    language: str
+    function_name: str
+    param_types: List[str]
+    test_cases: List[TestCase]
+    reference_solution: str
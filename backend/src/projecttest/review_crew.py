@@ -0,0 +1,30 @@
+from crewai import Agent, Crew, Task
+from crewai.project import CrewBase, agent, crew, task
+from projecttest.utils.agent_budget import agent_limits, load_budget
+
+
+@CrewBase
+class ReviewCrew:
+    """Qualitative feedback only; pass/fail comes from the test suite."""
+    agents_config = "config/agents.yaml"
+    tasks_config = "config/grading_tasks.yaml"
+
+    @agent
+    def answer_grader(self) -> Agent:
+        return Agent(
+            config=self.agents_config["answer_grader"],
+            verbose=False,
+            **agent_limits(load_budget("review")),
+        )
+
+    @task
+    def review_coding_solution(self) -> Task:
+        return Task(config=self.tasks_config["review_coding_solution"])
+
+    @crew
+    def crew(self) -> Crew:
+        return Crew(
+            agents=[self.answer_grader()],
+            tasks=[self.review_coding_solution()],
+            verbose=False,
+        )
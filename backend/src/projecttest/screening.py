@@ -0,0 +1,175 @@
+"""
+Bulk CV screening: analyze every CV in a directory with CVAnalysisCrew.
+
+Text extraction (PDF parsing is CPU-bound) runs in a process pool; crew
+runs go through an asyncio semaphore so at most `concurrency` LLM calls
+are in flight. A near-duplicate of an already analyzed CV reuses that
+analysis (see utils/cv_dedup.py). Each result is appended to a JSONL file
+as soon as it is ready, so an interrupted run picks up where it stopped.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from projecttest.analysis_crew import CVAnalysisCrew
+from projecttest.utils.cv_compactor import compact_cv
+from projecttest.utils.cv_dedup import cv_index, refresh_reused, signature
+from projecttest.utils.file_reader import read_cv_file
+from projecttest.utils.skill_matcher import skill_candidates
+
+CV_EXTENSIONS = (".pdf", ".txt")
+
+# Parallel CV analyses (LLM calls) and text extractions
+SCREEN_CONCURRENCY = int(os.environ.get("SCREEN_CONCURRENCY", "8"))
+SCREEN_EXTRACT_WORKERS = int(os.environ.get("SCREEN_EXTRACT_WORKERS", str(os.cpu_count() or 1)))
+
+
+def find_cvs(cv_dir: str) -> list:
+    """CV files under `cv_dir`, as sorted paths relative to it."""
+    found = []
+    for root, _, files in os.walk(cv_dir):
+        for name in files:
+            if name.lower().endswith(CV_EXTENSIONS):
+                found.append(os.path.relpath(os.path.join(root, name), cv_dir))
+    return sorted(found)
+
+
+def completed(output: str) -> set:
+    """Files already analyzed in `output`; failures are retried."""
+    done = set()
+    if not os.path.exists(output):
+        return done
+    with open(output, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by a crash
+            if entry.get("status") == "ok":
+                done.add(entry["file"])
+    return done
+
+
+def extract(path: str):
+    """CV text and its MinHash signature; runs in the extraction pool."""
+    cv_text = read_cv_file(path)
+    return cv_text, signature(cv_text)
+
+
+def analysis_output(result) -> dict:
+    for task in result.tasks_output:
+        if task.name == "analyze_cv_task":
+            if task.pydantic is not None:
+                return task.pydantic.model_dump()
+            return json.loads(task.raw)
+    raise ValueError("analyze_cv_task produced no output")
+
+
+class Progress:
+    """One status line: done / total, failures, throughput and ETA."""
+
+    def __init__(self, total: int, skipped: int):
+        self.total = total
+        self.skipped = skipped
+        self.ok = 0
+        self.failed = 0
+        self.start = time.monotonic()
+
+    def update(self, ok: bool):
+        if ok:
+            self.ok += 1
+        else:
+            self.failed += 1
+
+        done = self.ok + self.failed
+        elapsed = time.monotonic() - self.start
+        rate = done / elapsed if elapsed else 0.0
+        eta = (self.total - done) / rate if rate else 0.0
+        sys.stderr.write(
+            f"\r{done}/{self.total} done  {self.failed} failed  "
+            f"{rate * 60:.1f} CVs/min  ETA {eta:.0f}s   "
+        )
+        sys.stderr.flush()
+
+    def summary(self) -> dict:
+        return {
+            "screened": self.ok,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "seconds": round(time.monotonic() - self.start, 1),
+        }
+
+
+async def screen_directory(
+    cv_dir: str,
+    output: str,
+    concurrency: int = SCREEN_CONCURRENCY,
+    extract_workers: int = SCREEN_EXTRACT_WORKERS,
+    resume: bool = True,
+) -> dict:
+    """
+    Analyze every PDF/TXT under `cv_dir`, appending one JSON line per CV
+    to `output`. With `resume`, CVs already in `output` are skipped.
+    """
+    files = find_cvs(cv_dir)
+    done = completed(output) if resume else set()
+    todo = [name for name in files if name not in done]
+
+    progress = Progress(len(todo), len(files) - len(todo))
+    if not todo:
+        return progress.summary()
+
+    loop = asyncio.get_running_loop()
+    llm_slots = asyncio.Semaphore(concurrency)
+    write_lock = asyncio.Lock()
+
+    with ProcessPoolExecutor(max_workers=extract_workers) as extractor, open(
+        output, "a" if resume else "w", encoding="utf-8"
+    ) as out:
+
+        async def screen(name: str):
+            started = time.monotonic()
+            entry = {"file": name}
+            try:
+                cv_text, sig = await loop.run_in_executor(
+                    extractor, extract, os.path.join(cv_dir, name)
+                )
+                if not cv_text.strip():
+                    raise ValueError("No text could be extracted")
+
+                duplicate = cv_index.find(sig)
+                if duplicate:
+                    entry.update(
+                        status="ok",
+                        analysis=refresh_reused(duplicate["analysis"], cv_text),
+                        reused_similarity=duplicate["similarity"],
+                    )
+                else:
+                    compact = compact_cv(cv_text, "analysis")
+                    entry["cv_tokens"] = [compact.tokens_before, compact.tokens_after]
+                    async with llm_slots:
+                        result = await CVAnalysisCrew().crew().kickoff_async(
+                            inputs={
+                                "cv_text": compact.text,
+                                "skill_candidates": skill_candidates(cv_text),
+                            }
+                        )
+                    entry.update(status="ok", analysis=analysis_output(result))
+                    cv_index.add(sig, entry["analysis"])
+            except Exception as e:
+                entry.update(status="error", error=f"{type(e).__name__}: {e}")
+            entry["seconds"] = round(time.monotonic() - started, 2)
+
+            async with write_lock:
+                out.write(json.dumps(entry) + "\n")
+                out.flush()
+            progress.update(entry["status"] == "ok")
+
+        await asyncio.gather(*(screen(name) for name in todo))
+
+    sys.stderr.write("\n")
+    return progress.summary()
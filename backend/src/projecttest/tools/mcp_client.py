@@ -0,0 +1,131 @@
+import asyncio
+import json
+import threading
+import traceback
+
+MCP_URL = "http://127.0.0.1:8001/mcp/"
+
+
+def tool_error(e: Exception) -> dict:
+    err = traceback.format_exc()
+    print("RUN CODE ERROR:", err, flush=True)
+    if "Connect" in err or "refused" in err.lower():
+        return {
+            "stdout": "",
+            "stderr": "MCP server is not running. Start it with: python mcp_server/server.py",
+            "exit_code": 1,
+        }
+    return {"stdout": "", "stderr": str(e), "exit_code": 1}
+
+
+def tool_result(result) -> dict:
+    if result.content:
+        raw = result.content[0].text
+        try:
+            return json.loads(raw)
+        except Exception:
+            return {"stdout": raw, "stderr": "", "exit_code": 0}
+
+    return {"stdout": "", "stderr": "Empty response from MCP server", "exit_code": 1}
+
+
+class CodeRunnerClient:
+    """
+    Long-lived client for the MCP code-runner.
+
+    One initialised session is kept open on a background event loop and
+    shared by every caller: async endpoints use `acall`, synchronous code
+    (CrewAI tools) uses `call`. A broken session is reopened once per call.
+    """
+
+    def __init__(self, url: str = MCP_URL):
+        self.url = url
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        self._connect_lock = None
+        self._session = None
+        self._keeper = None
+
+    def _ensure_loop(self):
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name="mcp-client", daemon=True
+                ).start()
+        return self._loop
+
+    async def _connect(self):
+        from mcp.client.streamable_http import streamablehttp_client
+        from mcp import ClientSession
+
+        ready = asyncio.get_running_loop().create_future()
+
+        async def keeper():
+            try:
+                async with streamablehttp_client(self.url) as (read, write, _):
+                    async with ClientSession(read, write) as session:
+                        await session.initialize()
+                        ready.set_result(session)
+                        await asyncio.Event().wait()  # hold open until cancelled
+            except Exception as e:
+                if not ready.done():
+                    ready.set_exception(e)
+            finally:
+                if not ready.done():
+                    ready.set_exception(ConnectionError("MCP session closed"))
+
+        self._keeper = asyncio.create_task(keeper())
+        self._session = await ready
+
+    def _reset(self):
+        if self._keeper is not None:
+            self._keeper.cancel()
+        self._keeper = None
+        self._session = None
+
+    async def _call(self, name: str, payload: dict, progress_callback=None):
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+
+        for attempt in range(2):
+            async with self._connect_lock:
+                if self._session is None or self._keeper.done():
+                    self._reset()
+                    await self._connect()
+                session = self._session
+            try:
+                result = await session.call_tool(
+                    name, payload, progress_callback=progress_callback
+                )
+                return tool_result(result)
+            except Exception:
+                self._reset()
+                if attempt:
+                    raise
+
+    async def acall(self, name: str, payload: dict, progress_callback=None) -> dict:
+        """
+        Call `name` from any event loop. `progress_callback` runs on the
+        client's loop, not the caller's.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self._call(name, payload, progress_callback), self._ensure_loop()
+        )
+        try:
+            return await asyncio.wrap_future(future)
+        except Exception as e:
+            return tool_error(e)
+
+    def call(self, name: str, payload: dict, timeout: float = 120) -> dict:
+        """Blocking variant of `acall` for synchronous callers."""
+        future = asyncio.run_coroutine_threadsafe(
+            self._call(name, payload), self._ensure_loop()
+        )
+        try:
+            return future.result(timeout=timeout)
+        except Exception as e:
+            return tool_error(e)
+
+
+code_runner = CodeRunnerClient()
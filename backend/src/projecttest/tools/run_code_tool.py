@@ -1,32 +1,65 @@
 from crewai.tools import BaseTool
-import subprocess
-import tempfile
-import os
+from typing import Any, Optional, Type
+from pydantic import BaseModel, Field, PrivateAttr
+
+from projecttest.tools.mcp_client import code_runner
+
+
+class RunCodeToolInput(BaseModel):
+    """Input schema for RunCodeTool."""
+    code: str = Field(..., description="Complete source code to execute.")
+    language: str = Field(
+        "python",
+        description="One of: python, javascript, java, csharp, cpp.",
+    )
 
 
 class RunCodeTool(BaseTool):
+    """
+    One instance per crew kickoff: repeated runs of the same code are
+    answered from a memo, and at most `max_calls` real executions happen.
+    Runs are grading work, so they queue at the runner's "grade" priority.
+    """
+
     name: str = "run_code"
-    description: str = "Executes Python code and returns the output."
-
-    def _run(self, code: str) -> str:
-        try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".py") as f:
-                f.write(code.encode())
-                temp_path = f.name
-
-            result = subprocess.run(
-                ["python", temp_path],
-                capture_output=True,
-                text=True,
-                timeout=5
+    description: str = (
+        "Executes code on the MCP code-runner and returns stdout, stderr "
+        "and the exit code. Supports python, javascript, java, csharp and cpp."
+    )
+    args_schema: Type[BaseModel] = RunCodeToolInput
+    max_calls: Optional[int] = None
+    stats: Optional[Any] = None  # utils.agent_budget.AgentRunStats
+
+    _memo: dict = PrivateAttr(default_factory=dict)
+    _calls: int = PrivateAttr(default=0)
+
+    def _run(self, code: str, language: str = "python") -> str:
+        language = language.strip().lower()
+        key = (language, "\n".join(line.rstrip() for line in code.strip().splitlines()))
+
+        if key in self._memo:
+            if self.stats:
+                self.stats.tool_cache_hits += 1
+            return self._memo[key]
+
+        if self.max_calls is not None and self._calls >= self.max_calls:
+            return (
+                f"Tool budget exhausted: run_code may only be used {self.max_calls} "
+                "times per grading. Decide using the results you already have."
             )
 
-            os.remove(temp_path)
+        self._calls += 1
+        if self.stats:
+            self.stats.tool_calls += 1
 
-            if result.returncode != 0:
-                return result.stderr
+        result = code_runner.call(
+            "run_code", {"language": language, "code": code, "priority": "grade"}
+        )
 
-            return result.stdout
+        output = result.get("stdout", "")
+        if result.get("stderr"):
+            output += "\nSTDERR:\n" + result["stderr"]
+        output = f"{output}\nExit code: {result.get('exit_code', 1)}"
 
-        except Exception as e:
-            return str(e)
+        self._memo[key] = output
+        return output
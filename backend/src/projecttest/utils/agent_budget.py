@@ -0,0 +1,52 @@
+import os
+import time
+
+import yaml
+
+BUDGETS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "budgets.yaml"
+)
+
+# Budget keys that map straight onto crewai.Agent fields
+AGENT_LIMITS = ("max_iter", "max_execution_time")
+
+
+def load_budget(crew_name: str) -> dict:
+    """
+    Limits for one crew from config/budgets.yaml; empty if none are set.
+    """
+    try:
+        with open(BUDGETS_PATH, "r", encoding="utf-8") as f:
+            budgets = yaml.safe_load(f) or {}
+    except FileNotFoundError:
+        return {}
+    return budgets.get(crew_name) or {}
+
+
+def agent_limits(budget: dict) -> dict:
+    """Keyword arguments for Agent(...) from a crew budget."""
+    return {key: budget[key] for key in AGENT_LIMITS if budget.get(key)}
+
+
+class AgentRunStats:
+    """
+    Counts what one kickoff cost: agent steps (via the crew's
+    step_callback), tool executions and memoized tool results.
+    """
+
+    def __init__(self):
+        self.iterations = 0
+        self.tool_calls = 0
+        self.tool_cache_hits = 0
+        self.started = time.monotonic()
+
+    def step(self, _step_output=None):
+        self.iterations += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "iterations": self.iterations,
+            "tool_calls": self.tool_calls,
+            "tool_cache_hits": self.tool_cache_hits,
+            "seconds": round(time.monotonic() - self.started, 2),
+        }
@@ -1,20 +1,39 @@
-import matplotlib.pyplot as plt
-import os
+import math
 
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.shapes import Drawing, Group, String
+from reportlab.lib import colors
 
-def generate_score_chart(score: int, total: int, path="score_chart.png"):
+
+def score_chart(score: int, total: int, width=350, height=220) -> Drawing:
+    """
+    Correct / wrong answers as a vector bar chart. The Drawing is a
+    reportlab Flowable, so it goes straight into the PDF story.
+    """
     correct = score
     wrong = max(total - score, 0)
 
-    labels = ["Correct", "Wrong"]
-    values = [correct, wrong]
+    drawing = Drawing(width, height)
+
+    chart = VerticalBarChart()
+    chart.x, chart.y = 45, 30
+    chart.width, chart.height = width - 60, height - 65
+    chart.data = [(correct, wrong)]
+    chart.categoryAxis.categoryNames = ["Correct", "Wrong"]
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.valueMax = max(total, 1)
+    chart.valueAxis.valueStep = max(1, math.ceil(max(total, 1) / 5))
+    chart.bars[0].fillColor = colors.HexColor("#1f77b4")
+    chart.barWidth = 10
+    drawing.add(chart)
 
-    plt.figure()
-    plt.bar(labels, values)
-    plt.title("Interview Performance")
-    plt.ylabel("Answers")
+    drawing.add(
+        String(width / 2, height - 20, "Interview Performance", textAnchor="middle", fontSize=12)
+    )
 
-    plt.savefig(path)
-    plt.close()
+    label = Group(String(0, 0, "Answers", textAnchor="middle", fontSize=9))
+    label.translate(15, chart.y + chart.height / 2)
+    label.rotate(90)
+    drawing.add(label)
 
-    return path
+    return drawing
@@ -0,0 +1,175 @@
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import NamedTuple
+
+from projecttest.utils.agent_budget import load_budget
+
+# Canonical section -> headings that start it (compared lower-cased, without
+# a trailing colon)
+SECTION_HEADINGS = {
+    "summary": ("summary", "profile", "professional summary", "about me", "objective",
+                "career objective", "personal statement"),
+    # "languages" is far more often programming languages than spoken ones
+    "skills": ("skills", "technical skills", "key skills", "core competencies", "competencies",
+               "technologies", "tech stack", "technical stack", "tools", "tools and technologies",
+               "languages", "programming languages", "languages and frameworks", "frameworks"),
+    "experience": ("experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history"),
+    "projects": ("projects", "personal projects", "key projects", "selected projects"),
+    "education": ("education", "academic background", "qualifications"),
+    "certifications": ("certifications", "certificates", "courses", "training"),
+    "other": ("interests", "hobbies", "references", "personal details", "personal information",
+              "volunteering", "awards", "publications"),
+}
+_HEADING = {h: section for section, headings in SECTION_HEADINGS.items() for h in headings}
+
+# Sections each crew's prompt needs, most important first; any other section
+# is kept after these while the budget lasts. "header" is the text before
+# the first heading (name, title); a CV with no recognised headings is all
+# header.
+TASK_SECTIONS = {
+    "analysis": ("header", "skills", "experience", "summary", "education", "projects", "certifications"),
+    # shared by the question and challenge prompts (see interview_session)
+    "interview": ("skills", "experience", "projects", "summary", "header"),
+}
+
+_CONTACT = re.compile(
+    r"\S+@\S+\.\w+"                          # e-mail
+    r"|(?:https?://|www\.)\S+"               # links
+    r"|\b(?:linkedin|github)\.com/\S*",
+    re.IGNORECASE,
+)
+# digit runs long enough to be a phone number, not a "2019 - 2021" range
+_PHONE = re.compile(r"\+?\d[\d\s().-]{6,}\d")
+_BOILERPLATE = re.compile(
+    r"^(?:page \d+(?: of \d+)?|\d+\s*/\s*\d+|curriculum vitae|resume|cv)$"
+    r"|references (?:are )?available (?:up)?on request"
+    r"|personal data|data protection|gdpr",
+    re.IGNORECASE,
+)
+_SPACES = re.compile(r"[ \t\u00a0]+")
+_BULLETS = re.compile(r"^[•▪●◦■►‣∙·\-*]+\s*")
+_DIGITS = re.compile(r"\d+")
+
+
+class CompactCV(NamedTuple):
+    text: str
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+@lru_cache(maxsize=None)
+def _encoder():
+    """tiktoken's encoding when it can be loaded (it ships with crewai)."""
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Prompt tokens for `text`; about 4 characters each without tiktoken."""
+    encoder = _encoder()
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def _clean_lines(cv_text: str) -> list:
+    """
+    Whitespace-normalized lines without contact details, boilerplate or
+    running page headers / footers. PDF pages are separated by form feeds
+    (see read_cv_file); a short line at the top or bottom of several pages
+    is kept only the first time.
+    """
+    pages = [
+        [line for line in (_SPACES.sub(" ", raw).strip() for raw in page.splitlines()) if line]
+        for page in cv_text.split("\f")
+    ]
+
+    edges = Counter()
+    if len(pages) > 1:
+        for page in pages:
+            for line in {*page[:2], *page[-2:]}:
+                if len(line) <= 80:
+                    edges[_DIGITS.sub("#", line.lower())] += 1
+    running = {line for line, count in edges.items() if count > 1}
+
+    lines, seen_running = [], set()
+    for page in pages:
+        for line in page:
+            key = _DIGITS.sub("#", line.lower())
+            if key in running:
+                if key in seen_running:
+                    continue
+                seen_running.add(key)
+
+            line = _CONTACT.sub("", line)
+            line = _PHONE.sub(lambda m: "" if sum(c.isdigit() for c in m[0]) >= 9 else m[0], line)
+            line = line.strip(" |,;·•")
+            if not line or _BOILERPLATE.search(line):
+                continue
+            lines.append(_BULLETS.sub("- ", line))
+    return lines
+
+
+def _sections(lines: list) -> list:
+    """[(section, lines)] in document order, split at recognised headings."""
+    sections = [("header", [])]
+    for line in lines:
+        section = _HEADING.get(line.lower().rstrip(":").strip())
+        if section and len(line) <= 40:
+            sections.append((section, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(name, body) for name, body in sections if body]
+
+
+def compact_cv(cv_text: str, task: str, max_tokens: int = None) -> CompactCV:
+    """
+    The parts of a CV that `task` ("analysis", "interview") needs, then
+    the rest, within its token budget: `max_tokens`, else `cv_tokens`
+    from the crew's entry in config/budgets.yaml, else no limit.
+    """
+    if max_tokens is None:
+        max_tokens = load_budget(task).get("cv_tokens")
+
+    sections = _sections(_clean_lines(cv_text))
+
+    # spend the budget in priority order, then print in document order
+    priority = {name: rank for rank, name in enumerate(TASK_SECTIONS.get(task, ("header",)))}
+    order = sorted(range(len(sections)), key=lambda i: (priority.get(sections[i][0], len(priority)), i))
+
+    kept, used = {}, 0
+    for i in order:
+        body = sections[i][1]
+        if max_tokens:
+            room = max_tokens - used
+            if room <= 0:
+                break
+            while body and count_tokens("\n".join(body)) > room:
+                body = body[: len(body) * 3 // 4] if len(body) > 4 else body[:-1]
+        if body:
+            kept[i] = body
+            used += count_tokens("\n".join(body)) + 1
+
+    text = "\n\n".join("\n".join(kept[i]) for i in sorted(kept))
+    return CompactCV(text, count_tokens(cv_text), count_tokens(text))
+
+
+def compact_for(cv_text: str, task: str) -> str:
+    """compact_cv's text, logging the tokens saved."""
+    compact = compact_cv(cv_text, task)
+    if compact.tokens_before:
+        print(
+            f"CV compacted for {task}: {compact.tokens_before} -> {compact.tokens_after} tokens "
+            f"({compact.saved / compact.tokens_before:.0%} saved)"
+        )
+    return compact.text
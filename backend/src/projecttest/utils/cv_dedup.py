@@ -0,0 +1,206 @@
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from array import array
+
+from projecttest.utils.skill_matcher import skill_matcher
+
+# Near-duplicate CVs: a re-exported PDF or an updated phone number should
+# reuse the earlier analysis instead of paying for another crew run.
+CV_INDEX_PATH = os.environ.get(
+    "CV_INDEX",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "cv_index.db"),
+)
+
+# Estimated Jaccard similarity (of word 3-shingles) at which a CV counts as
+# the same one
+CV_DUPLICATE_THRESHOLD = float(os.environ.get("CV_DUPLICATE_THRESHOLD", "0.85"))
+
+# MinHash signature of NUM_PERM values, split into BANDS bands of ROWS for
+# LSH. Two CVs share a bucket with probability 1 - (1 - s^ROWS)^BANDS:
+# above 0.9999 at s = 0.85, about 0.002 at s = 0.1 (unrelated CVs).
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE = 3
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)  # fixed, so stored signatures stay comparable
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+# contact details and links change between versions without changing the CV
+_NOISE = re.compile(
+    r"\S+@\S+"                        # e-mail
+    r"|(?:https?://|www\.)\S+"        # links
+    r"|\+?\d[\d\s().-]{6,}\d"         # phone numbers
+)
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+# Fields that belong to the person rather than the CV's content; a reused
+# analysis takes them from the CV at hand
+_CONTACT_FIELDS = {
+    "email": re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"),
+    "phone": re.compile(r"\+?\d[\d\s().-]{6,}\d"),
+    "linkedin": re.compile(r"(?:https?://)?(?:www\.)?linkedin\.com/\S+", re.IGNORECASE),
+    "github": re.compile(r"(?:https?://)?(?:www\.)?github\.com/\S+", re.IGNORECASE),
+}
+# "Jane Doe", "Jean-Luc O'Neill": two to four capitalised words
+_NAME_LINE = re.compile(r"^[A-Z][\w'’.-]*(?: [A-Z][\w'’.-]*){1,3}$")
+_NAME_SEARCH_LINES = 5
+# capitalised lines that are a job title or heading rather than a name
+_NOT_NAME_WORDS = {
+    "engineer", "developer", "manager", "designer", "analyst", "consultant", "architect",
+    "scientist", "intern", "lead", "senior", "junior", "resume", "curriculum", "vitae",
+    "profile", "summary",
+}
+
+
+def normalize(text: str) -> list:
+    """Lower-cased words with contact details and punctuation removed."""
+    return _WORD.findall(_NOISE.sub(" ", text.lower()))
+
+
+def signature(text: str):
+    """MinHash signature of a CV's text, or None if it has no words."""
+    words = normalize(text)
+    if not words:
+        return None
+    if len(words) < SHINGLE:
+        words = words + [""] * (SHINGLE - len(words))
+    shingles = {
+        zlib.crc32(" ".join(words[i:i + SHINGLE]).encode("utf-8"))
+        for i in range(len(words) - SHINGLE + 1)
+    }
+    return array("Q", (min((a * h + b) % _PRIME for h in shingles) for a, b in _PERMUTATIONS))
+
+
+def similarity(sig_a, sig_b) -> float:
+    """Estimated Jaccard similarity: the share of equal MinHash values."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def _bands(sig):
+    return [hash(tuple(sig[b * ROWS:(b + 1) * ROWS])) for b in range(BANDS)]
+
+
+def _name_in(cv_text: str):
+    """The candidate's name when one of the CV's first lines is just a name."""
+    lines = [line.strip() for line in cv_text.splitlines() if line.strip()]
+    for line in lines[:_NAME_SEARCH_LINES]:
+        if not _NAME_LINE.match(line) or skill_matcher().find(line):
+            continue
+        if not _NOT_NAME_WORDS & set(line.lower().split()):
+            return line
+    return None
+
+
+def refresh_reused(analysis: dict, cv_text: str) -> dict:
+    """
+    A cached analysis made current for the near-duplicate `cv_text`.
+    The name is kept only if this CV still contains it; otherwise it is
+    read from the CV's first lines, else "Unknown". Contact fields are
+    re-read from this CV. Skills the local matcher finds here that the
+    cached tech stack lacks are added.
+    """
+    data = dict(analysis)
+
+    name = data.get("candidate_name") or ""
+    if not name or name.lower() not in cv_text.lower():
+        data["candidate_name"] = _name_in(cv_text) or "Unknown"
+
+    for field, pattern in _CONTACT_FIELDS.items():
+        if field in data:
+            match = pattern.search(cv_text)
+            data[field] = match.group(0) if match else None
+
+    stack = list(data.get("tech_stack") or [])
+    known = {tech.lower() for tech in stack}
+    stack += [skill for skill in skill_matcher().find(cv_text) if skill.lower() not in known]
+    data["tech_stack"] = stack
+    return data
+
+
+class CVIndex:
+    """
+    Analyzed CVs by MinHash signature, with LSH buckets for lookup.
+    Signatures and analyses persist in SQLite; the buckets are rebuilt in
+    memory on first use, so a lookup only compares against the handful of
+    CVs that share a band.
+    """
+
+    def __init__(self, path: str = CV_INDEX_PATH):
+        self.path = path
+        self._db = None
+        self._signatures = {}  # id -> signature
+        self._buckets = [{} for _ in range(BANDS)]  # band hash -> [id]
+        self._lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS cvs ("
+                " id INTEGER PRIMARY KEY, signature BLOB NOT NULL,"
+                " analysis TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            for cv_id, blob in db.execute("SELECT id, signature FROM cvs"):
+                self._insert(cv_id, array("Q", blob))
+            self._db = db
+        return self._db
+
+    def _insert(self, cv_id: int, sig):
+        self._signatures[cv_id] = sig
+        for band, key in zip(self._buckets, _bands(sig)):
+            band.setdefault(key, []).append(cv_id)
+
+    def find(self, sig, threshold: float = CV_DUPLICATE_THRESHOLD):
+        """
+        The closest analyzed CV at or above `threshold`, as
+        {"id", "similarity", "analysis"}; None if there is none.
+        """
+        if sig is None:
+            return None
+        with self._lock:
+            self._conn()
+            candidates = set()
+            for band, key in zip(self._buckets, _bands(sig)):
+                candidates.update(band.get(key, ()))
+
+            best, best_score = None, threshold
+            for cv_id in candidates:
+                score = similarity(sig, self._signatures[cv_id])
+                if score >= best_score:
+                    best, best_score = cv_id, score
+            if best is None:
+                return None
+
+            row = self._db.execute("SELECT analysis FROM cvs WHERE id = ?", (best,)).fetchone()
+        return {"id": best, "similarity": best_score, "analysis": json.loads(row[0])}
+
+    def add(self, sig, analysis: dict) -> int:
+        """Remember an analyzed CV by its signature; returns its id."""
+        with self._lock:
+            db = self._conn()
+            with db:
+                cv_id = db.execute(
+                    "INSERT INTO cvs (signature, analysis, created_at) VALUES (?, ?, ?)",
+                    (sig.tobytes(), json.dumps(analysis), time.time()),
+                ).lastrowid
+            self._insert(cv_id, sig)
+        return cv_id
+
+    def __len__(self):
+        with self._lock:
+            self._conn()
+            return len(self._signatures)
+
+
+cv_index = CVIndex()
@@ -26,10 +26,12 @@ def read_cv_file(path: str) -> str:
         reader = PdfReader(path)
         text = ""
 
+        # pages end in a form feed so running headers / footers can be
+        # told apart from the body (see cv_compactor)
         for page in reader.pages:
             extracted = page.extract_text()
             if extracted:
-                text += extracted + "\n"
+                text += extracted + "\n\f"
 
         return text
 
@@ -0,0 +1,88 @@
+from html import escape
+
+from projecttest.utils.pdf_report import summarize
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Interview Report - {name}</title>
+<style>
+body {{ font-family: sans-serif; max-width: 780px; margin: 2em auto; line-height: 1.5; }}
+.bar {{ display: inline-block; height: 14px; background: #1f77b4; }}
+td {{ padding: 2px 12px 2px 0; }}
+</style>
+</head>
+<body>
+<h1>Candidate Interview Report</h1>
+<p>Candidate: <b>{name}</b><br>Experience Level: <b>{level}</b><br>Technology: <b>{tech}</b></p>
+<h2>Final Result</h2>
+<p>Status: <b>{final_result}</b><br>Hire Recommendation: <b>{hire_recommendation}</b></p>
+<h2>Interview Score</h2>
+<p>Score: <b>{score} / {total} ({percent}%)</b></p>
+<table>
+<tr><td>Correct</td><td><span class="bar" style="width: {correct_px}px"></span> {score}</td></tr>
+<tr><td>Wrong</td><td><span class="bar" style="width: {wrong_px}px"></span> {wrong}</td></tr>
+</table>
+<h2>Interview Feedback</h2>
+{feedback}
+<h2>Coding Challenge Result</h2>
+<p>Score: <b>{coding_score}</b><br>Verdict: <b>{verdict}</b></p>
+<p><b>Feedback:</b><br>{coding_feedback}</p>
+</body>
+</html>
+"""
+
+
+def generate_html_report(
+    candidate_name,
+    experience_level,
+    selected_tech,
+    interview_score,
+    total_questions,
+    coding_result,
+    interview_feedback,
+    output_path,
+    transcript=None,
+):
+    """
+    The PDF report's content as a single HTML page: same decision, same
+    sections, no fonts or layout engine. Returns the path written.
+    """
+    outcome = summarize(interview_score, total_questions, coding_result)
+    wrong = max(total_questions - interview_score, 0)
+    scale = 300 / max(total_questions, 1)
+
+    if transcript:
+        feedback = "\n".join(
+            f"<p><b>Q{i}. {escape(turn.get('question', ''))}</b><br>"
+            f"Answer: {escape(turn.get('answer', ''))}<br>"
+            f"Score: {turn.get('score', 0)} - {escape(turn.get('feedback', ''))}</p>"
+            for i, turn in enumerate(transcript, 1)
+        )
+    else:
+        feedback = "\n".join(
+            f"<p>{escape(line)}</p>" for line in interview_feedback.split("\n") if line.strip()
+        )
+
+    page = PAGE.format(
+        name=escape(candidate_name),
+        level=escape(experience_level),
+        tech=escape(selected_tech),
+        final_result=outcome["final_result"],
+        hire_recommendation=outcome["hire_recommendation"],
+        score=interview_score,
+        total=total_questions,
+        percent=outcome["interview_percent"],
+        wrong=wrong,
+        correct_px=round(interview_score * scale),
+        wrong_px=round(wrong * scale),
+        feedback=feedback,
+        coding_score=outcome["coding_score"],
+        verdict=outcome["coding_verdict"].upper(),
+        coding_feedback=escape(str(outcome["coding_feedback"])).replace("\n", "<br>"),
+    )
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(page)
+    return output_path
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from projecttest.models.cv_analysis import CVAnalysis
+from projecttest.utils.cv_compactor import compact_cv
+
+# Interview sessions kept in memory; least recently used go first
+INTERVIEW_SESSIONS = int(os.environ.get("INTERVIEW_SESSIONS", "256"))
+
+# crewai UsageMetrics fields summed per stage
+USAGE_FIELDS = ("prompt_tokens", "cached_prompt_tokens", "completion_tokens", "successful_requests")
+
+
+def session_id(cv_text: str) -> str:
+    """Sessions are keyed by the CV itself, so every endpoint that is sent
+    the same file finds the same session."""
+    return hashlib.sha256(cv_text.encode("utf-8")).hexdigest()[:32]
+
+
+class InterviewSession:
+    """
+    One candidate's interview: the compacted CV, its analysis and the
+    tokens each stage used.
+
+    The question and challenge prompts both start with `context()`, byte
+    for byte the same, and run on the same interviewer agent. Providers
+    that cache prompt prefixes (OpenAI, DeepSeek, Gemini) then bill the CV
+    at the cached rate after the first stage; only the stage's own
+    instructions are new input.
+    """
+
+    def __init__(self, cv_text: str):
+        self.id = session_id(cv_text)
+        compact = compact_cv(cv_text, "interview")
+        self.cv = compact.text
+        self.cv_tokens = {"raw": compact.tokens_before, "compacted": compact.tokens_after}
+        self.analysis = None
+        self.usage = {}  # stage -> summed USAGE_FIELDS
+        self._lock = threading.Lock()
+
+    def set_analysis(self, analysis: dict):
+        """Keep the CVAnalysis fields of an analysis result."""
+        self.analysis = {field: analysis.get(field) for field in CVAnalysis.model_fields}
+
+    def context(self) -> str:
+        """
+        The shared prompt prefix: CV, then the structured analysis once
+        there is one (InterviewPrepCrew passes it as task context instead).
+        """
+        if not self.analysis:
+            return f"CV:\n{self.cv}"
+        profile = json.dumps(self.analysis, sort_keys=True, ensure_ascii=False)
+        return f"CV:\n{self.cv}\n\nCV analysis:\n{profile}"
+
+    def experience_level(self, default: str = "Unknown") -> str:
+        return (self.analysis or {}).get("experience_level") or default
+
+    def record(self, stage: str, result):
+        """Add a kickoff's token usage (CrewOutput.token_usage) to `stage`."""
+        usage = getattr(result, "token_usage", None)
+        with self._lock:
+            totals = self.usage.setdefault(stage, dict.fromkeys(USAGE_FIELDS, 0))
+            for field in USAGE_FIELDS:
+                totals[field] += getattr(usage, field, 0) or 0
+        print(
+            f"Session {self.id[:8]} {stage}: {totals['prompt_tokens']} prompt tokens "
+            f"({totals['cached_prompt_tokens']} cached), {totals['completion_tokens']} completion"
+        )
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            usage = {stage: dict(totals) for stage, totals in self.usage.items()}
+        return {
+            "session_id": self.id,
+            "cv_tokens": self.cv_tokens,
+            "analysis": self.analysis,
+            "usage": usage,
+        }
+
+
+class InterviewSessions:
+    """Sessions by id, least recently used evicted past `max_sessions`."""
+
+    def __init__(self, max_sessions: int = INTERVIEW_SESSIONS):
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def open(self, cv_text: str) -> InterviewSession:
+        """The session for this CV, started if there is none yet."""
+        sid = session_id(cv_text)
+        with self._lock:
+            session = self._sessions.get(sid)
+            if session is not None:
+                self._sessions.move_to_end(sid)
+                return session
+
+        session = InterviewSession(cv_text)
+        with self._lock:
+            # another request may have started it meanwhile
+            session = self._sessions.setdefault(sid, session)
+            self._sessions.move_to_end(sid)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session
+
+    def get(self, sid: str):
+        with self._lock:
+            session = self._sessions.get(sid)
+            if session is not None:
+                self._sessions.move_to_end(sid)
+            return session
+
+
+interview_sessions = InterviewSessions()
@@ -0,0 +1,40 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUDict(OrderedDict):
+    """
+    A dict of at most `max_items` entries; reads and writes mark an entry
+    as recently used and the least recently used one goes first. Safe to
+    share between the event loop and executor threads.
+    """
+
+    def __init__(self, max_items: int):
+        super().__init__()
+        self.max_items = max_items
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key):
+        with self._lock:
+            value = super().__getitem__(key)
+            self.move_to_end(key)
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            super().__setitem__(key, value)
+            self.move_to_end(key)
+            while len(self) > self.max_items:
+                self.popitem(last=False)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self:
+                return self[key]
+            return default
+
+    def setdefault(self, key, default=None):
+        with self._lock:
+            if key not in self:
+                self[key] = default
+            return self[key]
@@ -1,81 +1,113 @@
+import copy
 import os
 import json
+import threading
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
 from reportlab.platypus import (
     SimpleDocTemplate,
     Paragraph,
     Spacer,
-    Image,
 )
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.cidfonts import UnicodeCIDFont
 
-from projecttest.utils.chart_generator import generate_score_chart
+from projecttest.utils.chart_generator import score_chart
+
+try:
+    import fcntl
+except ImportError:  # Windows: O_EXCL alone keeps allocation safe
+    fcntl = None
+
+_index_lock = threading.Lock()
 
 
 # =====================================================
-# Helper → find next available filename
+# Template → fonts, styles and fixed headings, built once per process
 # =====================================================
-def get_next_report_filename(base_dir=".", prefix="Report"):
-    i = 1
-    while True:
-        filename = os.path.join(base_dir, f"{prefix}{i}.pdf")
-        if not os.path.exists(filename):
-            return filename
-        i += 1
+@lru_cache(maxsize=None)
+def _template():
+    pdfmetrics.registerFont(UnicodeCIDFont("HeiseiMin-W3"))
+
+    styles = getSampleStyleSheet()
+    body = copy.copy(styles["BodyText"])
+    body.fontName = "HeiseiMin-W3"
+
+    def heading(text, level="Heading2"):
+        return Paragraph(f"<b>{text}</b>", styles[level])
+
+    static = {
+        "title": heading("Candidate Interview Report", "Heading1"),
+        "final_result": heading("Final Result"),
+        "interview_score": heading("Interview Score"),
+        "interview_feedback": heading("Interview Feedback"),
+        "coding_result": heading("Coding Challenge Result"),
+        "feedback_label": Paragraph("<b>Feedback:</b>", body),
+        "performance": heading("Performance Profile"),
+    }
+    return body, static
+
+
+def _static(name):
+    """A cached flowable; copied, since layout stores its size on it."""
+    return copy.copy(_template()[1][name])
 
 
 # =====================================================
-# Main report generator
+# Helper → allocate the next ReportN.pdf
 # =====================================================
-def generate_report(
-    candidate_name,
-    experience_level,
-    selected_tech,
-    interview_score,
-    total_questions,
-    coding_result,
-    interview_feedback,
-    output_path=None,  
-):
+def _highest_report_number(base_dir, prefix):
+    highest = 0
+    for name in os.listdir(base_dir):
+        number = name[len(prefix):-len(".pdf")]
+        if name.startswith(prefix) and name.endswith(".pdf") and number.isdigit():
+            highest = max(highest, int(number))
+    return highest
+
 
+def get_next_report_filename(base_dir=".", prefix="Report"):
     """
-    Generate recruiter-friendly PDF report with charts.
-    Creates a NEW file every time.
+    Claim the next ReportN.pdf in `base_dir`. The last N handed out is kept
+    in `.{prefix}.index` under a file lock, so allocation is O(1) and safe
+    across processes; the directory is only scanned when the index is new.
+    The claimed file is created empty, so the name cannot be taken twice.
     """
+    index_path = os.path.join(base_dir, f".{prefix}.index")
 
-    # =====================================================
-    # Choose NEW filename automatically
-    # =====================================================
-    output_path = get_next_report_filename()
-    # project root (one level above backend)
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
-    reports_dir = os.path.join(base_dir, "reports")
-
-    # create folder if missing
-    os.makedirs(reports_dir, exist_ok=True)
-
-    i = 1
-    while True:
-        filename = f"Report{i}.pdf"
-        path = os.path.join(reports_dir, filename)
+    with _index_lock, open(index_path, "a+", encoding="utf-8") as index:
+        if fcntl is not None:
+            fcntl.flock(index, fcntl.LOCK_EX)
+        index.seek(0)
+        text = index.read().strip()
+        i = int(text) if text.isdigit() else _highest_report_number(base_dir, prefix)
 
-        if not os.path.exists(path):
-            output_path = path
-            break
+        while True:
+            i += 1
+            filename = os.path.join(base_dir, f"{prefix}{i}.pdf")
+            try:
+                os.close(os.open(filename, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                continue
 
-        i += 1
+        index.seek(0)
+        index.truncate()
+        index.write(str(i))
+        # the lock is released when the file closes
 
-    # =====================================================
-    # Font (supports many characters)
-    # =====================================================
-    pdfmetrics.registerFont(UnicodeCIDFont("HeiseiMin-W3"))
+    return filename
 
-    styles = getSampleStyleSheet()
-    body = styles["BodyText"]
-    body.fontName = "HeiseiMin-W3"
 
+# =====================================================
+# Outcome → scores and decision shown in the report
+# =====================================================
+def summarize(interview_score, total_questions, coding_result):
+    """
+    The decision a report shows, from the raw interview score and the
+    coding result (a dict or its JSON).
+    """
     # =====================================================
     # Parse coding result safely
     # =====================================================
@@ -86,10 +118,12 @@ def generate_report(
         coding_score = int(coding_result.get("score", 0))
         coding_verdict = str(coding_result.get("verdict", "fail")).lower()
         coding_feedback = coding_result.get("feedback", "")
+        performance = coding_result.get("performance")
     except Exception:
         coding_score = 0
         coding_verdict = "fail"
         coding_feedback = "Could not parse coding result"
+        performance = None
 
     # =====================================================
     # Calculate interview %
@@ -111,6 +145,69 @@ def generate_report(
         final_result = "FAIL"
         hire_recommendation = "Reject"
 
+    return {
+        "coding_score": coding_score,
+        "coding_verdict": coding_verdict,
+        "coding_feedback": coding_feedback,
+        "performance": performance,
+        "interview_percent": interview_percent,
+        "final_result": final_result,
+        "hire_recommendation": hire_recommendation,
+    }
+
+
+# =====================================================
+# Main report generator
+# =====================================================
+def generate_report(
+    candidate_name,
+    experience_level,
+    selected_tech,
+    interview_score,
+    total_questions,
+    coding_result,
+    interview_feedback,
+    output_path=None,  
+    transcript=None,
+):
+
+    """
+    Generate recruiter-friendly PDF report with charts.
+    Writes to `output_path`, or a NEW ReportN.pdf when none is given.
+    With a `transcript` ([{question, answer, score, feedback}]) the
+    feedback section lists each question; otherwise `interview_feedback`.
+    Returns the path written.
+    """
+
+    # =====================================================
+    # Output path: the one given, else the next free ReportN.pdf
+    # =====================================================
+    if output_path is None:
+        # project root (one level above backend)
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        reports_dir = os.path.join(base_dir, "reports")
+        os.makedirs(reports_dir, exist_ok=True)
+        output_path = get_next_report_filename(reports_dir)
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+
+    # =====================================================
+    # Font (supports many characters) and styles, from the template
+    # =====================================================
+    body, _ = _template()
+
+    # =====================================================
+    # Scores and decision
+    # =====================================================
+    outcome = summarize(interview_score, total_questions, coding_result)
+    coding_score = outcome["coding_score"]
+    coding_verdict = outcome["coding_verdict"]
+    coding_feedback = outcome["coding_feedback"]
+    performance = outcome["performance"]
+    interview_percent = outcome["interview_percent"]
+    final_result = outcome["final_result"]
+    hire_recommendation = outcome["hire_recommendation"]
+
     # =====================================================
     # Verdict text
     # =====================================================
@@ -119,11 +216,6 @@ def generate_report(
     else:
         verdict_text = "<b>FAIL</b>"
 
-    # =====================================================
-    # Chart
-    # =====================================================
-    chart_path = generate_score_chart(interview_score, total_questions)
-
     # =====================================================
     # Build PDF
     # =====================================================
@@ -131,24 +223,24 @@ def generate_report(
     story = []
 
     # ================= HEADER =================
-    story.append(Paragraph("<b>Candidate Interview Report</b>", styles["Heading1"]))
+    story.append(_static("title"))
     story.append(Spacer(1, 25))
 
     # ================= BASIC INFO =================
-    story.append(Paragraph(f"Candidate: <b>{candidate_name}</b>", body))
-    story.append(Paragraph(f"Experience Level: <b>{experience_level}</b>", body))
-    story.append(Paragraph(f"Technology: <b>{selected_tech}</b>", body))
+    story.append(Paragraph(f"Candidate: <b>{escape(str(candidate_name))}</b>", body))
+    story.append(Paragraph(f"Experience Level: <b>{escape(str(experience_level))}</b>", body))
+    story.append(Paragraph(f"Technology: <b>{escape(str(selected_tech))}</b>", body))
     story.append(Spacer(1, 25))
 
     # ================= FINAL DECISION =================
-    story.append(Paragraph("<b>Final Result</b>", styles["Heading2"]))
+    story.append(_static("final_result"))
     story.append(Spacer(1, 10))
     story.append(Paragraph(f"Status: <b>{final_result}</b>", body))
     story.append(Paragraph(f"Hire Recommendation: <b>{hire_recommendation}</b>", body))
     story.append(Spacer(1, 25))
 
     # ================= INTERVIEW SCORE =================
-    story.append(Paragraph("<b>Interview Score</b>", styles["Heading2"]))
+    story.append(_static("interview_score"))
     story.append(
         Paragraph(
             f"Score: <b>{interview_score} / {total_questions} ({interview_percent}%)</b>",
@@ -158,37 +250,82 @@ def generate_report(
     story.append(Spacer(1, 20))
 
     # ================= GRAPH =================
-    if os.path.exists(chart_path):
-        story.append(Image(chart_path, width=350, height=220))
-        story.append(Spacer(1, 20))
+    story.append(score_chart(interview_score, total_questions))
+    story.append(Spacer(1, 20))
 
     # ================= INTERVIEW FEEDBACK =================
-    story.append(Paragraph("<b>Interview Feedback</b>", styles["Heading2"]))
+    story.append(_static("interview_feedback"))
     story.append(Spacer(1, 12))
 
-    for line in interview_feedback.split("\n"):
-        if line.strip():
-            story.append(Paragraph(line, body))
+    if transcript:
+        for i, turn in enumerate(transcript, 1):
+            story.append(Paragraph(f"<b>Q{i}. {escape(turn.get('question', ''))}</b>", body))
+            story.append(Paragraph(f"Answer: {escape(turn.get('answer', ''))}", body))
+            story.append(
+                Paragraph(f"Score: {turn.get('score', 0)} - {escape(turn.get('feedback', ''))}", body)
+            )
+            story.append(Spacer(1, 8))
+    else:
+        for line in interview_feedback.split("\n"):
+            if line.strip():
+                story.append(Paragraph(escape(line), body))
 
     story.append(Spacer(1, 25))
 
     # ================= CODING RESULT =================
-    story.append(Paragraph("<b>Coding Challenge Result</b>", styles["Heading2"]))
+    story.append(_static("coding_result"))
     story.append(Spacer(1, 12))
 
     story.append(Paragraph(f"Score: <b>{coding_score}</b>", body))
     story.append(Paragraph(f"Verdict: {verdict_text}", body))
     story.append(Spacer(1, 12))
-    story.append(Paragraph("<b>Feedback:</b>", body))
-    story.append(Paragraph(str(coding_feedback), body))
+    story.append(_static("feedback_label"))
+    # LLM review text and tracebacks ("<module>") are not reportlab markup
+    story.append(Paragraph(escape(str(coding_feedback)).replace("\n", "<br/>"), body))
+
+    # ================= PERFORMANCE PROFILE =================
+    candidate_profile = (performance or {}).get("candidate")
+    if candidate_profile:
+        story.append(Spacer(1, 20))
+        story.append(_static("performance"))
+        story.append(Spacer(1, 12))
+
+        story.append(
+            Paragraph(
+                f"Estimated complexity: <b>{candidate_profile.get('complexity') or 'unknown'}</b>",
+                body,
+            )
+        )
+        reference_profile = performance.get("reference")
+        if reference_profile:
+            story.append(
+                Paragraph(
+                    f"Reference solution: <b>{reference_profile.get('complexity') or 'unknown'}</b>",
+                    body,
+                )
+            )
+        if performance.get("slowdown") is not None:
+            story.append(
+                Paragraph(
+                    f"Time vs reference at largest input: <b>{performance['slowdown']}x</b>",
+                    body,
+                )
+            )
+        story.append(Spacer(1, 8))
+
+        for point in candidate_profile.get("points", []):
+            if point.get("error"):
+                line = f"n = {point['n']}: {escape(str(point['error']))}"
+            else:
+                line = f"n = {point['n']}: {point['time_ms']:.3f} ms (median of {point.get('repeats') or 1})"
+                if point.get("process_peak_rss_kb"):
+                    line += f", process peak memory so far {point['process_peak_rss_kb'] / 1024:.1f} MB"
+            story.append(Paragraph(line, body))
 
     # =====================================================
     # Build document
     # =====================================================
     doc.build(story)
 
-    # cleanup temp chart
-    if os.path.exists(chart_path):
-        os.remove(chart_path)
-
     print(f"Report created: {output_path}")
+    return output_path
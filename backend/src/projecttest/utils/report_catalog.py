@@ -0,0 +1,274 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+from projecttest.utils.pdf_report import summarize
+
+# Catalog of every report; lives in the reports directory by default
+CATALOG_PATH = os.environ.get(
+    "REPORT_CATALOG",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "reports", "catalog.db"),
+)
+
+MAX_PAGE = 100
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    seq               INTEGER PRIMARY KEY,
+    report_id         TEXT UNIQUE NOT NULL,
+    created_at        REAL NOT NULL,
+    candidate_name    TEXT NOT NULL,
+    experience_level  TEXT NOT NULL,
+    selected_tech     TEXT NOT NULL COLLATE NOCASE,
+    interview_score   INTEGER NOT NULL,
+    total_questions   INTEGER NOT NULL,
+    interview_percent INTEGER NOT NULL,
+    coding_score      INTEGER NOT NULL,
+    coding_verdict    TEXT NOT NULL,
+    final_result      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reports_tech ON reports (selected_tech, seq);
+CREATE INDEX IF NOT EXISTS reports_result ON reports (final_result, seq);
+CREATE TABLE IF NOT EXISTS records (
+    seq               INTEGER PRIMARY KEY,
+    body              BLOB NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS reports_fts USING fts5 (
+    candidate_name, selected_tech, experience_level, final_result, feedback,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+COLUMNS = (
+    "report_id", "created_at", "candidate_name", "experience_level",
+    "selected_tech", "interview_score", "total_questions", "interview_percent",
+    "coding_score", "coding_verdict", "final_result",
+)
+
+
+def pack(record: dict) -> bytes:
+    return zlib.compress(json.dumps(record, separators=(",", ":")).encode("utf-8"))
+
+
+def unpack(body: bytes) -> dict:
+    return json.loads(zlib.decompress(body))
+
+
+def fts_query(text: str) -> str:
+    """User search text → FTS5 query: every word must match, as a prefix."""
+    return " ".join(f'"{term}"*' for term in _TERM.findall(text))
+
+
+class ReportCatalog:
+    """
+    SQLite store of interview outcomes. Per report: one row of scores and
+    decision, the structured record it is rendered from (zlib-compressed
+    JSON), and a full-text index over candidate, technology, level, result
+    and feedback. Pages are keyed on insertion order (`seq`), so every page
+    costs the same however deep it is.
+    """
+
+    def __init__(self, path: str = CATALOG_PATH):
+        self.path = path
+        self._db = None
+        self._lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(SCHEMA)
+            self._db = db
+        return self._db
+
+    def add(
+        self,
+        report_id,
+        candidate_name,
+        experience_level,
+        selected_tech,
+        interview_score,
+        total_questions,
+        coding_result,
+        interview_feedback,
+        transcript=None,
+        created_at=None,
+    ):
+        """
+        Store one interview outcome; the same arguments generate_report
+        takes, which is what the report is later rendered from.
+        """
+        if isinstance(coding_result, str):
+            try:
+                coding_result = json.loads(coding_result)
+            except ValueError:
+                pass
+        record = {
+            "candidate_name": candidate_name,
+            "experience_level": experience_level,
+            "selected_tech": selected_tech,
+            "interview_score": interview_score,
+            "total_questions": total_questions,
+            "coding_result": coding_result,
+            "interview_feedback": interview_feedback,
+            "transcript": transcript or [],
+        }
+
+        outcome = summarize(interview_score, total_questions, coding_result)
+        row = {
+            "report_id": report_id,
+            "created_at": created_at or time.time(),
+            "candidate_name": candidate_name or "",
+            "experience_level": experience_level or "",
+            "selected_tech": selected_tech or "",
+            "interview_score": interview_score,
+            "total_questions": total_questions,
+            "interview_percent": outcome["interview_percent"],
+            "coding_score": outcome["coding_score"],
+            "coding_verdict": outcome["coding_verdict"],
+            "final_result": outcome["final_result"],
+        }
+        feedback = f"{interview_feedback or ''}\n{outcome['coding_feedback'] or ''}"
+
+        with self._lock:
+            db = self._conn()
+            with db:
+                # a rebuilt report replaces its old entry
+                old = db.execute(
+                    "SELECT seq FROM reports WHERE report_id = ?", (report_id,)
+                ).fetchone()
+                if old:
+                    db.execute("DELETE FROM reports WHERE seq = ?", (old["seq"],))
+                    db.execute("DELETE FROM records WHERE seq = ?", (old["seq"],))
+                    db.execute("DELETE FROM reports_fts WHERE rowid = ?", (old["seq"],))
+
+                seq = db.execute(
+                    f"INSERT INTO reports ({', '.join(COLUMNS)}) "
+                    f"VALUES ({', '.join(':' + c for c in COLUMNS)})",
+                    row,
+                ).lastrowid
+                db.execute("INSERT INTO records (seq, body) VALUES (?, ?)", (seq, pack(record)))
+                db.execute(
+                    "INSERT INTO reports_fts (rowid, candidate_name, selected_tech, "
+                    "experience_level, final_result, feedback) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        seq, row["candidate_name"], row["selected_tech"],
+                        row["experience_level"], row["final_result"], feedback,
+                    ),
+                )
+
+    def _page(self, q, tech, result, min_percent, limit, cursor, records=False):
+        """Up to `limit` + 1 rows, newest first, with `seq` (and `body`)."""
+        where, args = [], []
+
+        sql = f"SELECT r.seq, {', '.join('r.' + c for c in COLUMNS)}"
+        if records:
+            sql += ", rec.body"
+        sql += " FROM reports r"
+        if records:
+            sql += " JOIN records rec ON rec.seq = r.seq"
+        order = "r.seq"
+
+        match = fts_query(q)
+        if match:
+            # walk the full-text index newest first and stop at the page
+            sql += " JOIN reports_fts f ON f.rowid = r.seq"
+            where.append("reports_fts MATCH ?")
+            args.append(match)
+            order = "f.rowid"
+        if tech:
+            where.append("r.selected_tech = ?")
+            args.append(tech)
+        if result:
+            where.append("r.final_result = ?")
+            args.append(result.upper())
+        if min_percent:
+            where.append("r.interview_percent >= ?")
+            args.append(min_percent)
+        if cursor:
+            where.append(f"{order} < ?")
+            args.append(cursor)
+
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order} DESC LIMIT ?"
+        args.append(limit + 1)
+
+        with self._lock:
+            return self._conn().execute(sql, args).fetchall()
+
+    def search(
+        self,
+        q: str = "",
+        tech: str = "",
+        result: str = "",
+        min_percent: int = 0,
+        limit: int = 20,
+        cursor: int = 0,
+    ) -> dict:
+        """
+        Newest first. `q` is full-text (all words, prefix match); `tech` and
+        `result` are exact filters. Pass the returned `next_cursor` to get
+        the following page; it is None on the last one.
+        """
+        limit = max(1, min(limit, MAX_PAGE))
+        rows = self._page(q, tech, result, min_percent, limit, cursor)
+
+        page = [dict(row) for row in rows[:limit]]
+        next_cursor = page[-1]["seq"] if len(rows) > limit else None
+        for row in page:
+            del row["seq"]
+        return {"reports": page, "next_cursor": next_cursor}
+
+    def export(self, q: str = "", tech: str = "", result: str = "", min_percent: int = 0, batch: int = 500):
+        """
+        Every matching report with its full record, newest first, read in
+        batches straight from the catalog (no PDFs involved).
+        """
+        cursor = 0
+        while True:
+            rows = self._page(q, tech, result, min_percent, batch, cursor, records=True)
+            for row in rows[:batch]:
+                entry = {c: row[c] for c in COLUMNS}
+                entry["record"] = unpack(row["body"])
+                yield entry
+            if len(rows) <= batch:
+                return
+            cursor = rows[batch - 1]["seq"]
+
+    def get(self, report_id: str):
+        """The entry for one report, or None."""
+        with self._lock:
+            row = self._conn().execute(
+                f"SELECT {', '.join(COLUMNS)} FROM reports WHERE report_id = ?", (report_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def record(self, report_id: str):
+        """The structured record a report is rendered from, or None."""
+        with self._lock:
+            row = self._conn().execute(
+                "SELECT rec.body FROM reports r JOIN records rec ON rec.seq = r.seq "
+                "WHERE r.report_id = ?",
+                (report_id,),
+            ).fetchone()
+        return unpack(row["body"]) if row else None
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+report_catalog = ReportCatalog()
@@ -0,0 +1,207 @@
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import get_context
+
+from projecttest.utils.html_report import generate_html_report
+from projecttest.utils.pdf_report import generate_report
+from projecttest.utils.report_catalog import report_catalog
+
+# Parallel report renders; rendering is CPU-bound, so separate processes
+REPORT_WORKERS = int(os.environ.get("REPORT_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+REPORTS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "reports"
+)
+
+# Rendered files kept for repeat downloads; least recently used go first
+REPORT_CACHE_MB = int(os.environ.get("REPORT_CACHE_MB", "256"))
+
+RENDERERS = {"pdf": generate_report, "html": generate_html_report}
+
+
+class RenderCache:
+    """
+    Rendered reports on disk, `<report_id>.<format>` in one directory,
+    bounded by total size. Survives restarts: existing files are picked
+    up oldest first.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._files = OrderedDict()  # (report_id, format) -> size
+        self._lock = threading.Lock()
+
+        os.makedirs(root, exist_ok=True)
+        entries = []
+        for name in os.listdir(root):
+            report_id, _, fmt = name.rpartition(".")
+            if fmt in RENDERERS:
+                stat = os.stat(os.path.join(root, name))
+                entries.append((stat.st_mtime, report_id, fmt, stat.st_size))
+        for _, report_id, fmt, size in sorted(entries):
+            self._files[(report_id, fmt)] = size
+            self.bytes += size
+        self._evict()
+
+    def path(self, report_id: str, fmt: str) -> str:
+        return os.path.join(self.root, f"{report_id}.{fmt}")
+
+    def get(self, report_id: str, fmt: str):
+        with self._lock:
+            if (report_id, fmt) not in self._files:
+                return None
+            self._files.move_to_end((report_id, fmt))
+        return self.path(report_id, fmt)
+
+    def put(self, report_id: str, fmt: str, rendered: str) -> str:
+        """Move a finished render into the cache."""
+        path = self.path(report_id, fmt)
+        os.replace(rendered, path)
+        size = os.path.getsize(path)
+        with self._lock:
+            self.bytes += size - self._files.pop((report_id, fmt), 0)
+            self._files[(report_id, fmt)] = size
+            self._evict()
+        return path
+
+    def _evict(self):
+        # the newest entry always stays, even if it alone is over budget
+        while self.bytes > self.max_bytes and len(self._files) > 1:
+            (report_id, fmt), size = self._files.popitem(last=False)
+            self.bytes -= size
+            try:
+                os.remove(self.path(report_id, fmt))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"files": len(self._files), "bytes": self.bytes, "max_bytes": self.max_bytes}
+
+
+class ReportJobs:
+    """
+    Reports are stored as structured records and rendered on first
+    download. A report id is handed out as soon as a grade exists
+    (`reserve`), the record lands in the catalog once its inputs are final
+    (`submit`), and `render` builds the PDF or HTML on the workers, once
+    per report and format while it stays cached.
+    """
+
+    def __init__(self, workers: int = REPORT_WORKERS):
+        self.workers = workers
+        self.cache = RenderCache(
+            os.path.join(REPORTS_DIR, "rendered"), REPORT_CACHE_MB * 1024 * 1024
+        )
+        self._executor = None
+        self._pending = set()
+        self._failed = {}  # report_id -> why its record could not be stored
+        self._rendering = {}  # (report_id, format) -> Future of the path
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: the API process runs threads that must not be forked
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=get_context("spawn")
+                )
+            return self._executor
+
+    def reserve(self) -> str:
+        report_id = uuid.uuid4().hex
+        with self._lock:
+            self._pending.add(report_id)
+        return report_id
+
+    def submit(self, report_id: str, **record):
+        """Store the outcome; nothing is rendered until it is downloaded."""
+        report_catalog.add(report_id, **record)
+        with self._lock:
+            self._pending.discard(report_id)
+
+    def fail(self, report_id: str, error: str):
+        """The record could not be stored; the report will never be ready."""
+        with self._lock:
+            self._pending.discard(report_id)
+            self._failed[report_id] = error
+
+    def error(self, report_id: str):
+        with self._lock:
+            return self._failed.get(report_id)
+
+    def status(self, report_id: str):
+        """
+        `pending` until the record is stored, then `ready`, or `failed`;
+        None if unknown.
+        """
+        with self._lock:
+            if report_id in self._pending:
+                return "pending"
+            if report_id in self._failed:
+                return "failed"
+        return "ready" if report_catalog.get(report_id) else None
+
+    def render(self, report_id: str, fmt: str = "pdf") -> Future:
+        """
+        Future of the rendered file's path; concurrent requests for the
+        same file share one render. KeyError if no record is stored.
+        """
+        path = self.cache.get(report_id, fmt)
+        if path:
+            done = Future()
+            done.set_result(path)
+            return done
+
+        record = report_catalog.record(report_id)
+        if record is None:
+            raise KeyError(report_id)
+
+        with self._lock:
+            if (report_id, fmt) in self._rendering:
+                return self._rendering[(report_id, fmt)]
+            done = self._rendering[(report_id, fmt)] = Future()
+
+        partial = self.cache.path(report_id, fmt) + ".part"
+        try:
+            future = self._pool().submit(RENDERERS[fmt], output_path=partial, **record)
+        except Exception as e:
+            self._rendered(report_id, fmt, None, done, error=e)
+        else:
+            future.add_done_callback(lambda f: self._rendered(report_id, fmt, f, done))
+        return done
+
+    def _rendered(self, report_id: str, fmt: str, future, done: Future, error=None):
+        try:
+            if error is not None:
+                raise error
+            path = self.cache.put(report_id, fmt, future.result())
+        except Exception as e:
+            print("Report render failed:", e)
+            try:
+                os.remove(self.cache.path(report_id, fmt) + ".part")
+            except FileNotFoundError:
+                pass
+            done.set_exception(e)
+        else:
+            done.set_result(path)
+        finally:
+            with self._lock:
+                self._rendering.pop((report_id, fmt), None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            rendering = len(self._rendering)
+        return {"rendering": rendering, "cache": self.cache.stats()}
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+
+report_jobs = ReportJobs()
@@ -0,0 +1,171 @@
+import os
+import re
+from collections import deque
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+import yaml
+
+SKILLS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "skills.yaml"
+)
+
+# Lower-case ASCII only, so text and match offsets keep the same length
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+# Characters that continue a token: "Java" must not match in "JavaScript",
+# "C" must not match in "C++" / "C#"
+_WORD_CHARS = set("abcdefghijklmnopqrstuvwxyz0123456789")
+_EXACT_TAIL = _WORD_CHARS | set("+#&-")
+_DIGITS = set("0123456789")
+
+# A version glued to the name still counts: "C++17", "Python3.11", "Vue3"
+_VERSION = re.compile(r"\d+(?:\.\d+)*")
+
+
+def _token_end(lowered: str, end: int) -> int:
+    """Where a match ending at `end` really ends, after any version suffix."""
+    if end < len(lowered) and lowered[end] in _DIGITS:
+        return _VERSION.match(lowered, end).end()
+    return end
+
+
+class Skill(NamedTuple):
+    name: str
+    language: Optional[str]  # core language; the skill itself for a language
+    is_language: bool
+
+
+class SkillMatcher:
+    """
+    Finds known skills in CV text in one pass with an Aho-Corasick
+    automaton over every skill name and alias, keeping only matches that
+    sit on word boundaries.
+    """
+
+    def __init__(self, config: dict):
+        self.skills = {}
+        self._by_alias = {}
+        # trie: per node, its children, failure link and (skill, length, exact) outputs
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        for section, is_language in (("languages", True), ("technologies", False)):
+            for name, entry in (config.get(section) or {}).items():
+                entry = entry or {}
+                skill = Skill(name, name if is_language else entry.get("language"), is_language)
+                self.skills[name] = skill
+
+                exact = entry.get("exact") or []
+                patterns = [(alias, False) for alias in entry.get("aliases") or []]
+                patterns += [(alias, True) for alias in exact]
+                if name not in exact:
+                    patterns.append((name, False))
+
+                for alias, is_exact in patterns:
+                    self._by_alias[alias.translate(_ASCII_LOWER)] = skill
+                    self._add(alias, skill, is_exact)
+
+        self._link()
+
+    def _add(self, pattern: str, skill: Skill, exact: bool):
+        node = 0
+        for ch in pattern.translate(_ASCII_LOWER):
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((skill.name, len(pattern), pattern if exact else None))
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text: str, relaxed=()) -> dict:
+        """
+        Skill name -> number of mentions, in order of first mention. Skills
+        in `relaxed` match their `exact` names in any case too, for when
+        the user named the skill themselves ("REACT" is then React).
+        """
+        lowered = text.translate(_ASCII_LOWER)
+        goto, fail, out = self._goto, self._fail, self._out
+        found = {}
+        node = 0
+
+        for end, ch in enumerate(lowered, 1):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+
+            for name, length, exact in out[node]:
+                start = end - length
+                if start and lowered[start - 1] in _WORD_CHARS:
+                    continue
+                tail = _token_end(lowered, end)
+                after = lowered[tail] if tail < len(lowered) else ""
+                if exact is not None:
+                    if after in _EXACT_TAIL:
+                        continue
+                    if name not in relaxed and text[start:end] != exact:
+                        continue
+                elif after in _WORD_CHARS:
+                    continue
+                found[name] = found.get(name, 0) + 1
+
+        return found
+
+    def resolve(self, tech: str) -> Optional[Skill]:
+        """The skill a user-entered technology name refers to, if known."""
+        return self._by_alias.get(" ".join(tech.split()).translate(_ASCII_LOWER))
+
+
+@lru_cache(maxsize=None)
+def skill_matcher() -> SkillMatcher:
+    """The matcher for config/skills.yaml, built once per process."""
+    with open(SKILLS_PATH, "r", encoding="utf-8") as f:
+        return SkillMatcher(yaml.safe_load(f) or {})
+
+
+def tech_in_cv(cv_text: str, tech: str) -> bool:
+    """
+    Whether the CV mentions `tech`. Known skills match through their
+    aliases, in any case since the user picked them; failing that, the
+    entered name is searched for as a literal word, case-insensitively
+    and with an optional version suffix.
+    """
+    skill = skill_matcher().resolve(tech)
+    if skill is not None and skill.name in skill_matcher().find(cv_text, relaxed={skill.name}):
+        return True
+    literal = re.escape(" ".join(tech.split()))
+    if not literal:
+        return False
+    # "C" must not match in "C++" / "C#" here either, nor a version cut
+    # short ("Kubernetes1" in "Kubernetes1.2x")
+    pattern = rf"(?<!\w){literal}(?:{_VERSION.pattern})?(?![\w+#]|\.\d)"
+    return re.search(pattern, cv_text, re.IGNORECASE) is not None
+
+
+def skill_candidates(cv_text: str) -> str:
+    """Skills found in the CV, for the analysis prompt: "Django (Python), Docker"."""
+    matcher = skill_matcher()
+    names = []
+    for name in matcher.find(cv_text):
+        skill = matcher.skills[name]
+        if skill.language and not skill.is_language:
+            names.append(f"{name} ({skill.language})")
+        else:
+            names.append(name)
+    return ", ".join(names) or "none found"
@@ -17,6 +17,7 @@ function App() {
   const [selectedTech, setSelectedTech] = useState<string | null>(null);
   const [questions, setQuestions] = useState<string[]>([]);
   const [challenge, setChallenge] = useState("");
+  const [challengeId, setChallengeId] = useState("");
 
   const contentRef = useRef<HTMLDivElement>(null);
 
@@ -67,6 +68,7 @@ function App() {
       );
 
       setChallenge(challengeData.challenge || "");
+      setChallengeId(challengeData.challenge_id || "");
       setStep(4);
     } catch {
       alert("Failed to load coding challenge");
@@ -118,7 +120,7 @@ function App() {
           )}
 
           {step === 4 && selectedTech && (
-            <CodingChallenge challenge={challenge} language={selectedTech} />
+            <CodingChallenge challenge={challenge} challengeId={challengeId} language={selectedTech} />
           )}
         </div>
       </div>
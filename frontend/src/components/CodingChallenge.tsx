@@ -1,9 +1,17 @@
-import { useState } from "react";
+import { useEffect, useState } from "react";
 import Editor from "@monaco-editor/react";
-import { gradeCodeApi } from "../services/api";
+import {
+  getFeedbackApi,
+  gradeCodeApi,
+  reportUrl,
+  retryWhenBusy,
+  runCodeStreamApi,
+  RunnerBusyError,
+} from "../services/api";
 
 interface Props {
   challenge: string;
+  challengeId?: string;
   language: string;
 }
 
@@ -87,13 +95,34 @@ function mapTechToConfig(tech: string): LangConfig {
   };
 }
 
-export default function CodingChallenge({ challenge, language }: Props) {
+export default function CodingChallenge({ challenge, challengeId = "", language }: Props) {
   const config = mapTechToConfig(language);
 
   const [code, setCode] = useState(config.starter);
   const [result, setResult] = useState<any | null>(null);
   const [loading, setLoading] = useState(false);
   const [runOutput, setRunOutput] = useState("");
+  const [review, setReview] = useState("");
+  const [busy, setBusy] = useState("");
+
+  // test-graded results arrive first; poll for the LLM review
+  useEffect(() => {
+    if (!result?.feedback_id) return;
+
+    const timer = setInterval(async () => {
+      try {
+        const data = await getFeedbackApi(result.feedback_id);
+        if (data.status !== "pending") {
+          setReview(data.feedback);
+          clearInterval(timer);
+        }
+      } catch {
+        clearInterval(timer);
+      }
+    }, 2000);
+
+    return () => clearInterval(timer);
+  }, [result]);
 
   if (!challenge) return null;
 
@@ -102,26 +131,41 @@ export default function CodingChallenge({ challenge, language }: Props) {
     setRunOutput("Running...\n");
 
     try {
-      const res = await fetch("http://127.0.0.1:8000/run-code", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({
-          language: config.serverLang,
-          code,
-        }),
-      });
-
-      const data = await res.json();
+      // show output live while the program runs
+      let live = "";
+      let liveStdout = "";
+      const data = await retryWhenBusy(
+        () => {
+          live = "";
+          liveStdout = "";
+          return runCodeStreamApi(
+            config.serverLang,
+            code,
+            (stream, text) => {
+              live += text;
+              if (stream === "stdout") liveStdout += text;
+              setRunOutput(live);
+            },
+            challengeId
+          );
+        },
+        (seconds) => setRunOutput(`Runner busy, retrying in ${seconds}s...\n`)
+      );
 
       let output = "";
-      if (data.stdout) output += data.stdout;
+      // a timed-out run reports no stdout; keep what was already streamed
+      output += data.stdout || liveStdout;
       if (data.stderr) output += "\nERROR:\n" + data.stderr;
       if (!output) output = "Program finished with no output.";
       output += `\n\nExit code: ${data.exit_code}`;
 
       setRunOutput(output);
     } catch (err) {
-      setRunOutput("Execution failed — is the backend running?");
+      setRunOutput(
+        err instanceof RunnerBusyError
+          ? "The code runner is still busy. Please try again in a minute."
+          : "Execution failed — is the backend running?"
+      );
     }
   };
 
@@ -129,11 +173,19 @@ export default function CodingChallenge({ challenge, language }: Props) {
   const submit = async () => {
     setLoading(true);
     try {
-      const res = await gradeCodeApi(challenge, code, "");
+      const res = await retryWhenBusy(
+        () => gradeCodeApi(challenge, code, "", challengeId, config.serverLang),
+        (seconds) => setBusy(`Grader busy, retrying in ${seconds}s...`)
+      );
       setResult(res);
-    } catch {
-      alert("Grading failed");
+    } catch (err) {
+      alert(
+        err instanceof RunnerBusyError
+          ? "The grader is still busy. Please submit again in a minute."
+          : "Grading failed"
+      );
     }
+    setBusy("");
     setLoading(false);
   };
 
@@ -148,6 +200,28 @@ export default function CodingChallenge({ challenge, language }: Props) {
             {result.verdict?.toUpperCase()}
           </p>
           <p>{result.feedback}</p>
+          {result.tests_total > 0 && (
+            <ul>
+              {result.cases.map((c: any) => (
+                <li key={c.index} className={c.passed ? "pass" : "fail"}>
+                  Test {c.index + 1}: {c.passed ? "passed" : "failed"}
+                  {c.time_ms != null && ` (${c.time_ms.toFixed(2)} ms)`}
+                </li>
+              ))}
+            </ul>
+          )}
+          {result.feedback_id && <p>{review || "Reviewer feedback is on its way..."}</p>}
+          {result.report_id && (
+            <p>
+              <a href={reportUrl(result.report_id)} target="_blank" rel="noreferrer">
+                Download PDF report
+              </a>
+              {" · "}
+              <a href={reportUrl(result.report_id, "html")} target="_blank" rel="noreferrer">
+                View in browser
+              </a>
+            </p>
+          )}
         </div>
       </div>
     );
@@ -197,7 +271,7 @@ export default function CodingChallenge({ challenge, language }: Props) {
         </div>
       )}
 
-      {loading && <p>Working...</p>}
+      {loading && <p>{busy || "Working..."}</p>}
     </div>
   );
 }
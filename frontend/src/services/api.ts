@@ -64,20 +64,135 @@ export const getCodingChallengeApi = async (
 
 
 
+// The code runner is saturated (503 from /grade-code or /run-code, or a
+// run result carrying retry_after); the call can be repeated after
+// retryAfter seconds
+export class RunnerBusyError extends Error {
+  retryAfter: number;
+
+  constructor(retryAfter: number) {
+    super(`Code runner busy, retry in ${retryAfter}s`);
+    this.retryAfter = retryAfter;
+  }
+}
+
+const busyError = async (res: Response) => {
+  const body = await res.json().catch(() => ({}));
+  const seconds = Number(body.retry_after ?? res.headers.get("Retry-After"));
+  return new RunnerBusyError(seconds > 0 ? seconds : 1);
+};
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Repeats `call` while the runner is busy, up to `attempts` times;
+// onWait gets the seconds left before each retry, once a second
+export const retryWhenBusy = async <T>(
+  call: () => Promise<T>,
+  onWait: (seconds: number) => void,
+  attempts = 5
+): Promise<T> => {
+  for (let attempt = 1; ; attempt++) {
+    try {
+      return await call();
+    } catch (err) {
+      if (!(err instanceof RunnerBusyError) || attempt >= attempts) throw err;
+      for (let left = Math.ceil(err.retryAfter); left > 0; left--) {
+        onWait(left);
+        await sleep(1000);
+      }
+    }
+  }
+};
+
 export const gradeCodeApi = async (
   problem: string,
   code: string,
-  output: string
+  output: string,
+  challengeId = "",
+  language = ""
 ) => {
   const form = new FormData();
   form.append("problem", problem);
   form.append("code", code);
   form.append("output", output);
+  form.append("challenge_id", challengeId);
+  form.append("language", language);
 
   const res = await fetch("http://localhost:8000/grade-code", {
     method: "POST",
     body: form,
   });
 
+  if (res.status === 503) throw await busyError(res);
+  return res.json();
+};
+
+// LLM review of a test-graded submission, produced in the background
+export const getFeedbackApi = async (feedbackId: string) => {
+  const res = await fetch(`http://localhost:8000/feedback/${feedbackId}`);
   return res.json();
 };
+
+// Report of a graded submission, rendered on first download;
+// 202 with a status while the review is still pending
+export const reportUrl = (reportId: string, format: "pdf" | "html" = "pdf") =>
+  `http://localhost:8000/reports/${reportId}?format=${format}`;
+
+export interface RunResult {
+  stdout: string;
+  stderr: string;
+  exit_code: number;
+  retry_after?: number;
+}
+
+// Streams program output as Server-Sent Events; onOutput fires for every
+// chunk while the program runs, the promise resolves with the final result.
+export const runCodeStreamApi = async (
+  language: string,
+  code: string,
+  onOutput: (stream: "stdout" | "stderr", text: string) => void,
+  challengeId = ""
+): Promise<RunResult> => {
+  const res = await fetch("http://127.0.0.1:8000/run-code", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    // challenge_id lets /grade-code reuse this run instead of re-executing
+    body: JSON.stringify({ language, code, stream: true, challenge_id: challengeId }),
+  });
+
+  if (res.status === 503) throw await busyError(res);
+  if (!res.ok || !res.body) throw new Error("Execution failed");
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let result: RunResult | null = null;
+
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let sep: number;
+    while ((sep = buffer.indexOf("\n\n")) !== -1) {
+      const block = buffer.slice(0, sep);
+      buffer = buffer.slice(sep + 2);
+
+      let event = "message";
+      let data = "";
+      for (const line of block.split("\n")) {
+        if (line.startsWith("event: ")) event = line.slice(7);
+        else if (line.startsWith("data: ")) data += line.slice(6);
+      }
+
+      const payload = JSON.parse(data);
+      if (event === "output") onOutput(payload.stream, payload.text);
+      else if (event === "result") result = payload;
+    }
+  }
+
+  if (!result) throw new Error("Execution stream ended without a result");
+  // the stream had already started when the runner turned the run away
+  if (result.retry_after != null) throw new RunnerBusyError(result.retry_after);
+  return result;
+};
@@ -0,0 +1,153 @@
+"""
+Admission control
+=================
+Bounds how many compiles and runs execute at once, so a burst of
+submissions queues up instead of slowing every program down until the
+10 s timeouts fire.
+
+Waiters are served by priority, then arrival:
+    grade       test-suite runs behind submit / grade
+    run         exploratory "Run" clicks
+    background  profiling and other deferred work
+An optional per-language cap keeps one slow toolchain (e.g. a burst of
+Java compiles) from holding every slot; its waiters are skipped while the
+cap is reached, so other languages keep moving. `language_caps` sets a
+cap for single languages, e.g. JavaScript runs at the Node pool's size, so
+a run slot is never held while waiting for a worker.
+
+Each priority has a queue-time SLO. A request whose estimated wait already
+exceeds it is refused at once, and one that waits past it gives up; both
+raise `Saturated` with a retry-after hint.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from itertools import count
+
+PRIORITIES = {"grade": 0, "run": 1, "background": 2}
+
+# weight of the newest sample in the moving average of slot hold time
+_EWMA = 0.2
+
+
+class Saturated(Exception):
+    """No slot within the queue-time SLO; retry after `retry_after` s."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Code runner is busy; retry in {retry_after} s.")
+        self.retry_after = retry_after
+
+
+class SlotPool:
+    """Counting semaphore with priority ordering and per-language caps."""
+
+    def __init__(self, name: str, slots: int, per_language: int = 0, language_caps: dict = None):
+        self.name = name
+        self.slots = max(1, slots)
+        self.per_language = per_language
+        self.language_caps = language_caps or {}
+        self.active = 0
+        self.active_by_language = {}
+        self.avg_hold = 1.0
+        self.admitted = 0
+        self.rejected = 0
+        self.queued_seconds = 0.0
+        self._waiters = []  # (priority, seq, language)
+        self._seq = count()
+        self._cond = threading.Condition()
+
+    def _language_full(self, language: str) -> bool:
+        caps = [c for c in (self.per_language, self.language_caps.get(language, 0)) if c]
+        return bool(caps) and self.active_by_language.get(language, 0) >= min(caps)
+
+    def _can_enter(self, me) -> bool:
+        if self.active >= self.slots or self._language_full(me[2]):
+            return False
+        # no eligible waiter ahead of us
+        return not any(
+            w < me and not self._language_full(w[2]) for w in self._waiters
+        )
+
+    def _estimate(self, me) -> float:
+        ahead = sum(1 for w in self._waiters if w < me)
+        if self.active < self.slots and not ahead:
+            return 0.0
+        return (ahead + 1) * self.avg_hold / self.slots
+
+    @contextmanager
+    def acquire(self, language: str, priority: int, slo: float):
+        with self._cond:
+            me = (priority, next(self._seq), language)
+            estimate = self._estimate(me)
+            if estimate > slo:
+                self.rejected += 1
+                raise Saturated(max(1, math.ceil(estimate)))
+
+            start = time.monotonic()
+            deadline = start + slo
+            self._waiters.append(me)
+            try:
+                while not self._can_enter(me):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.rejected += 1
+                        raise Saturated(max(1, math.ceil(self._estimate(me))))
+                    self._cond.wait(remaining)
+            finally:
+                self._waiters.remove(me)
+                self._cond.notify_all()
+
+            self.active += 1
+            self.active_by_language[language] = self.active_by_language.get(language, 0) + 1
+            self.admitted += 1
+            self.queued_seconds += time.monotonic() - start
+
+        entered = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.active -= 1
+                self.active_by_language[language] -= 1
+                held = time.monotonic() - entered
+                self.avg_hold += _EWMA * (held - self.avg_hold)
+                self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            queued = {}
+            for _, _, language in self._waiters:
+                queued[language] = queued.get(language, 0) + 1
+            return {
+                "slots": self.slots,
+                "active": self.active,
+                "queued": queued,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "avg_queue_seconds": round(self.queued_seconds / self.admitted, 3) if self.admitted else 0.0,
+                "avg_hold_seconds": round(self.avg_hold, 3),
+            }
+
+
+class AdmissionController:
+    """Separate slot pools for compiling and for running programs."""
+
+    def __init__(
+        self, compile_slots: int, run_slots: int, per_language: int, slo: dict, run_caps: dict = None
+    ):
+        self.pools = {
+            "compile": SlotPool("compile", compile_slots, per_language),
+            "run": SlotPool("run", run_slots, per_language, run_caps),
+        }
+        self.slo = slo
+
+    def slot(self, kind: str, language: str, priority: str = "run"):
+        """Context manager holding one `kind` slot; may raise Saturated."""
+        level = PRIORITIES.get(priority, PRIORITIES["run"])
+        slo = self.slo.get(priority, self.slo["run"])
+        return self.pools[kind].acquire(language, level, slo)
+
+    def stats(self) -> dict:
+        return {kind: pool.stats() for kind, pool in self.pools.items()}
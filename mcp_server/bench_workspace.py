@@ -0,0 +1,77 @@
+"""
+Benchmark: per-run temp files vs pooled tmpfs workspaces
+========================================================
+Measures only the filesystem work around a run (create the source,
+produce a build artifact, clean up), not the program itself.
+
+    python bench_workspace.py [runs]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from workspace import WORKSPACE_ROOT, WorkspacePool, memfd_source
+
+SOURCE = "def solve(nums):\n    return sorted(nums)\n" * 50
+ARTIFACT = b"\0" * 64 * 1024  # stand-in for a class file / binary
+
+
+def temp_file_python():
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".py", mode="w", encoding="utf-8") as f:
+        f.write(SOURCE)
+        path = f.name
+    os.remove(path)
+
+
+def memfd_python():
+    fd = memfd_source(SOURCE, "main.py")
+    os.close(fd)
+
+
+def temp_dir_build():
+    tmp_dir = tempfile.mkdtemp()
+    with open(os.path.join(tmp_dir, "main.cpp"), "w", encoding="utf-8") as f:
+        f.write(SOURCE)
+    with open(os.path.join(tmp_dir, "main"), "wb") as f:
+        f.write(ARTIFACT)
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def workspace_build(pool):
+    tmp_dir = pool.acquire("cpp")
+    with open(os.path.join(tmp_dir, "main.cpp"), "w", encoding="utf-8") as f:
+        f.write(SOURCE)
+    with open(os.path.join(tmp_dir, "main"), "wb") as f:
+        f.write(ARTIFACT)
+    pool.release("cpp", tmp_dir)
+
+
+def bench(label, fn, runs):
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    per_run = (time.perf_counter() - start) / runs * 1e6
+    print(f"{label:<34} {per_run:8.1f} µs/run")
+    return per_run
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    pool = WorkspacePool()
+
+    print(f"temp dir: {tempfile.gettempdir()}   workspace root: {WORKSPACE_ROOT}   runs: {runs}\n")
+
+    base = bench("python: NamedTemporaryFile", temp_file_python, runs)
+    if hasattr(os, "memfd_create"):
+        new = bench("python: memfd source", memfd_python, runs)
+        print(f"{'':<34} {base / new:8.1f}x faster\n")
+
+    base = bench("build: mkdtemp + rmtree", temp_dir_build, runs)
+    new = bench("build: pooled workspace", lambda: workspace_build(pool), runs)
+    print(f"{'':<34} {base / new:8.1f}x faster")
+
+    pool.close()
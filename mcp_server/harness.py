@@ -0,0 +1,983 @@
+"""
+Multi-test-case harness
+=======================
+Builds a per-language driver program that loads the candidate's solution
+once and calls `function_name` for every test case in the same process.
+
+A test case is {"input": [arg1, arg2, ...], "expected": value}; values are
+JSON. Once the solution is loaded the driver prints `<marker>{"start": true}`,
+then for every case one line
+
+    <marker>{"index": 0, "result": "<json>", "output": "...", "error": null,
+             "time_ms": 0.12, "repeats": 1, "max_rss_kb": 9216}
+
+to the real stdout. The marker (`new_marker()`) holds a random nonce per
+run, so a solution can't print result lines of its own; `CaseCollector`
+ignores lines before the start line and fails cases reported twice. `max_rss_kb` is the process's peak RSS so far
+(getrusage where available; current RSS of the shared worker for
+JavaScript; null when unknown). Anything the solution prints while a case runs is
+captured into "output" instead. `collect_results` turns those lines into
+per-case pass/fail.
+
+With `min_time_ms` the driver calls the function again, on a fresh copy
+of the arguments, until that much wall time has passed (at most
+MAX_REPEATS calls) and reports the median call as "time_ms". Graders
+leave it at 0: one call per case.
+
+Each language strategy in languages.py names its driver builder here as
+its `driver` (e.g. `python_driver`); `build_driver` fills in the template
+the builder picks. A language without one has no test harness.
+
+Statically typed languages need parameter types to emit argument literals.
+They use neutral names — int, long, double, bool, string, with `[]`
+suffixes for (nested) arrays — and are inferred from the first test case
+when not given.
+"""
+
+import json
+import math
+import re
+import secrets
+
+CASE_OUTPUT_LIMIT = 4096
+MAX_REPEATS = 10000
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_]\w*$")
+
+
+def new_marker() -> str:
+    """Prefix of the driver's result lines for one run."""
+    return f"##CASE-{secrets.token_hex(8)}## "
+
+_TYPE_ALIASES = {
+    "int": "int", "integer": "int",
+    "long": "long",
+    "double": "double", "float": "double",
+    "bool": "bool", "boolean": "bool",
+    "string": "string", "str": "string",
+}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  Types & literals
+# ─────────────────────────────────────────────────────────────────────────────
+
+def parse_type(name: str):
+    """'int[][]' → ('int', 2)"""
+    name = name.strip().replace(" ", "")
+    depth = 0
+    while name.endswith("[]"):
+        name, depth = name[:-2], depth + 1
+    base = _TYPE_ALIASES.get(name.lower())
+    if base is None:
+        raise ValueError(f"Unsupported parameter type '{name}'")
+    return base, depth
+
+
+def _infer_type(value) -> str:
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int" if -2**31 <= value < 2**31 else "long"
+    if isinstance(value, float):
+        return "double"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        inner = [_infer_type(v) for v in value]
+        if not inner:
+            return "int[]"
+        for preferred in ("string", "double", "long"):
+            if preferred in inner:
+                return preferred + "[]"
+        return inner[0] + "[]"
+    raise ValueError(f"Cannot infer a parameter type for {value!r}")
+
+
+def _scalar(lang: str, base: str, value) -> str:
+    if base == "bool":
+        return "true" if value else "false"
+    if base == "string":
+        return json.dumps(str(value))
+    if base == "double":
+        return repr(float(value))
+    if base == "long":
+        return f"{int(value)}LL" if lang == "cpp" else f"{int(value)}L"
+    return str(int(value))
+
+
+_BASE_NAMES = {
+    "java": {"int": "int", "long": "long", "double": "double", "bool": "boolean", "string": "String"},
+    "csharp": {"int": "int", "long": "long", "double": "double", "bool": "bool", "string": "string"},
+    "cpp": {"int": "int", "long": "long long", "double": "double", "bool": "bool", "string": "string"},
+}
+
+
+def _type_name(lang: str, base: str, depth: int) -> str:
+    name = _BASE_NAMES[lang][base]
+    if lang == "cpp":
+        for _ in range(depth):
+            name = f"vector<{name}>"
+        return name
+    return name + "[]" * depth
+
+
+def _literal(lang: str, base: str, depth: int, value) -> str:
+    if depth == 0:
+        return _scalar(lang, base, value)
+    if not isinstance(value, list):
+        raise ValueError(f"Expected a list for {_type_name(lang, base, depth)}, got {value!r}")
+
+    if lang == "java":
+        # nested Java initialisers must be bare braces
+        inner = ", ".join(_java_init(base, depth - 1, v) for v in value)
+        return f"new {_type_name(lang, base, depth)} {{ {inner} }}"
+
+    items = ", ".join(_literal(lang, base, depth - 1, v) for v in value)
+    if lang == "csharp":
+        return f"new {_type_name(lang, base, depth)} {{ {items} }}"
+    return f"{_type_name(lang, base, depth)}{{ {items} }}"
+
+
+def _java_init(base: str, depth: int, value) -> str:
+    if depth == 0:
+        return _scalar("java", base, value)
+    return "{ " + ", ".join(_java_init(base, depth - 1, v) for v in value) + " }"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  Drivers
+# ─────────────────────────────────────────────────────────────────────────────
+
+_PYTHON_DRIVER = '''\
+import contextlib, io, json, statistics, sys, time, traceback
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def max_rss_kb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+SOURCE = __SOURCE__
+CASES = __CASES__  # JSON per case, decoded afresh for every call
+
+ns = {"__name__": "solution"}
+exec(compile(SOURCE, "solution.py", "exec"), ns)
+fn = ns.get("__NAME__")
+if fn is None and isinstance(ns.get("Solution"), type):
+    fn = getattr(ns["Solution"](), "__NAME__")
+if fn is None:
+    raise SystemExit("Function '__NAME__' not found in solution")
+sys.stdout.write("__MARKER__" + json.dumps({"start": True}) + "\\n")
+
+for i, encoded in enumerate(CASES):
+    buf = io.StringIO()
+    result = error = None
+    times = []
+    case_start = time.perf_counter()
+    try:
+        while True:
+            args = json.loads(encoded)
+            start = time.perf_counter()
+            try:
+                with contextlib.redirect_stdout(buf):
+                    value = fn(*args)
+            finally:
+                times.append(time.perf_counter() - start)
+            if (time.perf_counter() - case_start) * 1000 >= __MINMS__ or len(times) >= __REPEATS__:
+                break
+        result = json.dumps(value, default=str)
+    except (Exception, SystemExit):
+        error = traceback.format_exc(limit=-3)
+    sys.stdout.write("__MARKER__" + json.dumps({
+        "index": i,
+        "result": result,
+        "output": buf.getvalue()[:__LIMIT__],
+        "error": error,
+        "time_ms": statistics.median(times) * 1000,
+        "repeats": len(times),
+        "max_rss_kb": max_rss_kb(),
+    }) + "\\n")
+    sys.stdout.flush()
+'''
+
+_JS_DRIVER = '''__SOURCE__
+;(async () => {
+  // console writes through process.stdout.write; swap it per case
+  const harnessWrite = process.stdout.write.bind(process.stdout);
+  // JSON per case, parsed afresh for every call
+  const harnessCases = JSON.parse(__CASES__);
+  const harnessFn =
+    typeof __NAME__ === "function" ? __NAME__
+    : typeof Solution === "function" ? (...a) => new Solution().__NAME__(...a)
+    : null;
+  if (!harnessFn) throw new Error("Function '__NAME__' not found in solution");
+  harnessWrite("__MARKER__" + JSON.stringify({ start: true }) + "\\n");
+  const harnessMs = (start) => {
+    const [s, ns] = process.hrtime(start);
+    return s * 1000 + ns / 1e6;
+  };
+  const harnessMedian = (xs) => {
+    const sorted = [...xs].sort((a, b) => a - b);
+    const mid = sorted.length >> 1;
+    return sorted.length % 2 ? sorted[mid] : (sorted[mid - 1] + sorted[mid]) / 2;
+  };
+
+  for (let i = 0; i < harnessCases.length; i++) {
+    const buf = [];
+    process.stdout.write = (s) => buf.push(String(s)) > 0;
+    let result = null, error = null, value;
+    const times = [];
+    const caseStart = process.hrtime();
+    try {
+      do {
+        const args = JSON.parse(harnessCases[i]);
+        const start = process.hrtime();
+        try {
+          value = harnessFn(...args);
+          if (value && typeof value.then === "function") value = await value;
+        } finally {
+          times.push(harnessMs(start));
+        }
+      } while (harnessMs(caseStart) < __MINMS__ && times.length < __REPEATS__);
+      result = value === undefined ? "null" : JSON.stringify(value);
+    } catch (e) {
+      error = String((e && e.stack) || e);
+    }
+    process.stdout.write = harnessWrite;
+    harnessWrite("__MARKER__" + JSON.stringify({
+      index: i,
+      result,
+      output: buf.join("").slice(0, __LIMIT__),
+      error,
+      time_ms: harnessMedian(times),
+      repeats: times.length,
+      max_rss_kb: Math.round(process.memoryUsage().rss / 1024),
+    }) + "\\n");
+  }
+})();
+'''
+
+_JAVA_DRIVER = '''\
+import java.io.*;
+import java.lang.reflect.*;
+import java.util.*;
+__IMPORTS__
+
+__SOURCE__
+
+public class Main {
+    static String quote(String s) {
+        StringBuilder b = new StringBuilder("\\"");
+        for (char c : s.toCharArray()) {
+            switch (c) {
+                case '"': b.append("\\\\\\""); break;
+                case '\\\\': b.append("\\\\\\\\"); break;
+                case '\\n': b.append("\\\\n"); break;
+                case '\\r': b.append("\\\\r"); break;
+                case '\\t': b.append("\\\\t"); break;
+                default:
+                    if (c < 0x20) b.append(String.format("\\\\u%04x", (int) c));
+                    else b.append(c);
+            }
+        }
+        return b.append('"').toString();
+    }
+
+    static String json(Object v) {
+        if (v == null) return "null";
+        if (v instanceof String || v instanceof Character) return quote(v.toString());
+        if (v instanceof Number || v instanceof Boolean) return v.toString();
+        List<String> parts = new ArrayList<>();
+        if (v.getClass().isArray()) {
+            for (int i = 0; i < Array.getLength(v); i++) parts.add(json(Array.get(v, i)));
+            return "[" + String.join(",", parts) + "]";
+        }
+        if (v instanceof Iterable) {
+            for (Object x : (Iterable<?>) v) parts.add(json(x));
+            return "[" + String.join(",", parts) + "]";
+        }
+        if (v instanceof Map) {
+            for (Map.Entry<?, ?> e : ((Map<?, ?>) v).entrySet())
+                parts.add(quote(String.valueOf(e.getKey())) + ":" + json(e.getValue()));
+            return "{" + String.join(",", parts) + "}";
+        }
+        return quote(v.toString());
+    }
+
+    static String maxRssKb() {
+        try (BufferedReader r = new BufferedReader(new FileReader("/proc/self/status"))) {
+            for (String line; (line = r.readLine()) != null; )
+                if (line.startsWith("VmHWM:")) return line.replaceAll("\\\\D", "");
+        } catch (IOException e) {
+            // not Linux
+        }
+        return "null";
+    }
+
+    static Object copy(Object v) {
+        if (v == null || !v.getClass().isArray()) return v;
+        int n = Array.getLength(v);
+        Class<?> elem = v.getClass().getComponentType();
+        Object c = Array.newInstance(elem, n);
+        if (elem.isArray()) for (int k = 0; k < n; k++) Array.set(c, k, copy(Array.get(v, k)));
+        else System.arraycopy(v, 0, c, 0, n);
+        return c;
+    }
+
+    static double median(List<Double> xs) {
+        if (xs.isEmpty()) return 0;
+        List<Double> sorted = new ArrayList<>(xs);
+        Collections.sort(sorted);
+        int mid = sorted.size() / 2;
+        return sorted.size() % 2 == 1 ? sorted.get(mid) : (sorted.get(mid - 1) + sorted.get(mid)) / 2;
+    }
+
+    static Object adapt(Object v, Class<?> t) {
+        if (v == null) return null;
+        if (List.class.isAssignableFrom(t) && v.getClass().isArray()) {
+            List<Object> list = new ArrayList<>();
+            for (int i = 0; i < Array.getLength(v); i++) list.add(adapt(Array.get(v, i), Object.class));
+            return list;
+        }
+        if (t == Object.class && v.getClass().isArray() && v.getClass().getComponentType().isArray())
+            return adapt(v, List.class);
+        if ((t == long.class || t == Long.class) && v instanceof Integer) return ((Integer) v).longValue();
+        if ((t == double.class || t == Double.class) && v instanceof Number) return ((Number) v).doubleValue();
+        return v;
+    }
+
+    static Method find(String name) {
+        for (String cls : new String[] { __CLASSES__ }) {
+            try {
+                for (Method m : Class.forName(cls).getDeclaredMethods())
+                    if (m.getName().equals(name)) return m;
+            } catch (ClassNotFoundException e) {
+                // nested class; skip
+            }
+        }
+        throw new RuntimeException("Function '" + name + "' not found in solution");
+    }
+
+    // one method per case: a method's bytecode is limited to 64 KB
+__ROWS__
+
+    public static void main(String[] args) throws Exception {
+        Method m = find("__NAME__");
+        m.setAccessible(true);
+        Object target = null;
+        if (!Modifier.isStatic(m.getModifiers())) {
+            Constructor<?> c = m.getDeclaringClass().getDeclaredConstructor();
+            c.setAccessible(true);
+            target = c.newInstance();
+        }
+        Class<?>[] types = m.getParameterTypes();
+        PrintStream out = System.out;
+        out.println("__MARKER__{\\"start\\":true}");
+        Object[][] cases = new Object[][] {
+__CASES__
+        };
+
+        for (int i = 0; i < cases.length; i++) {
+            ByteArrayOutputStream buf = new ByteArrayOutputStream();
+            System.setOut(new PrintStream(buf, true, "UTF-8"));
+            String result = null, error = null;
+            List<Double> times = new ArrayList<>();
+            long caseStart = System.nanoTime();
+            try {
+                Object value;
+                do {
+                    // a fresh copy per call: the solution may modify its arguments
+                    Object[] call = new Object[cases[i].length];
+                    for (int j = 0; j < call.length; j++)
+                        call[j] = adapt(copy(cases[i][j]), j < types.length ? types[j] : Object.class);
+                    long start = System.nanoTime();
+                    try {
+                        value = m.invoke(target, call);
+                    } finally {
+                        times.add((System.nanoTime() - start) / 1e6);
+                    }
+                } while ((System.nanoTime() - caseStart) / 1e6 < __MINMS__ && times.size() < __REPEATS__);
+                result = m.getReturnType() == void.class ? "null" : json(value);
+            } catch (InvocationTargetException e) {
+                StringWriter sw = new StringWriter();
+                e.getCause().printStackTrace(new PrintWriter(sw));
+                error = sw.toString();
+            } catch (Exception e) {
+                error = e.toString();
+            }
+            double ms = median(times);
+            System.setOut(out);
+            String output = buf.toString("UTF-8");
+            if (output.length() > __LIMIT__) output = output.substring(0, __LIMIT__);
+            out.println("__MARKER__{\\"index\\":" + i
+                + ",\\"result\\":" + (result == null ? "null" : quote(result))
+                + ",\\"output\\":" + quote(output)
+                + ",\\"error\\":" + (error == null ? "null" : quote(error))
+                + ",\\"time_ms\\":" + ms
+                + ",\\"repeats\\":" + times.size()
+                + ",\\"max_rss_kb\\":" + maxRssKb() + "}");
+        }
+    }
+}
+'''
+
+_CSHARP_DRIVER = '''\
+using System;
+using System.Collections;
+using System.Collections.Generic;
+using System.Globalization;
+using System.IO;
+using System.Linq;
+using System.Reflection;
+using System.Text;
+__IMPORTS__
+
+__SOURCE__
+
+static class HarnessMain {
+    static string Quote(string s) {
+        var b = new StringBuilder("\\"");
+        foreach (char c in s) {
+            switch (c) {
+                case '"': b.Append("\\\\\\""); break;
+                case '\\\\': b.Append("\\\\\\\\"); break;
+                case '\\n': b.Append("\\\\n"); break;
+                case '\\r': b.Append("\\\\r"); break;
+                case '\\t': b.Append("\\\\t"); break;
+                default:
+                    if (c < 0x20) b.Append("\\\\u" + ((int) c).ToString("x4"));
+                    else b.Append(c);
+                    break;
+            }
+        }
+        return b.Append('"').ToString();
+    }
+
+    static string Json(object v) {
+        if (v == null) return "null";
+        if (v is string || v is char) return Quote(v.ToString());
+        if (v is bool) return (bool) v ? "true" : "false";
+        if (v is double) return ((double) v).ToString("R", CultureInfo.InvariantCulture);
+        if (v is float) return ((float) v).ToString("R", CultureInfo.InvariantCulture);
+        if (v is IFormattable) return ((IFormattable) v).ToString(null, CultureInfo.InvariantCulture);
+        if (v is IDictionary) {
+            var d = (IDictionary) v;
+            var parts = new List<string>();
+            foreach (DictionaryEntry e in d) parts.Add(Quote(e.Key.ToString()) + ":" + Json(e.Value));
+            return "{" + string.Join(",", parts) + "}";
+        }
+        if (v is IEnumerable) {
+            var parts = new List<string>();
+            foreach (var x in (IEnumerable) v) parts.Add(Json(x));
+            return "[" + string.Join(",", parts) + "]";
+        }
+        return Quote(v.ToString());
+    }
+
+    static object Copy(object v) {
+        var a = v as Array;
+        if (a == null) return v;
+        var c = (Array) a.Clone();
+        if (a.GetType().GetElementType().IsArray)
+            for (int k = 0; k < c.Length; k++) c.SetValue(Copy(c.GetValue(k)), k);
+        return c;
+    }
+
+    static double Median(List<double> xs) {
+        if (xs.Count == 0) return 0;
+        var sorted = xs.OrderBy(x => x).ToList();
+        int mid = sorted.Count / 2;
+        return sorted.Count % 2 == 1 ? sorted[mid] : (sorted[mid - 1] + sorted[mid]) / 2;
+    }
+
+    static object Adapt(object v, Type t) {
+        if (v == null || t.IsInstanceOfType(v)) return v;
+        if (v is Array && t.IsGenericType) {
+            var elem = t.GetGenericArguments()[0];
+            var list = (IList) Activator.CreateInstance(typeof(List<>).MakeGenericType(elem));
+            foreach (var x in (Array) v) list.Add(Adapt(x, elem));
+            return list;
+        }
+        if (v is IConvertible && t.IsPrimitive) return Convert.ChangeType(v, t, CultureInfo.InvariantCulture);
+        return v;
+    }
+
+    static MethodInfo Find(string name) {
+        const BindingFlags flags = BindingFlags.Public | BindingFlags.NonPublic
+            | BindingFlags.Static | BindingFlags.Instance | BindingFlags.DeclaredOnly;
+        foreach (var type in Assembly.GetExecutingAssembly().GetTypes()) {
+            if (type == typeof(HarnessMain)) continue;
+            var m = type.GetMethods(flags).FirstOrDefault(x => x.Name == name);
+            if (m != null) return m;
+        }
+        throw new Exception("Function '" + name + "' not found in solution");
+    }
+
+    static void Main() {
+        var m = Find("__NAME__");
+        object target = m.IsStatic ? null : Activator.CreateInstance(m.DeclaringType, true);
+        var types = m.GetParameters().Select(p => p.ParameterType).ToArray();
+        var out_ = Console.Out;
+        out_.WriteLine("__MARKER__{\\"start\\":true}");
+        var cases = new object[][] {
+__CASES__
+        };
+
+        for (int i = 0; i < cases.Length; i++) {
+            var buf = new StringWriter();
+            Console.SetOut(buf);
+            string result = null, error = null;
+            var times = new List<double>();
+            var caseWatch = System.Diagnostics.Stopwatch.StartNew();
+            try {
+                object value;
+                do {
+                    // a fresh copy per call: the solution may modify its arguments
+                    var call = cases[i].Select((a, j) => Adapt(Copy(a), j < types.Length ? types[j] : typeof(object))).ToArray();
+                    var watch = System.Diagnostics.Stopwatch.StartNew();
+                    try {
+                        value = m.Invoke(target, call);
+                    } finally {
+                        times.Add(watch.Elapsed.TotalMilliseconds);
+                    }
+                } while (caseWatch.Elapsed.TotalMilliseconds < __MINMS__ && times.Count < __REPEATS__);
+                result = m.ReturnType == typeof(void) ? "null" : Json(value);
+            } catch (TargetInvocationException e) {
+                error = e.InnerException.ToString();
+            } catch (Exception e) {
+                error = e.ToString();
+            }
+            double ms = Median(times);
+            Console.SetOut(out_);
+            var output = buf.ToString();
+            if (output.Length > __LIMIT__) output = output.Substring(0, __LIMIT__);
+            out_.WriteLine("__MARKER__{\\"index\\":" + i
+                + ",\\"result\\":" + (result == null ? "null" : Quote(result))
+                + ",\\"output\\":" + Quote(output)
+                + ",\\"error\\":" + (error == null ? "null" : Quote(error))
+                + ",\\"time_ms\\":" + ms.ToString(CultureInfo.InvariantCulture)
+                + ",\\"repeats\\":" + times.Count
+                + ",\\"max_rss_kb\\":" + (System.Diagnostics.Process.GetCurrentProcess().PeakWorkingSet64 / 1024) + "}");
+            out_.Flush();
+        }
+    }
+}
+'''
+
+_CPP_DRIVER = '''\
+#include <algorithm>
+#include <chrono>
+#include <climits>
+#include <cmath>
+#include <cstdio>
+#include <iomanip>
+#include <iostream>
+#include <map>
+#include <numeric>
+#include <queue>
+#include <set>
+#include <sstream>
+#include <stack>
+#include <stdexcept>
+#include <string>
+#include <type_traits>
+#include <unordered_map>
+#include <unordered_set>
+#include <vector>
+#if defined(__unix__) || defined(__APPLE__)
+#include <sys/resource.h>
+#endif
+using namespace std;
+
+__SOURCE__
+
+static string harness_max_rss_kb() {
+#if defined(__unix__) || defined(__APPLE__)
+    struct rusage usage;
+    getrusage(RUSAGE_SELF, &usage);
+#ifdef __APPLE__
+    return to_string(usage.ru_maxrss / 1024);
+#else
+    return to_string(usage.ru_maxrss);
+#endif
+#else
+    return "null";
+#endif
+}
+
+static string harness_quote(const string& s) {
+    ostringstream b;
+    b << '"';
+    for (unsigned char c : s) {
+        switch (c) {
+            case '"': b << "\\\\\\""; break;
+            case '\\\\': b << "\\\\\\\\"; break;
+            case '\\n': b << "\\\\n"; break;
+            case '\\r': b << "\\\\r"; break;
+            case '\\t': b << "\\\\t"; break;
+            default:
+                if (c < 0x20) b << "\\\\u" << hex << setw(4) << setfill('0') << (int) c << dec;
+                else b << c;
+        }
+    }
+    b << '"';
+    return b.str();
+}
+
+static string harness_json(bool v) { return v ? "true" : "false"; }
+static string harness_json(char v) { return harness_quote(string(1, v)); }
+static string harness_json(int v) { return to_string(v); }
+static string harness_json(long v) { return to_string(v); }
+static string harness_json(long long v) { return to_string(v); }
+static string harness_json(unsigned v) { return to_string(v); }
+static string harness_json(unsigned long v) { return to_string(v); }
+static string harness_json(unsigned long long v) { return to_string(v); }
+static string harness_json(double v) {
+    ostringstream b;
+    b << setprecision(17) << v;
+    return b.str();
+}
+static string harness_json(float v) { return harness_json((double) v); }
+static string harness_json(const string& v) { return harness_quote(v); }
+static string harness_json(const char* v) { return harness_quote(v); }
+
+template <class T>
+static string harness_json(const vector<T>& v) {
+    string s = "[";
+    for (size_t i = 0; i < v.size(); i++) {
+        if (i) s += ",";
+        s += harness_json(v[i]);
+    }
+    return s + "]";
+}
+
+static double harness_since(chrono::steady_clock::time_point start) {
+    return chrono::duration<double, milli>(chrono::steady_clock::now() - start).count();
+}
+
+// Whether a case that started at `case_start` is called again
+static bool harness_again(chrono::steady_clock::time_point case_start, size_t calls) {
+    return harness_since(case_start) < __MINMS__ && calls < __REPEATS__;
+}
+
+static double harness_median(vector<double> xs) {
+    if (xs.empty()) return 0;
+    sort(xs.begin(), xs.end());
+    size_t mid = xs.size() / 2;
+    return xs.size() % 2 ? xs[mid] : (xs[mid - 1] + xs[mid]) / 2;
+}
+
+// Times only the call itself; `ms` is left alone when it throws
+template <class F>
+static string harness_call(F f, double& ms) {
+    auto start = chrono::steady_clock::now();
+    if constexpr (is_void_v<decltype(f())>) {
+        f();
+        ms = harness_since(start);
+        return "null";
+    } else {
+        auto value = f();
+        ms = harness_since(start);
+        return harness_json(value);
+    }
+}
+
+int main() {
+    ostream& out = cout;
+    streambuf* real = cout.rdbuf();
+    int harness_index = 0;
+    out << "__MARKER__{\\"start\\":true}" << endl;
+
+    auto harness_report = [&](const string* result, const string& output,
+                              const string* error, const vector<double>& times) {
+        cout.rdbuf(real);
+        out << "__MARKER__{\\"index\\":" << harness_index++
+            << ",\\"result\\":" << (result ? harness_quote(*result) : string("null"))
+            << ",\\"output\\":" << harness_quote(output.substr(0, __LIMIT__))
+            << ",\\"error\\":" << (error ? harness_quote(*error) : string("null"))
+            << ",\\"time_ms\\":" << harness_median(times)
+            << ",\\"repeats\\":" << times.size()
+            << ",\\"max_rss_kb\\":" << harness_max_rss_kb() << "}" << endl;
+    };
+
+__CASES__
+    return 0;
+}
+'''
+
+_CPP_CASE = '''\
+    {
+        ostringstream buf;
+        cout.rdbuf(buf.rdbuf());
+        string result, error;
+        bool ok = false;
+        vector<double> times;
+        auto case_start = chrono::steady_clock::now();
+        auto start = case_start;
+        try {
+            do {
+                // declared per call: the solution may modify its arguments
+__DECLS__
+                double ms = 0;
+                start = chrono::steady_clock::now();
+                result = harness_call([&]() { return __CALL__; }, ms);
+                times.push_back(ms);
+            } while (harness_again(case_start, times.size()));
+            ok = true;
+        } catch (const exception& e) {
+            times.push_back(harness_since(start));
+            error = e.what();
+        } catch (...) {
+            times.push_back(harness_since(start));
+            error = "unknown exception";
+        }
+        harness_report(ok ? &result : nullptr, buf.str(), ok ? nullptr : &error, times);
+    }
+'''
+
+
+def _fill(template: str, **values) -> str:
+    """Single-pass placeholder fill, so inserted source is never rescanned."""
+    return re.sub(
+        r"__([A-Z]+)__",
+        lambda m: values.get(m.group(1), m.group(0)),
+        template,
+    )
+
+
+def _split_imports(code: str, pattern: str):
+    """Pull import / using lines to the top of the generated file."""
+    imports = re.findall(pattern, code, flags=re.MULTILINE)
+    body = re.sub(pattern, "", code, flags=re.MULTILINE)
+    return "\n".join(i.strip() for i in imports), body
+
+
+def _typed_cases(lang: str, inputs, param_types):
+    if param_types is None:
+        param_types = [_infer_type(v) for v in inputs[0]]
+    parsed = [parse_type(t) for t in param_types]
+    rows = []
+    for args in inputs:
+        if len(args) != len(parsed):
+            raise ValueError(
+                f"Test case has {len(args)} arguments, signature has {len(parsed)}"
+            )
+        rows.append([_literal(lang, base, depth, v) for (base, depth), v in zip(parsed, args)])
+    return parsed, rows
+
+
+# Driver builders: (code, function_name, inputs, param_types) -> (template,
+# placeholder values). `inputs` are the cases' argument lists; for typed
+# languages `param_types` may be None.
+
+def python_driver(code, name, inputs, param_types):
+    encoded = [json.dumps(args) for args in inputs]
+    return _PYTHON_DRIVER, dict(SOURCE=repr(code), CASES=repr(encoded))
+
+
+def javascript_driver(code, name, inputs, param_types):
+    encoded = [json.dumps(args) for args in inputs]
+    return _JS_DRIVER, dict(SOURCE=code, CASES=json.dumps(json.dumps(encoded)))
+
+
+def java_driver(code, name, inputs, param_types):
+    imports, body = _split_imports(code, r"^\s*import\s+[\w.*]+\s*;\s*$")
+    body = re.sub(r"^\s*package\s+[\w.]+\s*;", "", body, flags=re.MULTILINE)
+
+    if not re.search(r"\bclass\s+\w+", body):
+        body = "class Solution {\n" + body + "\n}"
+    if re.search(r"\bclass\s+Main\b", body):
+        body = re.sub(r"\bMain\b", "Solution", body)
+    # only the driver may be public in Main.java
+    body = re.sub(r"\bpublic\s+(?=(?:final\s+|abstract\s+)*class\b)", "", body)
+
+    classes = ", ".join(json.dumps(c) for c in re.findall(r"\bclass\s+(\w+)", body))
+    _, rows = _typed_cases("java", inputs, param_types)
+    methods = "\n".join(
+        f"    static Object[] case{i}() {{ return new Object[] {{ " + ", ".join(row) + " }; }"
+        for i, row in enumerate(rows)
+    )
+    cases = ",\n".join(f"            case{i}()" for i in range(len(rows)))
+    return _JAVA_DRIVER, dict(IMPORTS=imports, SOURCE=body, CLASSES=classes, ROWS=methods, CASES=cases)
+
+
+def csharp_driver(code, name, inputs, param_types):
+    imports, body = _split_imports(code, r"^\s*using\s+[\w.]+\s*;\s*$")
+
+    if not re.search(r"\b(class|struct)\s+\w+", body):
+        body = "class Solution {\n" + body + "\n}"
+    # the driver owns the entry point
+    body = re.sub(r"\bstatic\s+(void|int|async\s+Task)\s+Main\s*\(", r"static \1 CandidateMain(", body)
+
+    _, rows = _typed_cases("csharp", inputs, param_types)
+    cases = ",\n".join(
+        "            new object[] { " + ", ".join(row) + " }" for row in rows
+    )
+    return _CSHARP_DRIVER, dict(IMPORTS=imports, SOURCE=body, CASES=cases)
+
+
+def cpp_driver(code, name, inputs, param_types):
+    body = re.sub(r"\bint\s+main\s*\(", "int candidate_main(", code)
+    call_target = (
+        f"Solution().{name}"
+        if re.search(r"\b(class|struct)\s+Solution\b", body)
+        else name
+    )
+
+    parsed, rows = _typed_cases("cpp", inputs, param_types)
+    blocks = []
+    for row in rows:
+        decls = "\n".join(
+            f"                {_type_name('cpp', base, depth)} a{j} = {lit};"
+            for j, ((base, depth), lit) in enumerate(zip(parsed, row))
+        )
+        args = ", ".join(f"a{j}" for j in range(len(row)))
+        blocks.append(_fill(_CPP_CASE, DECLS=decls, CALL=f"{call_target}({args})"))
+    return _CPP_DRIVER, dict(SOURCE=body, CASES="".join(blocks))
+
+
+def build_driver(
+    builder, code: str, function_name: str, test_cases, param_types=None, min_time_ms: float = 0,
+    *, marker: str,
+) -> str:
+    """
+    Return a complete program, made by `builder` (a language strategy's
+    `driver`), that runs every test case against the candidate's
+    `function_name`, each repeated for `min_time_ms` of wall time, and
+    prefixes its result lines with `marker` (see the module docstring).
+    Raises ValueError for bad input.
+    """
+    if not _IDENTIFIER.match(function_name or ""):
+        raise ValueError(f"Invalid function name '{function_name}'")
+    if not test_cases:
+        raise ValueError("No test cases given")
+
+    inputs = []
+    for case in test_cases:
+        args = case.get("input", [])
+        if not isinstance(args, list):
+            raise ValueError("Each test case needs an 'input' list of arguments")
+        inputs.append(args)
+
+    common = dict(
+        NAME=function_name, MARKER=marker, LIMIT=str(CASE_OUTPUT_LIMIT),
+        MINMS=repr(float(max(min_time_ms, 0))), REPEATS=str(MAX_REPEATS),
+    )
+    template, values = builder(code, function_name, inputs, param_types)
+    return _fill(template, **values, **common)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  Results
+# ─────────────────────────────────────────────────────────────────────────────
+
+class CaseCollector:
+    """
+    `on_output` sink that keeps only the driver's per-case lines: those
+    with this run's `marker`, after the driver's start line. Indices
+    reported more than once end up in `duplicates`.
+    """
+
+    def __init__(self, marker: str):
+        self.marker = marker
+        self.records = {}
+        self.duplicates = set()
+        self._started = False
+        self._partial = ""
+
+    def feed(self, stream: str, text: str):
+        if stream != "stdout":
+            return
+        marker = self.marker
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        if not self._partial.startswith(marker[:len(self._partial)]):
+            self._partial = ""  # not a case line; don't let it grow
+        for line in lines:
+            if not line.startswith(marker):
+                continue
+            try:
+                record = json.loads(line[len(marker):])
+            except ValueError:
+                continue
+            if not isinstance(record, dict):
+                continue
+            if record.get("start") is True:
+                self._started = True
+            elif self._started:
+                index = record.get("index")
+                if index in self.records:
+                    self.duplicates.add(index)
+                else:
+                    self.records[index] = record
+
+
+def _equal(actual, expected) -> bool:
+    if isinstance(expected, float) or isinstance(actual, float):
+        try:
+            return math.isclose(float(actual), float(expected), rel_tol=1e-6, abs_tol=1e-9)
+        except (TypeError, ValueError):
+            return False
+    if isinstance(expected, list) and isinstance(actual, list):
+        return len(actual) == len(expected) and all(
+            _equal(a, e) for a, e in zip(actual, expected)
+        )
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return actual.keys() == expected.keys() and all(
+            _equal(actual[k], expected[k]) for k in expected
+        )
+    return actual == expected
+
+
+def collect_results(records: dict, test_cases, run_result: dict, duplicates=()) -> dict:
+    """
+    Merge driver records with the expected values into a report; cases in
+    `duplicates` fail.
+    """
+    cases = []
+    for i, case in enumerate(test_cases):
+        record = records.get(i)
+        entry = {
+            "index": i,
+            "input": case.get("input", []),
+            "expected": case.get("expected"),
+            "actual": None,
+            "passed": False,
+            "output": "",
+            "error": None,
+            "time_ms": None,
+            "repeats": None,
+            "max_rss_kb": None,
+        }
+        if i in duplicates:
+            entry["error"] = "Reported more than once; the solution printed result lines of its own"
+        elif record is None:
+            entry["error"] = "Not run: " + (run_result.get("stderr") or "program exited early").strip()
+        else:
+            entry["output"] = record.get("output", "")
+            entry["error"] = record.get("error")
+            entry["time_ms"] = record.get("time_ms")
+            entry["repeats"] = record.get("repeats")
+            entry["max_rss_kb"] = record.get("max_rss_kb")
+            if record.get("result") is not None:
+                try:
+                    entry["actual"] = json.loads(record["result"])
+                except ValueError:
+                    entry["actual"] = record["result"]
+                entry["passed"] = entry["error"] is None and _equal(entry["actual"], entry["expected"])
+        cases.append(entry)
+
+    return {
+        "passed": sum(c["passed"] for c in cases),
+        "total": len(cases),
+        "cases": cases,
+        "stderr": run_result.get("stderr", ""),
+        "exit_code": run_result.get("exit_code", 1),
+    }
@@ -0,0 +1,525 @@
+"""
+Language registry
+=================
+One strategy class per language. A strategy knows its aliases, which
+toolchain executables it needs, how to wrap a snippet into a complete
+program, how to build and run it and, through `driver`, how to build the
+test driver of harness.py.
+
+Toolchain paths and versions are resolved once by `probe_all()` at
+startup instead of on every request. A new language is one more
+`@register`ed class — here or in a plugin module listed in
+RUN_LANGUAGE_PLUGINS (comma-separated import names).
+"""
+
+import atexit
+import importlib
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import threading
+
+import harness
+from admission import AdmissionController
+from node_pool import NodePool
+from sandbox import Limits, run_limited
+from workspace import WorkspacePool, memfd_source
+
+# Resource limits for candidate programs (see sandbox.py)
+RUN_MEMORY_MB = int(os.environ.get("RUN_MEMORY_MB", "512"))
+RUN_NPROC = int(os.environ.get("RUN_NPROC", "64"))
+
+RUN_LIMITS = Limits(cpu_seconds=11, memory_mb=RUN_MEMORY_MB, nproc=RUN_NPROC, fsize_mb=16)
+# The JVM / CLR reserve large address ranges and spawn many threads, so
+# they get a heap flag instead of RLIMIT_AS and no process cap.
+VM_RUN_LIMITS = Limits(cpu_seconds=11, fsize_mb=16)
+COMPILE_LIMITS = Limits(cpu_seconds=30, fsize_mb=64)
+
+RUN_TIMEOUT = 10
+COMPILE_TIMEOUT = 15
+
+# JavaScript worker pool (see node_pool.py)
+NODE_POOL_SIZE = int(os.environ.get("NODE_POOL_SIZE", "2"))
+NODE_MAX_RUNS = int(os.environ.get("NODE_MAX_RUNS", "200"))
+NODE_MEMORY_MB = int(os.environ.get("NODE_MEMORY_MB", "256"))
+# CPU seconds over a worker's whole life; it is replaced before a job
+# could run out. The heap flag above stands in for RLIMIT_AS.
+NODE_WORKER_CPU_SECONDS = int(os.environ.get("NODE_WORKER_CPU_SECONDS", "300"))
+NODE_LIMITS = Limits(cpu_seconds=NODE_WORKER_CPU_SECONDS, nproc=RUN_NPROC, fsize_mb=16)
+
+# Scratch directories on tmpfs, reused between runs (see workspace.py)
+_workspaces = WorkspacePool(keep=int(os.environ.get("RUN_WORKSPACES_PER_LANGUAGE", "4")))
+atexit.register(_workspaces.close)
+
+# Concurrent compiles / runs and queue-time SLOs (see admission.py). The
+# caps are for the whole server: with MCP_WORKERS processes (server.py
+# --workers) each gets its share, at least one slot.
+_CPUS = os.cpu_count() or 2
+_WORKERS = max(1, int(os.environ.get("MCP_WORKERS", "1")))
+
+
+def _share(total: int) -> int:
+    return max(1, total // _WORKERS) if total > 0 else 0
+
+
+admission = AdmissionController(
+    compile_slots=_share(int(os.environ.get("RUN_MAX_COMPILES", str(max(1, _CPUS // 2))))),
+    run_slots=_share(int(os.environ.get("RUN_MAX_RUNS", str(_CPUS)))),
+    per_language=_share(int(os.environ.get("RUN_MAX_PER_LANGUAGE", "0"))),
+    # a JavaScript run needs an idle worker of this process's Node pool
+    run_caps={"javascript": NODE_POOL_SIZE},
+    slo={
+        "grade": float(os.environ.get("RUN_QUEUE_SLO_GRADE", "30")),
+        "run": float(os.environ.get("RUN_QUEUE_SLO_RUN", "5")),
+        "background": float(os.environ.get("RUN_QUEUE_SLO_BACKGROUND", "60")),
+    },
+)
+
+WINDOWS = platform.system() == "Windows"
+
+_REGISTRY = {}  # name -> Language
+_ALIASES = {}   # lowercase alias -> Language
+
+
+def register(cls):
+    """Class decorator: add a Language strategy to the registry."""
+    language = cls()
+    _REGISTRY[language.name] = language
+    for alias in (language.name, *language.aliases):
+        _ALIASES[alias] = language
+    return cls
+
+
+def get(language: str):
+    """Strategy for a language name or alias, or None."""
+    return _ALIASES.get(language.strip().lower())
+
+
+def names() -> list:
+    return list(_REGISTRY)
+
+
+def probe_all():
+    for language in _REGISTRY.values():
+        language.probe()
+
+
+def capabilities() -> list:
+    return [language.describe() for language in _REGISTRY.values()]
+
+
+def _which(*candidates: str, error: str) -> str:
+    for name in candidates:
+        found = shutil.which(name)
+        if found:
+            return found
+    raise FileNotFoundError(error)
+
+
+def _version(cmd) -> str:
+    """First line a toolchain prints for its version flag."""
+    try:
+        out = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+    lines = (out.stdout + out.stderr).strip().splitlines()
+    return lines[0] if lines else "unknown"
+
+
+def _output(result) -> dict:
+    return {
+        "stdout": result.stdout,
+        "stderr": result.stderr,
+        "exit_code": int(result.returncode),
+    }
+
+
+def _write(path: str, text: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _indent(code: str, prefix: str) -> str:
+    return "\n".join(prefix + line for line in code.splitlines())
+
+
+class Language:
+    """
+    Base strategy. Subclasses set `name` / `aliases` and implement
+    `resolve()` (toolchain paths, raising FileNotFoundError when missing),
+    `version_command()` and `execute()`; `wrap()` turns a snippet into a
+    complete program. `compile()` / `launch()` take admission slots.
+    `driver` is a harness.py driver builder; without one the language
+    can run code but not test suites.
+    """
+
+    name = ""
+    aliases = ()
+    driver = None
+
+    def __init__(self):
+        self.paths = {}
+        self.version = ""
+        self.error = None
+
+    def resolve(self) -> dict:
+        return {}
+
+    def version_command(self):
+        return None
+
+    def probe(self):
+        try:
+            self.paths = self.resolve()
+        except FileNotFoundError as e:
+            self.paths, self.version, self.error = {}, "", str(e)
+            return
+        self.error = None
+        cmd = self.version_command()
+        self.version = _version(cmd) if cmd else ""
+
+    def describe(self) -> dict:
+        return {
+            "name": self.name,
+            "aliases": list(self.aliases),
+            "available": self.error is None,
+            "tests": self.driver is not None,
+            "version": self.version,
+            "error": self.error,
+        }
+
+    def wrap(self, code: str) -> str:
+        return code
+
+    def run(self, code: str, on_output=None, wrap: bool = True, priority: str = "run") -> dict:
+        """
+        Build and run `code` in a pooled workspace. With `wrap=False` the
+        source is used verbatim (e.g. a harness.py driver). `priority` is
+        an admission.PRIORITIES key.
+        """
+        if self.error:
+            raise FileNotFoundError(self.error)
+        workspace = _workspaces.acquire(self.name)
+        try:
+            source = self.wrap(code) if wrap else code
+            return self.execute(workspace, source, on_output, priority)
+        finally:
+            _workspaces.release(self.name, workspace)
+
+    def execute(self, workspace: str, source: str, on_output, priority: str) -> dict:
+        raise NotImplementedError
+
+    def compile(self, cmd, priority: str):
+        """Run a compiler; the error dict to return if it failed, else None."""
+        with admission.slot("compile", self.name, priority):
+            result = run_limited(cmd, timeout=COMPILE_TIMEOUT, limits=COMPILE_LIMITS)
+        if result.returncode != 0:
+            return {"stdout": "", "stderr": result.stderr, "exit_code": result.returncode}
+        return None
+
+    def launch(self, cmd, priority: str, **kwargs) -> dict:
+        """Run the program under a run slot."""
+        with admission.slot("run", self.name, priority):
+            return _output(run_limited(cmd, timeout=RUN_TIMEOUT, **kwargs))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  Built-in languages
+# ─────────────────────────────────────────────────────────────────────────────
+
+@register
+class Python(Language):
+    name = "python"
+    driver = staticmethod(harness.python_driver)
+
+    def resolve(self):
+        return {"python": sys.executable}
+
+    def probe(self):
+        super().probe()
+        self.version = sys.version.split()[0]
+
+    def execute(self, workspace, source, on_output, priority):
+        # in-memory source where possible, else a file in the workspace
+        fd = memfd_source(source, "main.py")
+        if fd is not None:
+            path = f"/dev/fd/{fd}"
+        else:
+            path = os.path.join(workspace, "main.py")
+            _write(path, source)
+
+        try:
+            return self.launch(
+                [self.paths["python"], path], priority,
+                limits=RUN_LIMITS,
+                env={
+                    **os.environ,
+                    "PYTHONNOUSERSITE": "1",
+                    # flush prints immediately when streaming
+                    "PYTHONUNBUFFERED": "1" if on_output else "",
+                },
+                cwd=workspace,
+                on_output=on_output,
+                pass_fds=(fd,) if fd is not None else (),
+            )
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+
+@register
+class JavaScript(Language):
+    """Runs in an isolated vm context on a warm worker — no Node boot."""
+
+    name = "javascript"
+    driver = staticmethod(harness.javascript_driver)
+
+    def __init__(self):
+        super().__init__()
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def resolve(self):
+        return {"node": _which("node", error="node not found on PATH")}
+
+    def version_command(self):
+        return [self.paths["node"], "--version"]
+
+    def pool(self) -> NodePool:
+        """Start the Node worker pool on first use."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = NodePool(
+                    self.paths["node"],
+                    size=NODE_POOL_SIZE,
+                    max_runs=NODE_MAX_RUNS,
+                    memory_mb=NODE_MEMORY_MB,
+                    limits=NODE_LIMITS,
+                    job_cpu_seconds=RUN_LIMITS.cpu_seconds,
+                )
+                atexit.register(self._pool.shutdown)
+            return self._pool
+
+    def run(self, code, on_output=None, wrap=True, priority="run"):
+        if self.error:
+            raise FileNotFoundError(self.error)
+        with admission.slot("run", self.name, priority):
+            return self.pool().run(code, timeout=RUN_TIMEOUT, on_output=on_output)
+
+
+@register
+class Java(Language):
+    name = "java"
+    driver = staticmethod(harness.java_driver)
+
+    CLASS = re.compile(r"\bclass\s+\w+")
+    METHOD = re.compile(r"(public|private|protected|static)\s+\S+\s+\w+\s*\(")
+
+    METHODS_TEMPLATE = (
+        "import java.util.*;\n"
+        "public class Main {\n"
+        "{body}\n\n"
+        "    public static void main(String[] args) {\n"
+        "        Main sol = new Main();\n"
+        "        System.out.println(\"Solution loaded. Add test calls or submit.\");\n"
+        "    }\n"
+        "}\n"
+    )
+    STATEMENTS_TEMPLATE = (
+        "import java.util.*;\n"
+        "public class Main {\n"
+        "    public static void main(String[] args) {\n"
+        "{body}\n"
+        "    }\n}\n"
+    )
+
+    def resolve(self):
+        return {
+            "javac": _which("javac", error="javac not found on PATH"),
+            "java": _which("java", error="java not found on PATH"),
+        }
+
+    def version_command(self):
+        return [self.paths["java"], "-version"]
+
+    def wrap(self, code):
+        if self.CLASS.search(code):
+            return self.CLASS.sub("class Main", code, count=1)
+        if self.METHOD.search(code):
+            return self.METHODS_TEMPLATE.replace("{body}", _indent(code, "    "))
+        return self.STATEMENTS_TEMPLATE.replace("{body}", _indent(code, "        "))
+
+    def execute(self, workspace, source, on_output, priority):
+        java_path = os.path.join(workspace, "Main.java")
+        _write(java_path, source)
+
+        failed = self.compile([self.paths["javac"], java_path], priority)
+        if failed:
+            return failed
+
+        return self.launch(
+            [self.paths["java"], f"-Xmx{RUN_MEMORY_MB}m", "-cp", workspace, "Main"], priority,
+            limits=VM_RUN_LIMITS, cwd=workspace, on_output=on_output,
+        )
+
+
+@register
+class CSharp(Language):
+    name = "csharp"
+    aliases = ("c#", "cs")
+    driver = staticmethod(harness.csharp_driver)
+
+    CLASS = re.compile(r"\bclass\s+\w+")
+    METHOD = re.compile(r"(public|private|protected|static|internal)\s+\S+\s+\w+\s*\(")
+    NAMESPACE = re.compile(r"\bnamespace\s+\w+")
+
+    USINGS = (
+        "using System;\n"
+        "using System.Collections.Generic;\n"
+        "using System.Linq;\n\n"
+    )
+    CLASS_TEMPLATE = USINGS + (
+        "{body}\n\n"
+        "class Program {\n"
+        "    static void Main() {\n"
+        "        Console.WriteLine(\"Solution loaded. Add test calls or submit.\");\n"
+        "    }\n"
+        "}\n"
+    )
+    METHODS_TEMPLATE = USINGS + (
+        "class Solution {\n"
+        "{body}\n}\n\n"
+        "class Program {\n"
+        "    static void Main() {\n"
+        "        Solution sol = new Solution();\n"
+        "        Console.WriteLine(\"Solution loaded. Add test calls or submit.\");\n"
+        "    }\n"
+        "}\n"
+    )
+    STATEMENTS_TEMPLATE = USINGS + (
+        "class Program {\n"
+        "    static void Main() {\n"
+        "{body}\n"
+        "    }\n}\n"
+    )
+
+    def resolve(self):
+        """C# compiler: csc on Windows, mcs/csc on Linux/Mac."""
+        paths = {
+            "csc": _which(
+                "csc", "mcs", error="C# compiler not found. Install .NET SDK or Mono"
+            ),
+        }
+        for runtime in ("mono", "dotnet"):
+            found = shutil.which(runtime)
+            if found:
+                paths[runtime] = found
+        return paths
+
+    def version_command(self):
+        return [self.paths["csc"], "--version"]
+
+    def wrap(self, code):
+        has_class = bool(self.CLASS.search(code))
+        if self.NAMESPACE.search(code) or (has_class and "Main" in code):
+            return code  # full program
+        if has_class:
+            return self.CLASS_TEMPLATE.replace("{body}", code)
+        if self.METHOD.search(code):
+            return self.METHODS_TEMPLATE.replace("{body}", _indent(code, "    "))
+        return self.STATEMENTS_TEMPLATE.replace("{body}", _indent(code, "        "))
+
+    def execute(self, workspace, source, on_output, priority):
+        cs_path = os.path.join(workspace, "Program.cs")
+        exe_path = os.path.join(workspace, "Program.exe")
+        _write(cs_path, source)
+
+        flag = "/out:" if WINDOWS else "-out:"
+        failed = self.compile([self.paths["csc"], f"{flag}{exe_path}", cs_path], priority)
+        if failed:
+            return failed
+
+        if WINDOWS:
+            run_cmd = [exe_path]
+        elif "mono" in self.paths:
+            run_cmd = [self.paths["mono"], exe_path]
+        else:
+            run_cmd = [self.paths.get("dotnet", "dotnet"), exe_path.replace(".exe", ".dll")]
+
+        return self.launch(
+            run_cmd, priority,
+            limits=VM_RUN_LIMITS, cwd=workspace, on_output=on_output,
+        )
+
+
+@register
+class Cpp(Language):
+    name = "cpp"
+    aliases = ("c++", "cxx")
+    driver = staticmethod(harness.cpp_driver)
+
+    MAIN = re.compile(r"\bint\s+main\s*\(")
+    FUNCTION = re.compile(
+        r"\b(void|int|float|double|bool|char|string|auto)\s+\w+\s*\([^)]*\)\s*\{"
+    )
+
+    PRELUDE = (
+        "#include <iostream>\n"
+        "#include <vector>\n"
+        "#include <string>\n"
+        "#include <algorithm>\n"
+        "using namespace std;\n\n"
+    )
+    FUNCTIONS_TEMPLATE = PRELUDE + (
+        "{body}\n\n"
+        "int main() {\n"
+        "    cout << \"Solution loaded. Add test calls or submit.\" << endl;\n"
+        "    return 0;\n"
+        "}\n"
+    )
+    STATEMENTS_TEMPLATE = PRELUDE + (
+        "int main() {\n"
+        "{body}\n"
+        "    return 0;\n}\n"
+    )
+
+    def resolve(self):
+        """C++ compiler: g++ or clang++."""
+        return {
+            "compiler": _which(
+                "g++", "clang++", error="C++ compiler not found. Install g++ or clang++"
+            ),
+        }
+
+    def version_command(self):
+        return [self.paths["compiler"], "--version"]
+
+    def wrap(self, code):
+        if self.MAIN.search(code):
+            return self.PRELUDE + code
+        if self.FUNCTION.search(code):
+            return self.FUNCTIONS_TEMPLATE.replace("{body}", code)
+        return self.STATEMENTS_TEMPLATE.replace("{body}", _indent(code, "    "))
+
+    def execute(self, workspace, source, on_output, priority):
+        cpp_path = os.path.join(workspace, "main.cpp")
+        exe_path = os.path.join(workspace, "main.exe" if WINDOWS else "main")
+        _write(cpp_path, source)
+
+        failed = self.compile(
+            [self.paths["compiler"], cpp_path, "-o", exe_path, "-std=c++17"], priority
+        )
+        if failed:
+            return failed
+
+        return self.launch(
+            [exe_path], priority,
+            limits=RUN_LIMITS, cwd=workspace, on_output=on_output,
+        )
+
+
+for _plugin in filter(None, os.environ.get("RUN_LANGUAGE_PLUGINS", "").split(",")):
+    importlib.import_module(_plugin.strip())
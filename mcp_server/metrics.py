@@ -0,0 +1,58 @@
+"""
+Per-worker execution metrics
+============================
+Every worker process counts its own executions. With `--workers N` each
+`/health` or `worker_stats` response describes whichever worker answered
+it, identified by `pid`.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class WorkerMetrics:
+    """Thread-safe counters for one server process."""
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.started = time.time()
+        self.executions = 0
+        self.in_flight = 0
+        self.timeouts = 0
+        self.busy_seconds = 0.0
+        self.by_language = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self, language: str):
+        """Wrap one execution; the caller reports timeouts via `timed_out()`."""
+        start = time.monotonic()
+        with self._lock:
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            with self._lock:
+                self.in_flight -= 1
+                self.executions += 1
+                self.busy_seconds += elapsed
+                self.by_language[language] = self.by_language.get(language, 0) + 1
+
+    def timed_out(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "pid": self.pid,
+                "uptime_seconds": round(time.time() - self.started, 1),
+                "executions": self.executions,
+                "in_flight": self.in_flight,
+                "timeouts": self.timeouts,
+                "busy_seconds": round(self.busy_seconds, 2),
+                "by_language": dict(self.by_language),
+            }
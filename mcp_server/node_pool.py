@@ -0,0 +1,220 @@
+"""
+Persistent Node worker pool
+===========================
+Keeps a few long-lived `node` processes running `node_worker.js` so that a
+JavaScript submission costs a JSON round-trip instead of a Node boot.
+
+Each submission runs in its own `vm` context inside the worker. That keeps
+globals apart but is not a security boundary, so the worker process itself
+is the boundary:
+
+- It starts under sandbox.py's rlimits (CPU, processes, file size) in its
+  own session; the V8 heap flag (`memory_mb`) stands in for RLIMIT_AS.
+- Every job carries a random nonce, and only the result frame with that
+  nonce is accepted.
+- A worker is recycled after any job that fails, times out, requires a
+  module (those are shared with later jobs) or leaves the worker tainted
+  (it then exits instead of answering), after `max_runs` jobs, when it
+  dies, and before its CPU limit could cut a job short.
+"""
+
+import json
+import os
+import queue
+import secrets
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+
+from sandbox import OUTPUT_LIMIT, Limits, _preexec
+
+try:
+    _CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+except (AttributeError, ValueError, OSError):
+    _CLOCK_TICKS = None
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "node_worker.js")
+
+
+class NodeWorker:
+    """One `node node_worker.js` process speaking line-delimited JSON."""
+
+    def __init__(self, node: str, memory_mb: int, limits: Limits = None):
+        posix = os.name == "posix"
+        self.cwd = tempfile.mkdtemp(prefix="node-worker-")
+        self.proc = subprocess.Popen(
+            [node, f"--max-old-space-size={memory_mb}", WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+            cwd=self.cwd,
+            env={"PATH": os.environ.get("PATH", "")},
+            start_new_session=posix,
+            preexec_fn=_preexec(limits) if posix and limits else None,
+        )
+        self.runs = 0
+        self.tainted = False  # saw a frame that was not ours
+        self.recycle = False  # a job touched state shared with later jobs
+        self._frames: queue.Queue = queue.Queue()
+        threading.Thread(target=self._read_frames, daemon=True).start()
+
+    def _read_frames(self):
+        for line in self.proc.stdout:
+            try:
+                self._frames.put(json.loads(line))
+            except ValueError:
+                continue
+        self._frames.put(None)  # EOF → worker died
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def cpu_seconds(self):
+        """CPU time used so far (Linux /proc), or None if unknown."""
+        if _CLOCK_TICKS is None:
+            return None
+        try:
+            with open(f"/proc/{self.proc.pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            return None
+        # utime and stime, fields 14 and 15 of stat(5)
+        return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+
+    def execute(self, code: str, timeout: float, on_output=None) -> dict:
+        self.runs += 1
+        job_id = secrets.token_hex(16)
+        self.proc.stdin.write(
+            json.dumps({
+                "id": job_id,
+                "code": code,
+                "timeout": int(timeout * 1000),
+                "max_output": OUTPUT_LIMIT,
+                "stream": on_output is not None,
+            }) + "\n"
+        )
+        self.proc.stdin.flush()
+
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                frame = self._frames.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                raise subprocess.TimeoutExpired(WORKER_SCRIPT, timeout)
+
+            if frame is None:
+                exit_code = self.proc.wait()
+                if exit_code == 3:
+                    reason = "the submission modified the worker's runtime."
+                else:
+                    reason = "the memory limit may have been exceeded."
+                return {
+                    "stdout": "",
+                    "stderr": f"JavaScript worker crashed (exit code {exit_code}); {reason}",
+                    "exit_code": 1,
+                }
+            if frame.get("id") != job_id:
+                self.tainted = True
+                continue
+            if "output" in frame:
+                on_output(frame["output"], frame.get("text", ""))
+                continue
+            if frame.get("timed_out"):
+                raise subprocess.TimeoutExpired(WORKER_SCRIPT, timeout)
+            self.recycle = bool(frame.get("recycle"))
+
+            return {
+                "stdout": frame.get("stdout", ""),
+                "stderr": frame.get("stderr", ""),
+                "exit_code": int(frame.get("exit_code", 1)),
+            }
+
+    def kill(self):
+        try:
+            # the whole session, including anything the job spawned
+            if os.name == "posix":
+                os.killpg(self.proc.pid, signal.SIGKILL)
+            else:
+                self.proc.kill()
+            self.proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        try:
+            for name in os.listdir(self.cwd):
+                path = os.path.join(self.cwd, name)
+                if os.path.isfile(path):
+                    os.remove(path)
+            os.rmdir(self.cwd)
+        except OSError:
+            pass
+
+
+class NodePool:
+    """
+    Fixed-size pool of `NodeWorker`s; `run()` blocks while all are busy.
+    `limits.cpu_seconds` is the CPU budget of a worker's whole life; a
+    worker with less than `job_cpu_seconds` of it left is replaced first.
+    """
+
+    def __init__(
+        self,
+        node: str,
+        size: int = 2,
+        max_runs: int = 200,
+        memory_mb: int = 256,
+        limits: Limits = None,
+        job_cpu_seconds: float = 11,
+    ):
+        self.node = node
+        self.max_runs = max_runs
+        self.memory_mb = memory_mb
+        self.limits = limits
+        self.job_cpu_seconds = job_cpu_seconds
+        self._idle: queue.Queue = queue.Queue()
+        for _ in range(size):
+            self._idle.put(self._spawn())
+
+    def _spawn(self) -> NodeWorker:
+        return NodeWorker(self.node, self.memory_mb, self.limits)
+
+    def _has_cpu_left(self, worker: NodeWorker) -> bool:
+        if self.limits is None or self.limits.cpu_seconds is None:
+            return True
+        used = worker.cpu_seconds()
+        return used is None or self.limits.cpu_seconds - used >= self.job_cpu_seconds
+
+    def run(self, code: str, timeout: float = 10, on_output=None) -> dict:
+        worker = self._idle.get()
+        if not self._has_cpu_left(worker):
+            worker.kill()
+            worker = self._spawn()
+
+        healthy = False
+        try:
+            result = worker.execute(code, timeout, on_output)
+            # a failed job may have left the process in any state
+            healthy = (
+                result["exit_code"] == 0
+                and not worker.tainted
+                and not worker.recycle
+                and worker.alive()
+                and worker.runs < self.max_runs
+            )
+            return result
+        finally:
+            if not healthy:
+                worker.kill()
+                worker = self._spawn()
+            self._idle.put(worker)
+
+    def shutdown(self):
+        while True:
+            try:
+                self._idle.get_nowait().kill()
+            except queue.Empty:
+                break
@@ -0,0 +1,324 @@
+/*
+ * Persistent Node worker for the MCP code-runner.
+ *
+ * Reads one JSON job per line on stdin:
+ *   {"id": "<nonce>", "code": "...", "timeout": 10000, "max_output": 65536, "stream": false}
+ * Writes one JSON result per line on stdout:
+ *   {"id": "<nonce>", "stdout": "...", "stderr": "...", "exit_code": 0, "timed_out": false}
+ * With "stream": true every write is also sent as it happens:
+ *   {"id": "<nonce>", "output": "stdout", "text": "..."}
+ *
+ * Every job runs in a fresh vm context, so globals never leak between
+ * submissions. A vm context is not a security boundary, though: code can
+ * reach the host realm through any host function it is given. So the
+ * sandbox exposes no host `require` (only pure modules), the process runs
+ * under the same rlimits as other languages (see node_pool.py), and the
+ * host objects the result frames depend on are checked after every job.
+ * If any were replaced, the worker exits instead of answering, and the
+ * Python side starts a fresh one.
+ *
+ * The pure modules are the worker's own module objects, shared with every
+ * later job, so a job that requires one is answered with "recycle": true
+ * and its worker is replaced afterwards.
+ */
+
+const vm = require("vm");
+const fs = require("fs");
+const stream = require("stream");
+const util = require("util");
+const readline = require("readline");
+
+// Modules without I/O or process access that submissions may require
+const PURE_MODULES = new Set([
+  "assert",
+  "buffer",
+  "events",
+  "path",
+  "querystring",
+  "string_decoder",
+  "url",
+  "util",
+]);
+
+function safeRequire(name) {
+  const id = String(name).replace(/^node:/, "");
+  if (!PURE_MODULES.has(id)) {
+    throw new Error(`Cannot find module '${name}' (not available in the sandbox)`);
+  }
+  if (current) current.recycle = true;
+  return require(id);
+}
+
+// Taken before any job runs, so a job can't swap what its output goes through
+const format = util.format;
+const inspect = util.inspect;
+
+// Host functions the worker relies on to read jobs and write frames
+const INTEGRITY = [
+  [JSON, "stringify"],
+  [JSON, "parse"],
+  [fs, "writeSync"],
+  [process, "exit"],
+  [process, "reallyExit"],
+  [process.stdout, "write"],
+  [process.stdout, "_write"],
+  [process.stdout, "_writev"],
+  [process.stdout, "emit"],
+  [process.stdin, "emit"],
+  [stream.Writable.prototype, "write"],
+  [stream.Writable.prototype, "_write"],
+  [stream.Readable.prototype, "emit"],
+  [util, "format"],
+  [util, "inspect"],
+  [vm, "createContext"],
+  [vm, "runInContext"],
+];
+const pristine = INTEGRITY.map(([obj, key]) => obj[key]);
+const stdinListeners = () => process.stdin.listeners("data").concat(process.stdin.listeners("readable"));
+let pristineListeners = null;
+
+function intact() {
+  if (!INTEGRITY.every(([obj, key], i) => obj[key] === pristine[i])) return false;
+  const now = stdinListeners();
+  return now.length === pristineListeners.length && now.every((l, i) => l === pristineListeners[i]);
+}
+
+const exit = process.reallyExit.bind(process);
+const writeFrame = (() => {
+  const write = process.stdout.write.bind(process.stdout);
+  const stringify = JSON.stringify;
+  return (frame) => {
+    if (!intact()) exit(3); // tainted by a submission: never answer from it
+    write(stringify(frame) + "\n");
+  };
+})();
+
+class ExitSignal {
+  constructor(code) {
+    this.code = code;
+  }
+}
+
+/* Keeps the last `limit` characters written, like sandbox.RingBuffer. */
+class TailBuffer {
+  constructor(limit) {
+    this.limit = limit;
+    this.chunks = [];
+    this.size = 0;
+    this.dropped = 0;
+  }
+
+  push(s) {
+    this.chunks.push(s);
+    this.size += s.length;
+    while (this.size > this.limit) {
+      const over = this.size - this.limit;
+      const head = this.chunks[0];
+      if (head.length <= over) {
+        this.chunks.shift();
+        this.size -= head.length;
+        this.dropped += head.length;
+      } else {
+        this.chunks[0] = head.slice(over);
+        this.size -= over;
+        this.dropped += over;
+      }
+    }
+  }
+
+  value() {
+    const text = this.chunks.join("");
+    if (!this.dropped) return text;
+    return `[... ${this.dropped} bytes of output truncated ...]\n` + text;
+  }
+}
+
+let current = null;
+
+function formatError(err) {
+  if (err && err.stack) return String(err.stack);
+  return String(err);
+}
+
+function fail(job, err) {
+  if (err instanceof ExitSignal) {
+    job.exitCode = err.code;
+  } else {
+    emit(job, "stderr", formatError(err) + "\n");
+    job.exitCode = 1;
+  }
+  job.finish();
+}
+
+function emit(job, name, text) {
+  job[name].push(text);
+  if (job.stream) {
+    writeFrame({ id: job.id, output: name, text });
+  }
+}
+
+function makeSandbox(job) {
+  // console goes through process.stdout/stderr.write, as in Node
+  const out = (...args) => sandbox.process.stdout.write(format(...args) + "\n");
+  const err = (...args) => sandbox.process.stderr.write(format(...args) + "\n");
+
+  const track = (handle, clear) => {
+    job.pending.set(handle, clear);
+    return handle;
+  };
+  const untrack = (handle) => {
+    job.pending.delete(handle);
+    if (job.pending.size === 0 && job.onIdle) job.onIdle();
+  };
+  const guard = (fn, args) => {
+    if (job.done) return;
+    try {
+      fn(...args);
+    } catch (e) {
+      fail(job, e);
+    }
+  };
+
+  const sandbox = {
+    console: {
+      log: out,
+      info: out,
+      debug: out,
+      error: err,
+      warn: err,
+      dir: (obj) => sandbox.process.stdout.write(inspect(obj) + "\n"),
+    },
+    setTimeout: (fn, ms, ...args) => {
+      const h = setTimeout(() => {
+        guard(fn, args);
+        untrack(h);
+      }, ms);
+      return track(h, clearTimeout);
+    },
+    clearTimeout: (h) => {
+      clearTimeout(h);
+      untrack(h);
+    },
+    setInterval: (fn, ms, ...args) => track(setInterval(() => guard(fn, args), ms), clearInterval),
+    clearInterval: (h) => {
+      clearInterval(h);
+      untrack(h);
+    },
+    setImmediate: (fn, ...args) => {
+      const h = setImmediate(() => {
+        guard(fn, args);
+        untrack(h);
+      });
+      return track(h, clearImmediate);
+    },
+    clearImmediate: (h) => {
+      clearImmediate(h);
+      untrack(h);
+    },
+    queueMicrotask: (fn) => queueMicrotask(() => guard(fn, [])),
+    process: {
+      argv: ["node", "main.js"],
+      env: {},
+      platform: process.platform,
+      version: process.version,
+      versions: process.versions,
+      hrtime: process.hrtime,
+      memoryUsage: process.memoryUsage,
+      nextTick: (fn, ...args) => process.nextTick(() => guard(fn, args)),
+      exit: (code = 0) => {
+        throw new ExitSignal(code);
+      },
+      stdout: { write: (s) => emit(job, "stdout", String(s)) || true },
+      stderr: { write: (s) => emit(job, "stderr", String(s)) || true },
+    },
+    require: safeRequire,
+    URL,
+    URLSearchParams,
+    TextEncoder,
+    TextDecoder,
+    structuredClone,
+  };
+  sandbox.module = { exports: {} };
+  sandbox.exports = sandbox.module.exports;
+  sandbox.global = sandbox;
+  sandbox.globalThis = sandbox;
+  return sandbox;
+}
+
+async function runJob(msg) {
+  const job = {
+    id: msg.id,
+    stream: Boolean(msg.stream),
+    stdout: new TailBuffer(msg.max_output || 65536),
+    stderr: new TailBuffer(msg.max_output || 65536),
+    exitCode: 0,
+    timedOut: false,
+    pending: new Map(),
+    onIdle: null,
+    done: false,
+    recycle: false,
+  };
+
+  const finished = new Promise((resolve) => {
+    job.finish = () => {
+      if (job.done) return;
+      job.done = true;
+      for (const [h, clear] of job.pending) clear(h);
+      job.pending.clear();
+      resolve();
+    };
+  });
+  current = job;
+
+  try {
+    const context = vm.createContext(makeSandbox(job));
+    const value = vm.runInContext(msg.code, context, {
+      filename: "main.js",
+      timeout: msg.timeout,
+    });
+    if (value && typeof value.then === "function") {
+      value.then(undefined, (e) => fail(job, e));
+    }
+  } catch (e) {
+    if (e && e.code === "ERR_SCRIPT_EXECUTION_TIMEOUT") {
+      job.timedOut = true;
+      job.finish();
+    } else {
+      fail(job, e);
+    }
+  }
+
+  // Let pending microtasks and tracked timers drain before reporting.
+  while (!job.done) {
+    await new Promise((r) => setImmediate(r));
+    if (job.done || job.pending.size === 0) break;
+    await Promise.race([finished, new Promise((r) => (job.onIdle = r))]);
+    job.onIdle = null;
+  }
+  job.finish();
+  current = null;
+
+  writeFrame({
+    id: msg.id,
+    stdout: job.stdout.value(),
+    stderr: job.stderr.value(),
+    exit_code: job.exitCode,
+    timed_out: job.timedOut,
+    recycle: job.recycle,
+  });
+}
+
+process.on("unhandledRejection", (reason) => {
+  if (current && !current.done) fail(current, reason);
+});
+process.on("uncaughtException", (e) => {
+  if (current && !current.done) fail(current, e);
+});
+
+let queue = Promise.resolve();
+readline.createInterface({ input: process.stdin, terminal: false }).on("line", (line) => {
+  if (!line.trim()) return;
+  const msg = JSON.parse(line);
+  queue = queue.then(() => runJob(msg));
+});
+pristineListeners = stdinListeners();
@@ -0,0 +1,175 @@
+"""
+Empirical complexity profiling
+==============================
+Runs a solution on generated inputs of increasing size — in one harness
+process, so compiled languages build once — and fits the wall times
+against common growth models. Each size is called repeatedly for
+MIN_TIME_MS and timed by its median call, so one slow call (GC, JIT,
+a busy host) doesn't bend the curve.
+
+A model only counts if its own growth over the measured sizes is close
+to the log-log slope of the times; the result is "inconclusive" when no
+model is, or when the best one leaves most of the variation unexplained
+(times too flat or noisy to tell).
+
+Inputs are generated from the neutral parameter types used by harness.py.
+Arrays and strings get length n (2-D arrays ~n cells). When a function
+takes only scalars, integer parameters are set to n itself (e.g. fib(n)).
+
+Memory is the process's peak RSS after each size (`process_peak_rss_kb`).
+It only ever grows within a run, so it bounds the largest size's use
+rather than measuring each size on its own.
+"""
+
+import math
+import random
+
+from harness import parse_type
+
+DEFAULT_SIZES = [1000, 2000, 4000, 8000, 16000, 32000]
+
+# Largest size a language's driver can hold: Java argument literals live
+# in methods limited to 64 KB of bytecode
+MAX_SIZE = {"java": 4000}
+
+# Wall time each size is repeated for
+MIN_TIME_MS = 50
+
+INCONCLUSIVE = "inconclusive"
+
+MODELS = [
+    ("O(1)", lambda n: 1.0),
+    ("O(log n)", lambda n: math.log2(n)),
+    ("O(n)", lambda n: float(n)),
+    ("O(n log n)", lambda n: n * math.log2(n)),
+    ("O(n^2)", lambda n: float(n) ** 2),
+    ("O(n^3)", lambda n: float(n) ** 3),
+]
+
+# a more complex model must beat the simpler one's error by this factor
+_IMPROVEMENT = 0.8
+# how far a model's log-log slope may be from the measured one
+_SLOPE_TOLERANCE = 0.35
+# share of the time variation the chosen model must explain
+_MIN_R2 = 0.9
+
+
+def default_sizes(*languages):
+    """DEFAULT_SIZES, scaled down to the smallest MAX_SIZE of `languages`."""
+    largest = min(MAX_SIZE.get(lang.strip().lower(), DEFAULT_SIZES[-1]) for lang in languages)
+    scale = min(largest / DEFAULT_SIZES[-1], 1.0)
+    return [max(1, int(n * scale)) for n in DEFAULT_SIZES]
+
+
+def _value(base: str, depth: int, n: int, scalars_are_size: bool, rng: random.Random):
+    if depth == 0:
+        if base in ("int", "long"):
+            return n if scalars_are_size else rng.randint(0, n)
+        if base == "double":
+            return rng.uniform(0, n)
+        if base == "bool":
+            return rng.random() < 0.5
+        return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(n))
+    if depth == 1:
+        if base == "string":
+            return [_value(base, 0, 8, False, rng) for _ in range(n)]
+        return [_value(base, 0, n, False, rng) for _ in range(n)]
+    side = max(1, int(math.sqrt(n)))
+    return [_value(base, depth - 1, side, False, rng) for _ in range(side)]
+
+
+def generate_cases(param_types, sizes, seed: int = 0):
+    """One harness test case per size, deterministic for a given seed."""
+    parsed = [parse_type(t) for t in param_types]
+    scalars_are_size = all(depth == 0 and base != "string" for base, depth in parsed)
+    rng = random.Random(seed)
+    return [
+        {"input": [_value(base, depth, n, scalars_are_size, rng) for base, depth in parsed]}
+        for n in sizes
+    ]
+
+
+def _fit(xs, ys):
+    """
+    Least-squares y = a + b·x on relative errors (weights 1/y², timing
+    noise is proportional to the time); returns the weighted sum of
+    squared errors.
+    """
+    ws = [1 / (y * y) for y in ys]
+    total = sum(ws)
+    mx = sum(w * x for w, x in zip(ws, xs)) / total
+    my = sum(w * y for w, y in zip(ws, ys)) / total
+    sxx = sum(w * (x - mx) ** 2 for w, x in zip(ws, xs))
+    if sxx == 0:
+        return sum(w * (y - my) ** 2 for w, y in zip(ws, ys))
+    b = max(sum(w * (x - mx) * (y - my) for w, x, y in zip(ws, xs, ys)) / sxx, 0.0)
+    a = my - b * mx
+    return sum(w * (y - a - b * x) ** 2 for w, x, y in zip(ws, xs, ys))
+
+
+def _slope(ns, ys):
+    """Least-squares slope of log y against log n."""
+    lx = [math.log(n) for n in ns]
+    ly = [math.log(y) for y in ys]
+    mx, my = sum(lx) / len(lx), sum(ly) / len(ly)
+    sxx = sum((x - mx) ** 2 for x in lx)
+    return sum((x - mx) * (y - my) for x, y in zip(lx, ly)) / sxx if sxx else 0.0
+
+
+def estimate_complexity(points):
+    """
+    Pick the growth model that best explains time vs n among those whose
+    order agrees with the log-log slope, which is also returned as a raw
+    exponent. Needs at least three measured sizes.
+    """
+    points = [p for p in points if p.get("time_ms") is not None]
+    if len(points) < 3:
+        return {"complexity": None, "exponent": None}
+
+    ns = [p["n"] for p in points]
+    ts = [max(p["time_ms"], 1e-6) for p in points]
+    slope = _slope(ns, ts)
+    total = _fit([1.0] * len(ts), ts)  # the error of a flat line
+
+    best, best_sse = None, None
+    for name, f in MODELS:
+        ys = [f(n) for n in ns]
+        if abs(_slope(ns, ys) - slope) > _SLOPE_TOLERANCE:
+            continue
+        sse = _fit(ys, ts)
+        if best is None or sse < best_sse * _IMPROVEMENT:
+            best, best_sse = name, sse
+
+    # O(1) explains nothing by construction; its slope check is the test
+    if best is None or (best != "O(1)" and total and 1 - best_sse / total < _MIN_R2):
+        best = INCONCLUSIVE
+    return {"complexity": best, "exponent": round(slope, 2)}
+
+
+def summarize(sizes, report: dict) -> dict:
+    """Turn a harness report for `generate_cases(sizes)` into a profile."""
+    points = []
+    for n, case in zip(sizes, report.get("cases", [])):
+        points.append({
+            "n": n,
+            "time_ms": case["time_ms"] if case["error"] is None else None,
+            "repeats": case.get("repeats"),
+            "process_peak_rss_kb": case.get("max_rss_kb"),
+            "error": case["error"],
+        })
+    return {"points": points, **estimate_complexity(points)}
+
+
+def compare(candidate: dict, reference: dict) -> dict:
+    """Slowdown at the largest size both finished, and whether models agree."""
+    ref_times = {p["n"]: p["time_ms"] for p in reference["points"] if p["time_ms"]}
+    common = [p for p in candidate["points"] if p["time_ms"] and p["n"] in ref_times]
+    slowdown = None
+    if common:
+        largest = common[-1]
+        slowdown = round(largest["time_ms"] / ref_times[largest["n"]], 2)
+    matches = None
+    conclusive = {None, INCONCLUSIVE}.isdisjoint({candidate["complexity"], reference["complexity"]})
+    if conclusive:
+        matches = candidate["complexity"] == reference["complexity"]
+    return {"slowdown": slowdown, "complexity_matches": matches}
@@ -0,0 +1,118 @@
+"""
+Execution result cache
+======================
+Candidates often press Run several times on unchanged code, and grading
+re-runs what was just run. Deterministic executions are cached here and
+returned without starting a process.
+
+The key is a hash of the language, the normalized source, the program's
+inputs (test cases for `run_tests`; runs get no stdin) and the runtime
+version, so a toolchain upgrade never serves stale results. Entries are
+kept as JSON and evicted least-recently-used once `max_bytes` is reached.
+
+Sources that look non-deterministic (clocks, randomness, threads,
+environment, object identity) are never cached.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+
+# Identifiers that make output depend on more than the source and input.
+# Matching is deliberately broad: a false positive only costs a real run.
+NONDETERMINISTIC = re.compile(
+    r"\b("
+    r"random|Random|rand|srand|randint|shuffle|urandom|secrets|uuid|Guid|"
+    r"time|clock|datetime|Date|DateTime|Stopwatch|nanoTime|currentTimeMillis|"
+    r"perf_counter|monotonic|hrtime|performance|chrono|"
+    r"Thread|threading|multiprocessing|asyncio|Task|Parallel|"
+    r"environ|getenv|Environment|getpid|id|hash|hashCode|GetHashCode"
+    r")\b"
+)
+
+
+def normalize_source(code: str) -> str:
+    """Ignore line endings, trailing whitespace and surrounding blank lines."""
+    lines = code.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip("\n")
+
+
+def is_deterministic(code: str) -> bool:
+    return NONDETERMINISTIC.search(code) is None
+
+
+class ResultCache:
+    """Thread-safe, byte-bounded LRU of tool results."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+
+    def key(self, language: str, code: str, inputs, runtime: str):
+        """
+        Cache key for one execution, or None when the run must not be
+        cached (cache disabled or source looks non-deterministic).
+        `language` is the registry name, so aliases share entries.
+        """
+        if self.max_bytes <= 0 or not is_deterministic(code):
+            with self._lock:
+                self.bypassed += 1
+            return None
+
+        digest = hashlib.sha256()
+        for part in (language, runtime, normalize_source(code), json.dumps(inputs, sort_keys=True)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key):
+        if key is None:
+            return None
+        with self._lock:
+            raw = self._entries.get(key)
+            if raw is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return json.loads(raw)
+
+    def put(self, key, result: dict):
+        if key is None:
+            return
+        raw = json.dumps(result).encode("utf-8")
+        size = len(raw)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._entries[key] = raw
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,155 @@
+"""
+Bounded subprocess execution
+============================
+Drop-in replacement for `subprocess.run(..., capture_output=True, text=True)`
+used by the code-runner.
+
+- stdout / stderr are read in chunks into fixed-size ring buffers, so a
+  runaway `while True: print(...)` costs at most `output_limit` bytes of
+  server memory per stream. The tail is kept and a truncation marker is
+  prepended.
+- An optional `on_output(stream, text)` callback sees every chunk as it is
+  read, for callers that stream output live.
+- On POSIX the child runs under `setrlimit` limits (CPU, address space,
+  processes, file size) in its own session, so a timeout kills the whole
+  process group.
+"""
+
+import codecs
+import os
+import signal
+import subprocess
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+OUTPUT_LIMIT = int(os.environ.get("RUN_OUTPUT_LIMIT", str(64 * 1024)))
+CHUNK_SIZE = 4096
+
+
+@dataclass
+class Limits:
+    """Per-process resource limits; `None` leaves the limit untouched."""
+    cpu_seconds: Optional[int] = None
+    memory_mb: Optional[int] = None
+    nproc: Optional[int] = None
+    fsize_mb: Optional[int] = None
+
+
+class RingBuffer:
+    """Keeps the last `limit` bytes written to it."""
+
+    def __init__(self, limit: int = OUTPUT_LIMIT):
+        self.limit = limit
+        self.dropped = 0
+        self._buf = bytearray()
+
+    def write(self, data: bytes):
+        self._buf += data
+        over = len(self._buf) - self.limit
+        if over > 0:
+            del self._buf[:over]
+            self.dropped += over
+
+    def getvalue(self) -> str:
+        text = self._buf.decode("utf-8", errors="replace")
+        if self.dropped:
+            text = f"[... {self.dropped} bytes of output truncated ...]\n" + text
+        return text
+
+
+def _preexec(limits: Limits):
+    def apply():
+        if limits.cpu_seconds is not None:
+            # hard limit one second later so SIGXCPU (not SIGKILL) arrives first
+            resource.setrlimit(resource.RLIMIT_CPU, (limits.cpu_seconds, limits.cpu_seconds + 1))
+        if limits.memory_mb is not None:
+            size = limits.memory_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (size, size))
+        if limits.nproc is not None:
+            resource.setrlimit(resource.RLIMIT_NPROC, (limits.nproc, limits.nproc))
+        if limits.fsize_mb is not None:
+            size = limits.fsize_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_FSIZE, (size, size))
+    return apply
+
+
+def _drain(stream, sink: RingBuffer, name: str, on_output):
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    # read1 returns as soon as some bytes are available, so output is
+    # forwarded while the program is still running
+    for chunk in iter(lambda: stream.read1(CHUNK_SIZE), b""):
+        sink.write(chunk)
+        if on_output is not None:
+            text = decoder.decode(chunk)
+            if text:
+                on_output(name, text)
+    stream.close()
+
+
+def _kill_group(proc: subprocess.Popen):
+    try:
+        if resource is not None:
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except (OSError, ProcessLookupError):
+        pass
+
+
+def run_limited(
+    cmd,
+    timeout: float,
+    limits: Optional[Limits] = None,
+    env=None,
+    cwd=None,
+    output_limit: int = OUTPUT_LIMIT,
+    on_output=None,
+    pass_fds=(),
+) -> subprocess.CompletedProcess:
+    """
+    Run `cmd` with bounded output and resource limits.
+
+    Raises `subprocess.TimeoutExpired` on wall-clock timeout or when the
+    CPU limit is hit, just like `subprocess.run`.
+    """
+    posix = resource is not None
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+        cwd=cwd,
+        pass_fds=pass_fds,
+        start_new_session=posix,
+        preexec_fn=_preexec(limits) if posix and limits else None,
+    )
+
+    out, err = RingBuffer(output_limit), RingBuffer(output_limit)
+    readers = [
+        threading.Thread(target=_drain, args=(proc.stdout, out, "stdout", on_output), daemon=True),
+        threading.Thread(target=_drain, args=(proc.stderr, err, "stderr", on_output), daemon=True),
+    ]
+    for t in readers:
+        t.start()
+
+    try:
+        proc.wait(timeout=timeout)
+    finally:
+        # also reaps anything the program left running in the background
+        _kill_group(proc)
+        proc.wait()
+        for t in readers:
+            # a detached grandchild may still hold the pipe open
+            t.join(timeout=1)
+
+    if posix and proc.returncode == -signal.SIGXCPU:
+        raise subprocess.TimeoutExpired(cmd, timeout)
+
+    return subprocess.CompletedProcess(cmd, proc.returncode, out.getvalue(), err.getvalue())
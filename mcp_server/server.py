@@ -3,19 +3,27 @@ MCP Code-Runner Server
 ======================
 Runs as a standalone HTTP server on port 8001.
 Start it with:  python server.py
+Multi-process:  python server.py --workers 4   (or MCP_WORKERS=4)
 MCP endpoint:   http://127.0.0.1:8001/mcp
+Health check:   http://127.0.0.1:8001/health
 
 Supported languages: python, javascript, java, csharp, cpp
 """
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import FastMCP, Context
+import asyncio
+import json
 import subprocess
-import tempfile
-import shutil
 import os
-import sys
 import traceback
-import platform
+
+from admission import Saturated
+from harness import CaseCollector, build_driver, collect_results, new_marker
+import languages
+from metrics import WorkerMetrics
+import profiler
+from result_cache import ResultCache
+from sandbox import OUTPUT_LIMIT
 
 mcp = FastMCP(
     "code-runner",
@@ -24,331 +32,301 @@ mcp = FastMCP(
     stateless_http=True,
 )
 
-# ─────────────────────────────────────────────────────────────────────────────
-#  Compiler/Runtime Finders
-# ─────────────────────────────────────────────────────────────────────────────
-
-def _find_node() -> str:
-    found = shutil.which("node")
-    if not found:
-        raise FileNotFoundError("node not found on PATH")
-    return found
-
-def _find_java() -> str:
-    found = shutil.which("java")
-    if not found:
-        raise FileNotFoundError("java not found on PATH")
-    return found
-
-def _find_javac() -> str:
-    found = shutil.which("javac")
-    if not found:
-        raise FileNotFoundError("javac not found on PATH")
-    return found
-
-def _find_csc() -> str:
-    """Find C# compiler (csc on Windows, mcs/csc on Linux/Mac)"""
-    found = shutil.which("csc") or shutil.which("mcs")
-    if not found:
-        raise FileNotFoundError(
-            "C# compiler not found. Install .NET SDK or Mono"
-        )
-    return found
-
-def _find_cpp_compiler() -> str:
-    """Find C++ compiler (g++ or clang++)"""
-    found = shutil.which("g++") or shutil.which("clang++")
-    if not found:
-        raise FileNotFoundError(
-            "C++ compiler not found. Install g++ or clang++"
-        )
-    return found
+# Deterministic run results (see result_cache.py); 0 disables the cache
+RUN_CACHE_MB = float(os.environ.get("RUN_CACHE_MB", "32"))
+_result_cache = ResultCache(max_bytes=int(RUN_CACHE_MB * 1024 * 1024))
+
+# Results caused by load or the host rather than the program
+TIMEOUT_MESSAGE = "Execution timed out after 10 seconds."
+_TRANSIENT_ERRORS = (TIMEOUT_MESSAGE, "JavaScript worker crashed", "Code runner is busy")
+
+# Worker processes sharing the port (see __main__); each has its own
+# Node pool, result cache and metrics.
+MCP_WORKERS = int(os.environ.get("MCP_WORKERS", "1"))
+# Seconds a stopping worker waits for in-flight runs (compile + run fits)
+MCP_DRAIN_SECONDS = int(os.environ.get("MCP_DRAIN_SECONDS", "30"))
+
+_metrics = WorkerMetrics()
+
+# Toolchain paths and versions, resolved once per process
+languages.probe_all()
+
+
+def _cache_key(language: str, code: str, inputs, use_cache: bool):
+    """Keyed by the registry name, so aliases share entries, and the toolchain version."""
+    if not use_cache:
+        return None
+    strategy = languages.get(language)
+    if strategy is None:
+        return _result_cache.key(language.strip().lower(), code, inputs, "")
+    return _result_cache.key(strategy.name, code, inputs, strategy.version)
+
+
+def _cache_put(key, result: dict):
+    stderr = result.get("stderr") or ""
+    if not any(message in stderr for message in _TRANSIENT_ERRORS):
+        _result_cache.put(key, result)
 
 
 @mcp.tool()
-def run_code(language: str, code: str) -> dict:
+def run_code(language: str, code: str, cache: bool = True, priority: str = "run") -> dict:
     """
     Execute candidate code in a subprocess.
+
+    Deterministic programs are answered from the result cache when the
+    same source already ran on this runtime; pass cache=False to force a
+    fresh run. `priority` ("grade", "run" or "background") orders the
+    admission queue; when the server is saturated the result carries
+    `retry_after` seconds instead of output.
     """
-    lang = language.strip().lower()
-    files_to_cleanup = []
+    key = _cache_key(language, code, None, cache)
+    result = _result_cache.get(key)
+    if result is None:
+        result = _run(language, code, priority=priority)
+        _cache_put(key, result)
+    return result
 
-    try:
-        import re
-
-        # ── PYTHON ────────────────────────────────────────────────────────
-        if lang == "python":
-            with tempfile.NamedTemporaryFile(
-                delete=False, suffix=".py", mode="w", encoding="utf-8"
-            ) as f:
-                f.write(code)
-                path = f.name
-            files_to_cleanup.append(path)
-
-            result = subprocess.run(
-                [sys.executable, path],
-                capture_output=True, text=True, timeout=10,
-                env={**os.environ, "PYTHONNOUSERSITE": "1"},
-            )
-
-        # ── JAVASCRIPT ────────────────────────────────────────────────────
-        elif lang == "javascript":
-            node = _find_node()
-
-            with tempfile.NamedTemporaryFile(
-                delete=False, suffix=".js", mode="w", encoding="utf-8"
-            ) as f:
-                f.write(code)
-                path = f.name
-            files_to_cleanup.append(path)
-
-            result = subprocess.run(
-                [node, path],
-                capture_output=True, text=True, timeout=10,
-            )
-
-        # ── JAVA ──────────────────────────────────────────────────────────
-        elif lang == "java":
-            javac = _find_javac()
-            java  = _find_java()
-
-            tmp_dir = tempfile.mkdtemp()
-            files_to_cleanup.append(tmp_dir)
-            java_path = os.path.join(tmp_dir, "Main.java")
-
-            has_class    = bool(re.search(r'\bclass\s+\w+', code))
-            has_method   = bool(re.search(
-                r'(public|private|protected|static)\s+\S+\s+\w+\s*\(', code
-            ))
-
-            if has_class:
-                wrapped = re.sub(r'\bclass\s+\w+', 'class Main', code, count=1)
-            elif has_method:
-                wrapped = (
-                    "import java.util.*;\n"
-                    "public class Main {\n"
-                    + "\n".join("    " + line for line in code.splitlines())
-                    + "\n\n"
-                    "    public static void main(String[] args) {\n"
-                    "        Main sol = new Main();\n"
-                    "        System.out.println(\"Solution loaded. Add test calls or submit.\");\n"
-                    "    }\n"
-                    "}\n"
-                )
-            else:
-                wrapped = (
-                    "import java.util.*;\n"
-                    "public class Main {\n"
-                    "    public static void main(String[] args) {\n"
-                    + "\n".join("        " + line for line in code.splitlines())
-                    + "\n    }\n}\n"
-                )
 
-            with open(java_path, "w", encoding="utf-8") as f:
-                f.write(wrapped)
-
-            compile_result = subprocess.run(
-                [javac, java_path],
-                capture_output=True, text=True, timeout=15,
-            )
-
-            if compile_result.returncode != 0:
-                return {
-                    "stdout": "",
-                    "stderr": compile_result.stderr,
-                    "exit_code": compile_result.returncode,
-                }
-
-            result = subprocess.run(
-                [java, "-cp", tmp_dir, "Main"],
-                capture_output=True, text=True, timeout=10,
-            )
-
-        # ── C# ────────────────────────────────────────────────────────────
-        elif lang in ("csharp", "c#", "cs"):
-            csc = _find_csc()
-            
-            tmp_dir = tempfile.mkdtemp()
-            files_to_cleanup.append(tmp_dir)
-            cs_path = os.path.join(tmp_dir, "Program.cs")
-            exe_path = os.path.join(tmp_dir, "Program.exe")
-
-            # Detect what was written
-            has_class = bool(re.search(r'\bclass\s+\w+', code))
-            has_method = bool(re.search(
-                r'(public|private|protected|static|internal)\s+\S+\s+\w+\s*\(', code
-            ))
-            has_namespace = bool(re.search(r'\bnamespace\s+\w+', code))
-
-            if has_namespace or (has_class and 'Main' in code):
-                # Full program - use as-is
-                wrapped = code
-            elif has_class:
-                # Has class but no Main - wrap in namespace and add Main
-                wrapped = (
-                    "using System;\n"
-                    "using System.Collections.Generic;\n"
-                    "using System.Linq;\n\n"
-                    + code + "\n\n"
-                    "class Program {\n"
-                    "    static void Main() {\n"
-                    "        Console.WriteLine(\"Solution loaded. Add test calls or submit.\");\n"
-                    "    }\n"
-                    "}\n"
-                )
-            elif has_method:
-                # Method(s) only - wrap in class with Main
-                wrapped = (
-                    "using System;\n"
-                    "using System.Collections.Generic;\n"
-                    "using System.Linq;\n\n"
-                    "class Solution {\n"
-                    + "\n".join("    " + line for line in code.splitlines())
-                    + "\n}\n\n"
-                    "class Program {\n"
-                    "    static void Main() {\n"
-                    "        Solution sol = new Solution();\n"
-                    "        Console.WriteLine(\"Solution loaded. Add test calls or submit.\");\n"
-                    "    }\n"
-                    "}\n"
-                )
-            else:
-                # Bare statements - wrap in Main
-                wrapped = (
-                    "using System;\n"
-                    "using System.Collections.Generic;\n"
-                    "using System.Linq;\n\n"
-                    "class Program {\n"
-                    "    static void Main() {\n"
-                    + "\n".join("        " + line for line in code.splitlines())
-                    + "\n    }\n}\n"
-                )
+@mcp.tool()
+async def run_code_stream(
+    language: str, code: str, ctx: Context, cache: bool = True, priority: str = "run"
+) -> dict:
+    """
+    Execute candidate code and stream its output while it runs.
 
-            with open(cs_path, "w", encoding="utf-8") as f:
-                f.write(wrapped)
-
-            # Compile
-            compile_cmd = [csc, f"/out:{exe_path}", cs_path]
-            if platform.system() != "Windows":
-                compile_cmd = [csc, f"-out:{exe_path}", cs_path]
-            
-            compile_result = subprocess.run(
-                compile_cmd,
-                capture_output=True, text=True, timeout=15,
-            )
-
-            if compile_result.returncode != 0:
-                return {
-                    "stdout": "",
-                    "stderr": compile_result.stderr,
-                    "exit_code": compile_result.returncode,
-                }
-
-            # Run
-            run_cmd = [exe_path] if platform.system() == "Windows" else ["mono", exe_path]
-            if platform.system() != "Windows" and not shutil.which("mono"):
-                run_cmd = ["dotnet", exe_path.replace(".exe", ".dll")]
-            
-            result = subprocess.run(
-                run_cmd,
-                capture_output=True, text=True, timeout=10,
-            )
-
-        # ── C++ ───────────────────────────────────────────────────────────
-        elif lang in ("cpp", "c++", "cxx"):
-            compiler = _find_cpp_compiler()
-            
-            tmp_dir = tempfile.mkdtemp()
-            files_to_cleanup.append(tmp_dir)
-            cpp_path = os.path.join(tmp_dir, "main.cpp")
-            exe_path = os.path.join(tmp_dir, "main.exe" if platform.system() == "Windows" else "main")
-
-            # Detect what was written
-            has_main = bool(re.search(r'\bint\s+main\s*\(', code))
-            has_function = bool(re.search(
-                r'\b(void|int|float|double|bool|char|string|auto)\s+\w+\s*\([^)]*\)\s*\{', code
-            ))
-
-            if has_main:
-                # Full program with main - use as-is
-                wrapped = (
-                    "#include <iostream>\n"
-                    "#include <vector>\n"
-                    "#include <string>\n"
-                    "#include <algorithm>\n"
-                    "using namespace std;\n\n"
-                    + code
-                )
-            elif has_function:
-                # Function(s) only - wrap with main
-                wrapped = (
-                    "#include <iostream>\n"
-                    "#include <vector>\n"
-                    "#include <string>\n"
-                    "#include <algorithm>\n"
-                    "using namespace std;\n\n"
-                    + code + "\n\n"
-                    "int main() {\n"
-                    "    cout << \"Solution loaded. Add test calls or submit.\" << endl;\n"
-                    "    return 0;\n"
-                    "}\n"
-                )
-            else:
-                # Bare statements - wrap in main
-                wrapped = (
-                    "#include <iostream>\n"
-                    "#include <vector>\n"
-                    "#include <string>\n"
-                    "#include <algorithm>\n"
-                    "using namespace std;\n\n"
-                    "int main() {\n"
-                    + "\n".join("    " + line for line in code.splitlines())
-                    + "\n    return 0;\n}\n"
+    Every chunk is sent as a progress notification whose message is
+    JSON: {"stream": "stdout" | "stderr", "text": "..."}. The final
+    result is the same dict `run_code` returns. A cached result is
+    replayed as one chunk per stream.
+    """
+    key = _cache_key(language, code, None, cache)
+    cached = _result_cache.get(key)
+    if cached is not None:
+        streamed = 0
+        for stream in ("stdout", "stderr"):
+            if cached[stream]:
+                streamed += len(cached[stream])
+                await ctx.report_progress(
+                    progress=streamed,
+                    message=json.dumps({"stream": stream, "text": cached[stream]}),
                 )
+        return cached
+
+    loop = asyncio.get_running_loop()
+    chunks: asyncio.Queue = asyncio.Queue()
+    streamed = 0
+
+    def on_output(stream: str, text: str):
+        loop.call_soon_threadsafe(chunks.put_nowait, (stream, text))
+
+    job = loop.run_in_executor(None, _run, language, code, on_output, True, priority)
+    job.add_done_callback(lambda _: loop.call_soon_threadsafe(chunks.put_nowait, None))
+
+    while (item := await chunks.get()) is not None:
+        stream, text = item
+        if streamed >= OUTPUT_LIMIT:
+            continue  # the final result still carries the bounded tail
+        streamed += len(text)
+        await ctx.report_progress(
+            progress=streamed,
+            message=json.dumps({"stream": stream, "text": text}),
+        )
+
+    result = await job
+    _cache_put(key, result)
+    return result
+
+
+@mcp.tool()
+def run_tests(
+    language: str,
+    code: str,
+    function_name: str,
+    test_cases: list[dict],
+    param_types: list[str] | None = None,
+    cache: bool = True,
+    priority: str = "grade",
+    min_time_ms: float = 0,
+) -> dict:
+    """
+    Run `function_name` from the candidate's code against a batch of test
+    cases in a single process.
+
+    test_cases:  [{"input": [arg, ...], "expected": value}, ...]
+    param_types: neutral parameter types for java / csharp / cpp, e.g.
+                 ["int[]", "int"]; inferred from the first case if omitted.
+
+    Returns per-case pass/fail, actual value, captured output and wall
+    time, plus overall passed / total counts. With `min_time_ms` each case
+    is called repeatedly for at least that long and its time is the median
+    call. Results for an unchanged deterministic solution and suite come
+    from the result cache unless cache=False.
+    """
+    def failed(message: str) -> dict:
+        return {"passed": 0, "total": len(test_cases or []), "cases": [], "stderr": message, "exit_code": 1}
 
-            with open(cpp_path, "w", encoding="utf-8") as f:
-                f.write(wrapped)
-
-            # Compile
-            compile_result = subprocess.run(
-                [compiler, cpp_path, "-o", exe_path, "-std=c++17"],
-                capture_output=True, text=True, timeout=15,
-            )
-
-            if compile_result.returncode != 0:
-                return {
-                    "stdout": "",
-                    "stderr": compile_result.stderr,
-                    "exit_code": compile_result.returncode,
-                }
-
-            # Run
-            result = subprocess.run(
-                [exe_path],
-                capture_output=True, text=True, timeout=10,
-            )
-
-        # ── UNSUPPORTED ───────────────────────────────────────────────────
-        else:
-            return {
-                "stdout": "",
-                "stderr": (
-                    f"Language '{language}' is not supported. "
-                    "Supported: python, javascript, java, csharp, cpp."
-                ),
-                "exit_code": 1,
-            }
+    strategy = languages.get(language)
+    if strategy is None:
+        return failed(
+            f"Language '{language}' is not supported. Supported: {', '.join(languages.names())}."
+        )
+    if strategy.driver is None:
+        return failed(f"Language '{strategy.name}' has no test harness; use run_code instead.")
+    marker = new_marker()
+    try:
+        driver = build_driver(
+            strategy.driver, code, function_name, test_cases, param_types, min_time_ms, marker=marker
+        )
+    except ValueError as e:
+        return failed(str(e))
+
+    key = _cache_key(language, code, [function_name, test_cases, param_types, min_time_ms], cache)
+    report = _result_cache.get(key)
+    if report is None:
+        collector = CaseCollector(marker)
+        result = _run(language, driver, on_output=collector.feed, wrap=False, priority=priority)
+        report = collect_results(collector.records, test_cases, result, collector.duplicates)
+        if "retry_after" in result:
+            report["retry_after"] = result["retry_after"]
+        _cache_put(key, report)
+    return report
+
+
+@mcp.tool()
+def cache_stats() -> dict:
+    """Result-cache size and hit / miss / bypass / eviction counters."""
+    return _result_cache.stats()
 
+
+@mcp.tool()
+def list_languages(refresh: bool = False) -> list[dict]:
+    """
+    Languages this server can run, with toolchain availability and
+    version. `refresh=True` probes the toolchains again, e.g. after an
+    install.
+    """
+    if refresh:
+        languages.probe_all()
+    return languages.capabilities()
+
+
+@mcp.resource("languages://available")
+def available_languages() -> str:
+    """JSON list of supported languages and their toolchain versions."""
+    return json.dumps(languages.capabilities())
+
+
+@mcp.tool()
+def worker_stats() -> dict:
+    """Execution counters of the worker process that handled this call."""
+    return {
+        **_metrics.snapshot(),
+        "cache": _result_cache.stats(),
+        "admission": languages.admission.stats(),
+    }
+
+
+@mcp.custom_route("/health", methods=["GET"])
+async def health(request):
+    from starlette.responses import JSONResponse
+
+    return JSONResponse({
+        "status": "ok",
+        **_metrics.snapshot(),
+        "admission": languages.admission.stats(),
+    })
+
+
+@mcp.tool()
+def profile_code(
+    language: str,
+    code: str,
+    function_name: str,
+    param_types: list[str],
+    sizes: list[int] | None = None,
+    reference_code: str | None = None,
+    reference_language: str | None = None,
+) -> dict:
+    """
+    Estimate the time complexity of `function_name` empirically.
+
+    Runs it on generated inputs of increasing size (see profiler.py),
+    records the median call time per size, each size repeated for
+    profiler.MIN_TIME_MS, and fits growth models. Peak RSS is the running
+    process's peak so far, not a per-size measurement.
+    With `reference_code` the reference is profiled the same way and
+    compared: slowdown at the largest common size and whether the
+    estimated complexities match.
+    """
+    sizes = sorted(sizes or profiler.default_sizes(language, reference_language or language))
+    try:
+        cases = profiler.generate_cases(param_types, sizes)
+    except ValueError as e:
+        return {"candidate": None, "reference": None, "stderr": str(e)}
+
+    def profile(lang: str, source: str) -> dict:
+        return profiler.summarize(
+            sizes,
+            run_tests(
+                lang, source, function_name, cases, param_types,
+                priority="background", min_time_ms=profiler.MIN_TIME_MS,
+            ),
+        )
+
+    candidate = profile(language, code)
+    result = {"candidate": candidate, "reference": None}
+    if reference_code:
+        reference = profile(reference_language or language, reference_code)
+        result["reference"] = reference
+        result.update(profiler.compare(candidate, reference))
+    return result
+
+
+def _run(
+    language: str, code: str, on_output=None, wrap: bool = True, priority: str = "run"
+) -> dict:
+    """Execute via `_execute`, counted in this worker's metrics."""
+    with _metrics.track(language.strip().lower()):
+        result = _execute(language, code, on_output, wrap, priority)
+    if result.get("stderr") == TIMEOUT_MESSAGE:
+        _metrics.timed_out()
+    return result
+
+
+def _execute(
+    language: str, code: str, on_output=None, wrap: bool = True, priority: str = "run"
+) -> dict:
+    """
+    Compile (if needed) and run `code` with its language strategy (see
+    languages.py). With `wrap=False` the source is used verbatim — it must
+    already be a complete program, as produced by harness.py.
+    """
+    strategy = languages.get(language)
+    if strategy is None:
+        return {
+            "stdout": "",
+            "stderr": (
+                f"Language '{language}' is not supported. "
+                f"Supported: {', '.join(languages.names())}."
+            ),
+            "exit_code": 1,
+        }
+
+    try:
+        return strategy.run(code, on_output=on_output, wrap=wrap, priority=priority)
+
+    except Saturated as e:
         return {
-            "stdout": result.stdout,
-            "stderr": result.stderr,
-            "exit_code": int(result.returncode),
+            "stdout": "",
+            "stderr": str(e),
+            "exit_code": 1,
+            "retry_after": e.retry_after,
         }
 
     except subprocess.TimeoutExpired:
         return {
             "stdout": "",
-            "stderr": "Execution timed out after 10 seconds.",
+            "stderr": TIMEOUT_MESSAGE,
             "exit_code": 1,
         }
 
@@ -366,19 +344,44 @@ def run_code(language: str, code: str) -> dict:
             "exit_code": 1,
         }
 
-    finally:
-        # Clean up all temp files / dirs
-        for item in files_to_cleanup:
-            try:
-                if os.path.isdir(item):
-                    shutil.rmtree(item, ignore_errors=True)
-                elif os.path.exists(item):
-                    os.remove(item)
-            except OSError:
-                pass
+
+def create_app():
+    """ASGI app for one worker process; used as a uvicorn factory."""
+    return mcp.streamable_http_app()
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="MCP code-runner server")
+    parser.add_argument(
+        "--workers", type=int, default=MCP_WORKERS,
+        help="worker processes sharing port 8001 (default: MCP_WORKERS or 1)",
+    )
+    args = parser.parse_args()
+
     print("MCP Code-Runner starting on http://127.0.0.1:8001/mcp")
-    print("Supported languages: python, javascript, java, csharp, cpp")
-    mcp.run(transport="streamable-http")
+    print("Supported languages:", ", ".join(
+        f"{lang['name']} ({lang['version'] or lang['error']})" for lang in languages.capabilities()
+    ))
+
+    if args.workers <= 1:
+        mcp.run(transport="streamable-http")
+    else:
+        import uvicorn
+
+        # Pre-fork: the supervisor binds the port once and hands the socket
+        # to every worker. It pings workers and replaces dead or hung ones;
+        # SIGHUP restarts them one at a time, each draining in-flight runs.
+        print(f"Workers: {args.workers}")
+        # workers size their share of the compile / run caps from this
+        os.environ["MCP_WORKERS"] = str(args.workers)
+        uvicorn.run(
+            "server:create_app",
+            factory=True,
+            host=mcp.settings.host,
+            port=mcp.settings.port,
+            workers=args.workers,
+            app_dir=os.path.dirname(os.path.abspath(__file__)),
+            timeout_graceful_shutdown=MCP_DRAIN_SECONDS,
+        )
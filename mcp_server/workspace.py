@@ -0,0 +1,96 @@
+"""
+Reusable build workspaces
+=========================
+Compiled languages need a scratch directory for sources and build output.
+Instead of `mkdtemp()` + `rmtree()` on the disk-backed temp dir for every
+run, a small pool of per-language directories is kept on tmpfs
+(`/dev/shm` when available) and emptied between runs.
+
+Python sources skip the filesystem entirely: they are written to an
+anonymous memfd and passed to the interpreter as `/dev/fd/N`.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+
+
+def _default_root() -> str:
+    shm = "/dev/shm"
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        # compiled binaries run from the workspace, so it must allow exec
+        noexec = getattr(os, "ST_NOEXEC", 0)
+        if not os.statvfs(shm).f_flag & noexec:
+            return shm
+    return tempfile.gettempdir()
+
+
+WORKSPACE_ROOT = os.environ.get("RUN_WORKSPACE_ROOT") or _default_root()
+
+
+class WorkspacePool:
+    """
+    Idle scratch directories per language. `acquire()` hands out an empty
+    directory, `release()` empties it and keeps up to `keep` for reuse.
+    """
+
+    def __init__(self, root: str = WORKSPACE_ROOT, keep: int = 4):
+        self.root = root
+        self.keep = keep
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, language: str) -> str:
+        with self._lock:
+            idle = self._idle.get(language)
+            if idle:
+                return idle.pop()
+        return tempfile.mkdtemp(prefix=f"run-{language}-", dir=self.root)
+
+    def release(self, language: str, path: str):
+        if not _reset(path):
+            shutil.rmtree(path, ignore_errors=True)
+            return
+        with self._lock:
+            idle = self._idle.setdefault(language, [])
+            if len(idle) < self.keep:
+                idle.append(path)
+                return
+        shutil.rmtree(path, ignore_errors=True)
+
+    def close(self):
+        with self._lock:
+            paths = [p for idle in self._idle.values() for p in idle]
+            self._idle.clear()
+        for path in paths:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _reset(path: str) -> bool:
+    """Empty `path` in place; False if anything could not be removed."""
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+        return True
+    except OSError:
+        return False
+
+
+def memfd_source(code: str, name: str):
+    """
+    Anonymous in-memory file holding `code`; returns the fd, or None where
+    memfd_create is unavailable (non-Linux). The caller closes it.
+    """
+    if not hasattr(os, "memfd_create"):
+        return None
+    fd = os.memfd_create(name)  # hand to the child with pass_fds
+    data = code.encode("utf-8")
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+    return fd